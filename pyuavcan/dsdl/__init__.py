@@ -29,6 +29,7 @@ from ._compiler import GeneratedPackageInfo as GeneratedPackageInfo
 
 from ._composite_object import serialize as serialize
 from ._composite_object import deserialize as deserialize
+from ._composite_object import SerializationBuffer as SerializationBuffer
 
 from ._composite_object import CompositeObject as CompositeObject
 from ._composite_object import ServiceObject as ServiceObject
@@ -48,3 +49,5 @@ from ._composite_object import set_attribute as set_attribute
 
 from ._builtin_form import to_builtin as to_builtin
 from ._builtin_form import update_from_builtin as update_from_builtin
+
+from ._batch import deserialize_batch as deserialize_batch
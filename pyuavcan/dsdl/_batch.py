@@ -0,0 +1,192 @@
+#
+# Copyright (c) 2020 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+import typing
+import functools
+import dataclasses
+
+import numpy
+import pydsdl
+
+from ._composite_object import CompositeObject, get_model
+
+
+_Byte = numpy.uint8
+
+_Payload = typing.Union[bytes, bytearray, memoryview, typing.Sequence[memoryview]]
+
+
+def deserialize_batch(dtype: typing.Type[CompositeObject], payloads: typing.Iterable[_Payload]) -> numpy.ndarray:
+    """
+    Decodes many serialized representations of the same DSDL data type at once into a NumPy structured array,
+    one element per serialized representation. The whole batch is processed in a single vectorized pass per field
+    instead of constructing a Python object per serialized representation, which makes this function suitable
+    for bulk processing of logged data. Columns are accessible by field name: ``out['field']``.
+
+    Only data types with a static layout are supported; that is, structures whose serialized representations
+    are always of the same length, containing only primitive fields, fixed-length arrays thereof,
+    and nested structures that satisfy the same criteria. Unions, variable-length arrays, and service types
+    are not supported.
+
+    The mapping between DSDL types and NumPy types is the same as that of the generated classes.
+    Nested structures are represented as nested structured types; fixed-length arrays are represented
+    as sub-arrays. Field names match the original unstropped names from the source DSDL definition
+    (e.g., ``if``, not ``if_``), like in :func:`to_builtin`.
+
+    :param dtype: The generated class of the DSDL data type to decode.
+
+    :param payloads: An iterable of serialized representations, each either contiguous (``bytes``, ``bytearray``,
+        ``memoryview``) or fragmented (a sequence of ``memoryview``, like in :func:`deserialize`).
+        The implicit zero extension rule applies to short serialized representations;
+        excess data at the end is ignored.
+
+    :return: A new one-dimensional NumPy structured array.
+
+    :raises: :class:`TypeError` if the data type does not have a static layout.
+
+    >>> import tests; tests.dsdl.generate_packages()  # DSDL package generation not shown in this example.
+    [...]
+    >>> from pyuavcan.dsdl import serialize
+    >>> from uavcan.si.sample.temperature import Scalar_1_0
+    >>> from uavcan.time import SynchronizedTimestamp_1_0
+    >>> payloads = [b''.join(serialize(Scalar_1_0(SynchronizedTimestamp_1_0(i * 1000), 273.15 + i))) for i in range(3)]
+    >>> out = deserialize_batch(Scalar_1_0, payloads)
+    >>> out['timestamp']['microsecond']
+    array([   0, 1000, 2000], dtype=uint64)
+    >>> out['kelvin']
+    array([273.15, 274.15, 275.15], dtype=float32)
+    """
+    layout = _get_layout(dtype)
+    size = layout.size_bytes
+    rows = [(x if isinstance(x, (bytes, bytearray, memoryview)) else b''.join(x)) for x in payloads]
+    if all(len(x) == size for x in rows):   # Fast path: no zero extension or truncation needed.
+        joined = b''.join(rows)
+    else:
+        joined = b''.join(bytes(x[:size]).ljust(size, b'\x00') for x in rows)
+    matrix = numpy.frombuffer(joined, dtype=_Byte).reshape(len(rows), size)
+
+    out = numpy.zeros(len(rows), dtype=layout.dtype)
+    for leaf in layout.leaves:
+        column = out
+        for name in leaf.path:
+            column = column[name]
+        column[...] = _decode(matrix, leaf).reshape(column.shape)
+    return out
+
+
+@dataclasses.dataclass(frozen=True)
+class _Leaf:
+    """
+    A primitive-typed field or a fixed-length array thereof located at a fixed offset.
+    """
+    path:       typing.Tuple[str, ...]
+    bit_offset: int
+    data_type:  pydsdl.PrimitiveType
+    count:      int
+
+
+@dataclasses.dataclass(frozen=True)
+class _Layout:
+    dtype:      numpy.dtype
+    size_bytes: int
+    leaves:     typing.List[_Leaf]
+
+
+@functools.lru_cache(None)
+def _get_layout(dtype: typing.Type[CompositeObject]) -> _Layout:
+    model = get_model(dtype)
+    if not isinstance(model, pydsdl.StructureType) or len(model.bit_length_set) != 1:
+        raise TypeError(f'{model} does not have a static layout')
+    leaves: typing.List[_Leaf] = []
+    numpy_type = _make_structure_layout(model, (), 0, leaves)
+    bit_length, = model.bit_length_set
+    return _Layout(dtype=numpy_type, size_bytes=(bit_length + 7) // 8, leaves=leaves)
+
+
+def _make_structure_layout(model:      pydsdl.StructureType,
+                           path:       typing.Tuple[str, ...],
+                           bit_offset: int,
+                           leaves:     typing.List[_Leaf]) -> numpy.dtype:
+    fields: typing.List[typing.Tuple[typing.Any, ...]] = []
+    for f in model.fields:
+        t = f.data_type
+        if not isinstance(f, pydsdl.PaddingField):
+            field_path = path + (f.name,)
+            if isinstance(t, pydsdl.PrimitiveType):
+                leaves.append(_Leaf(field_path, bit_offset, t, 1))
+                fields.append((f.name, _numpy_scalar_type(t)))
+            elif isinstance(t, pydsdl.FixedLengthArrayType) and isinstance(t.element_type, pydsdl.PrimitiveType):
+                leaves.append(_Leaf(field_path, bit_offset, t.element_type, t.capacity))
+                fields.append((f.name, _numpy_scalar_type(t.element_type), (t.capacity,)))
+            elif isinstance(t, pydsdl.FixedLengthArrayType) or isinstance(t, pydsdl.UnionType):
+                raise TypeError(f'{model} does not have a static layout: '
+                                f'field {f} of type {t} cannot be represented as a column')
+            elif isinstance(t, pydsdl.StructureType) and len(t.bit_length_set) == 1:
+                fields.append((f.name, _make_structure_layout(t, field_path, bit_offset, leaves)))
+            else:
+                raise TypeError(f'{model} does not have a static layout: field {f} is variable-length')
+
+        bit_length, = t.bit_length_set
+        bit_offset += bit_length
+
+    return numpy.dtype(fields)
+
+
+def _decode(matrix: numpy.ndarray, leaf: _Leaf) -> numpy.ndarray:
+    """
+    Extracts the specified field from every row of the matrix of serialized representations.
+    Returns a two-dimensional array with one row per serialized representation and one column per array element.
+    """
+    rows = matrix.shape[0]
+    t = leaf.data_type
+    bit_length = t.bit_length
+    if leaf.bit_offset % 8 == 0 and bit_length % 8 == 0:    # Aligned, no bit shuffling needed.
+        left = leaf.bit_offset // 8
+        raw = matrix[:, left:left + bit_length // 8 * leaf.count].reshape(rows, leaf.count, bit_length // 8)
+    else:
+        left, right = leaf.bit_offset // 8, (leaf.bit_offset + bit_length * leaf.count + 7) // 8
+        shift = leaf.bit_offset % 8
+        bits = numpy.unpackbits(matrix[:, left:right], axis=1, bitorder='little')
+        bits = bits[:, shift:shift + bit_length * leaf.count].reshape(rows, leaf.count, bit_length)
+        if isinstance(t, pydsdl.BooleanType):
+            return bits[:, :, 0].astype(numpy.bool)
+        raw = numpy.packbits(bits, axis=2, bitorder='little')
+
+    # Zero-extend each value to the width of the native type, then reinterpret.
+    width = numpy.dtype(_numpy_scalar_type(t)).itemsize
+    extended = numpy.zeros((rows, leaf.count, width), dtype=_Byte)
+    extended[:, :, :raw.shape[2]] = raw
+    if isinstance(t, pydsdl.FloatType):
+        return extended.view(f'<f{width}')
+    if isinstance(t, pydsdl.SignedIntegerType):
+        if bit_length == width * 8:
+            return extended.view(f'<i{width}')
+        sign = 1 << (bit_length - 1)
+        return (extended.view(f'<i{width}') ^ sign) - sign
+    assert isinstance(t, pydsdl.UnsignedIntegerType)
+    return extended.view(f'<u{width}')
+
+
+def _numpy_scalar_type(t: pydsdl.PrimitiveType) -> typing.Any:
+    """
+    Same mapping as that of the generated classes.
+    """
+    def pick_width(w: int) -> int:
+        for o in [8, 16, 32, 64]:
+            if w <= o:
+                return o
+        raise ValueError(f'Invalid bit width: {w}')  # pragma: no cover
+
+    if isinstance(t, pydsdl.BooleanType):
+        return numpy.bool_
+    elif isinstance(t, pydsdl.SignedIntegerType):
+        return {8: numpy.int8, 16: numpy.int16, 32: numpy.int32, 64: numpy.int64}[pick_width(t.bit_length)]
+    elif isinstance(t, pydsdl.UnsignedIntegerType):
+        return {8: numpy.uint8, 16: numpy.uint16, 32: numpy.uint32, 64: numpy.uint64}[pick_width(t.bit_length)]
+    elif isinstance(t, pydsdl.FloatType):
+        return {16: numpy.float16, 32: numpy.float32, 64: numpy.float64}[pick_width(t.bit_length)]
+    else:  # pragma: no cover
+        raise TypeError(f'Unsupported primitive type: {t}')
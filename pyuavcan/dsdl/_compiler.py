@@ -7,6 +7,7 @@
 import gzip
 import typing
 import pickle
+import struct
 import base64
 import pathlib
 import itertools
@@ -53,7 +54,8 @@ class GeneratedPackageInfo:
 def generate_package(root_namespace_directory:        _AnyPath,
                      lookup_directories:              typing.Optional[typing.List[_AnyPath]] = None,
                      output_directory:                typing.Optional[_AnyPath] = None,
-                     allow_unregulated_fixed_port_id: bool = False) -> GeneratedPackageInfo:
+                     allow_unregulated_fixed_port_id: bool = False,
+                     enable_struct_packing:           bool = False) -> GeneratedPackageInfo:
     """
     This function runs the DSDL compiler, converting a specified DSDL root namespace into a Python package.
     In the generated package, nested DSDL namespaces are represented as Python subpackages,
@@ -126,6 +128,14 @@ def generate_package(root_namespace_directory:        _AnyPath,
         data types with fixed port-ID. If you are not sure what it means, do not use it, and read the UAVCAN
         specification first. The default is False.
 
+    :param enable_struct_packing: If True, data types whose layout is fixed and byte-aligned (that is, structures
+        consisting only of byte-aligned integer and floating point fields, short fixed-length arrays thereof,
+        byte-sized padding, and nested types that satisfy the same criteria) are (de)serialized by a single
+        :meth:`struct.Struct.pack_into`/:meth:`struct.Struct.unpack_from` call using a precomputed format
+        instead of a sequence of per-field calls, which is considerably faster.
+        Data types that do not qualify are (de)serialized using the generic logic as usual.
+        The serialized representations are identical in either case. The default is False.
+
     :return: An instance of :class:`GeneratedPackageInfo` describing the generated package.
 
     :raises: :class:`OSError` if required operations on the file system could not be performed;
@@ -182,14 +192,22 @@ def generate_package(root_namespace_directory:        _AnyPath,
     root_namespace_name, = set(map(lambda x: x.root_namespace, composite_types))  # type: str,
 
     # Template primitives
+    def struct_layout(t: pydsdl.CompositeType) -> typing.Optional[_StructLayout]:
+        return _make_struct_layout(t) if enable_struct_packing else None
+
+    def test_if_struct_packed(t: pydsdl.CompositeType) -> bool:
+        return any(map(struct_layout, _expand_service_type(t)))
+
     filters = {
         'pickle':            _pickle_object,
         'numpy_scalar_type': _numpy_scalar_type,
+        'struct_layout':     struct_layout,
     }
 
     tests = {
         'PaddingField': lambda x: isinstance(x, pydsdl.PaddingField),
         'saturated':    _test_if_saturated,
+        'struct_packed': test_if_struct_packed,
     }
 
     # Generate code
@@ -217,6 +235,137 @@ def generate_package(root_namespace_directory:        _AnyPath,
                                 name=root_namespace_name)
 
 
+_STRUCT_PACKING_MAX_ARRAY_CAPACITY = 16
+"""
+Fixed-length arrays up to this capacity are packed elementwise into the struct format.
+Larger arrays disqualify the containing type because the generic array (de)serialization logic,
+which copies the memory of the array as a whole, is faster for them.
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class _StructLayoutField:
+    """
+    A non-padding field of a type whose serialized representation is described by a :class:`_StructLayout`.
+    The values of the field occupy ``item_count`` items of the tuple returned by ``unpack_from()``
+    starting at ``index``.
+    """
+    field:    pydsdl.Field
+    index:    int
+    chunks:   typing.List[typing.Tuple[int, int]]
+    """
+    For scalar fields: a list of (shift, mask) pairs, one per struct item.
+    Integers whose bit length is a multiple of eight but is not standard (e.g., ``uint56``)
+    are split into several standard-sized unsigned chunks, least significant first.
+    """
+    capacity: typing.Optional[int]                  # Set for arrays.
+    nested:   typing.Optional['_StructLayout']      # Set for composites.
+
+    @property
+    def item_count(self) -> int:
+        if self.nested is not None:
+            return self.nested.item_count
+        if self.capacity is not None:
+            return self.capacity
+        return len(self.chunks)
+
+    @property
+    def sign_extension_constant(self) -> typing.Optional[int]:
+        """The sign bit of chunked signed integers which have to be sign-extended after unpacking; None otherwise."""
+        t = self.field.data_type
+        if isinstance(t, pydsdl.SignedIntegerType) and len(self.chunks) > 1:
+            return int(2 ** (t.bit_length - 1))
+        return None
+
+
+@dataclasses.dataclass(frozen=True)
+class _StructLayout:
+    format: str
+    fields: typing.List[_StructLayoutField]
+
+    @property
+    def item_count(self) -> int:
+        return sum(f.item_count for f in self.fields)
+
+
+def _make_struct_layout(t: pydsdl.CompositeType) -> typing.Optional[_StructLayout]:
+    """
+    Returns None if the serialized representation of the type cannot be described by a fixed struct format.
+    """
+    if not isinstance(t, pydsdl.StructureType) or len(t.bit_length_set) != 1:
+        return None
+
+    fmt = ''
+    fields: typing.List[_StructLayoutField] = []
+    index = 0
+    for f in t.fields:
+        ft = f.data_type
+        chunks: typing.List[typing.Tuple[int, int]] = []
+        capacity: typing.Optional[int] = None
+        nested: typing.Optional[_StructLayout] = None
+        if isinstance(ft, pydsdl.VoidType):
+            if ft.bit_length % 8 != 0:
+                return None
+            fmt += f'{ft.bit_length // 8}x'
+            continue
+        elif isinstance(ft, (pydsdl.IntegerType, pydsdl.FloatType)):
+            codes = _struct_codes(ft)
+            if codes is None:
+                return None
+            fmt += ''.join(c for c, _ in codes)
+            chunks = [(shift, 2 ** width - 1) for _, (shift, width) in codes]
+        elif isinstance(ft, pydsdl.FixedLengthArrayType):
+            codes = _struct_codes(ft.element_type) if isinstance(ft.element_type, pydsdl.PrimitiveType) else None
+            if codes is None or len(codes) != 1 or ft.capacity > _STRUCT_PACKING_MAX_ARRAY_CAPACITY:
+                return None
+            capacity = int(ft.capacity)
+            fmt += f'{capacity}{codes[0][0]}'
+        elif isinstance(ft, pydsdl.CompositeType):
+            nested = _make_struct_layout(ft)
+            if nested is None:
+                return None
+            fmt += nested.format.lstrip('<')
+        else:
+            return None
+        lf = _StructLayoutField(field=f, index=index, chunks=chunks, capacity=capacity, nested=nested)
+        fields.append(lf)
+        index += lf.item_count
+
+    if not fields:
+        return None     # Nothing to gain here.
+    out = _StructLayout(format='<' + fmt, fields=fields)
+    assert struct.calcsize(out.format) * 8 == max(t.bit_length_set)
+    return out
+
+
+def _struct_codes(t: pydsdl.PrimitiveType) -> typing.Optional[typing.List[typing.Tuple[str, typing.Tuple[int, int]]]]:
+    """
+    Returns a list of (format character, (shift, bit width)) pairs, or None if the type cannot be packed.
+    """
+    if isinstance(t, pydsdl.FloatType):
+        return [({16: 'e', 32: 'f', 64: 'd'}[t.bit_length], (0, t.bit_length))]
+    if not isinstance(t, pydsdl.IntegerType) or t.bit_length % 8 != 0:
+        return None     # Bools and non-byte-sized integers are not representable.
+    signed = isinstance(t, pydsdl.SignedIntegerType)
+    if t.standard_bit_length:
+        code = {8: 'b', 16: 'h', 32: 'i', 64: 'q'}[t.bit_length]
+        return [(code if signed else code.upper(), (0, t.bit_length))]
+    out: typing.List[typing.Tuple[str, typing.Tuple[int, int]]] = []
+    shift = 0
+    for width in (32, 16, 8):    # Non-standard lengths are below 64 bits, e.g., 56 = 32 + 16 + 8.
+        if t.bit_length - shift >= width:
+            out.append(({8: 'B', 16: 'H', 32: 'I'}[width], (shift, width)))
+            shift += width
+    assert shift == t.bit_length
+    return out
+
+
+def _expand_service_type(t: pydsdl.CompositeType) -> typing.List[pydsdl.CompositeType]:
+    if isinstance(t, pydsdl.ServiceType):
+        return [t.request_type, t.response_type]
+    return [t]
+
+
 def _pickle_object(x: typing.Any) -> str:
     pck: str = base64.b85encode(gzip.compress(pickle.dumps(x, protocol=4))).decode().strip()
     segment_gen = map(''.join, itertools.zip_longest(*([iter(pck)] * 100), fillvalue=''))
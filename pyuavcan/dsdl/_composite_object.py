@@ -20,6 +20,13 @@ from . import _serialized_representation
 
 _logger = logging.getLogger(__name__)
 
+_ZERO_COPY_THRESHOLD = 1024
+"""
+Byte-aligned arrays that are at least this large are not copied during serialization;
+their memory is emitted as a separate fragment of the serialized representation instead.
+Smaller arrays are copied because the overhead of an extra fragment at the lower layers outweighs the copying cost.
+"""
+
 
 class CompositeObject(abc.ABC):  # Members are surrounded with underscores to avoid collisions with DSDL attributes.
     """
@@ -129,11 +136,80 @@ def serialize(obj: CompositeObject) -> typing.Iterable[memoryview]:
     The objective of this model is to avoid copying data into a temporary buffer when possible.
     Each yielded fragment is of type :class:`memoryview` pointing to raw unsigned bytes.
     It is guaranteed that at least one fragment is always returned (which may be empty).
+
+    Large byte-aligned arrays contained in the object are not copied; instead, the yielded fragments refer directly
+    to their memory. Therefore, such arrays shall not be modified until the fragments are no longer needed
+    (e.g., until the transfer is sent).
     """
-    # TODO: update the Serializer class to emit an iterable of fragments.
-    ser = _serialized_representation.Serializer.new(obj._MAX_SERIALIZED_REPRESENTATION_SIZE_BYTES_)
+    ser = _serialized_representation.Serializer.new(obj._MAX_SERIALIZED_REPRESENTATION_SIZE_BYTES_,
+                                                    zero_copy_threshold=_ZERO_COPY_THRESHOLD)
     obj._serialize_aligned_(ser)
-    yield ser.buffer.data
+    yield from ser.fragmented_buffer
+
+
+class SerializationBuffer:
+    """
+    A reusable destination buffer for constructing serialized representations of objects of one data type.
+    Unlike :func:`serialize`, which allocates a new buffer sized for the worst case on every invocation,
+    this class allocates the buffer once and reuses it for every subsequent serialization.
+    This is beneficial for data types with a large maximum size that are serialized at high rates.
+
+    At most one serialized representation may exist at any moment:
+    after :meth:`serialize` is invoked, the buffer is considered to be in use until :meth:`release` is invoked.
+    The fragments returned by :meth:`serialize` are invalidated by :meth:`release` --
+    their contents will be overwritten later. The caller shall not release the buffer while the fragments
+    are still referenced by anyone (e.g., by a transport output session that has not returned yet).
+
+    Instances are not thread-safe.
+    """
+
+    def __init__(self, dtype: typing.Type[CompositeObject]):
+        self._dtype = dtype
+        self._ser = _serialized_representation.Serializer.new(dtype._MAX_SERIALIZED_REPRESENTATION_SIZE_BYTES_,
+                                                              zero_copy_threshold=_ZERO_COPY_THRESHOLD)
+        self._in_use = False
+
+    @property
+    def dtype(self) -> typing.Type[CompositeObject]:
+        return self._dtype
+
+    @property
+    def in_use(self) -> bool:
+        """True after :meth:`serialize`, False after :meth:`release`."""
+        return self._in_use
+
+    # noinspection PyProtectedMember
+    def serialize(self, obj: CompositeObject) -> typing.List[memoryview]:
+        """
+        Like :func:`serialize`, except that the serialized representation is constructed in the reused buffer.
+        The output is identical to that of :func:`serialize`.
+
+        :raises: :class:`TypeError` if the object is not an instance of :attr:`dtype`;
+            :class:`RuntimeError` if the previous serialized representation has not been released yet.
+        """
+        if not isinstance(obj, self._dtype):
+            raise TypeError(f'Expected an instance of {self._dtype}, found {type(obj).__name__}')
+        if self._in_use:
+            raise RuntimeError(f'The serialization buffer of {self._dtype} has not been released')
+        self._in_use = True
+        try:
+            obj._serialize_aligned_(self._ser)
+        except Exception:
+            self.release()
+            raise
+        return self._ser.fragmented_buffer
+
+    def release(self) -> None:
+        """
+        Invalidates the fragments returned by the last :meth:`serialize` and makes the buffer available for reuse.
+        Does nothing if the buffer is not in use.
+        """
+        if self._in_use:
+            self._ser.reset()
+            self._in_use = False
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(dtype={get_model(self._dtype)}, in_use={self._in_use})'
 
 
 # noinspection PyProtectedMember
@@ -24,7 +24,7 @@ class Serializer(abc.ABC):
     Methods that expect an unsigned integer will raise ValueError if the supplied integer is negative.
     """
 
-    def __init__(self, buffer_size_in_bytes: int):
+    def __init__(self, buffer_size_in_bytes: int, zero_copy_threshold: typing.Optional[int]):
         """
         Do not call this directly. Use :meth:`new` to instantiate.
         """
@@ -33,10 +33,26 @@ class Serializer(abc.ABC):
         buffer_size_in_bytes = int(buffer_size_in_bytes) + 1
         self._buf: numpy.ndarray = numpy.zeros(buffer_size_in_bytes, dtype=_Byte)
         self._bit_offset = 0
+        self._zero_copy_threshold = int(zero_copy_threshold) if zero_copy_threshold is not None else None
+        # Fragments that precede the current head of the buffer. Each entry is either a slice of our own buffer
+        # or a read-only view of an external array that is emitted without copying.
+        self._fragments: typing.List[memoryview] = []
+        self._head_byte_offset = 0      # Where in our own buffer the current (last) fragment begins.
+        self._external_byte_count = 0   # How many bytes of the output are not stored in our own buffer.
 
     @staticmethod
-    def new(buffer_size_in_bytes: int) -> Serializer:
-        return _PlatformSpecificSerializer(buffer_size_in_bytes)
+    def new(buffer_size_in_bytes: int, zero_copy_threshold: typing.Optional[int] = None) -> Serializer:
+        """
+        :param buffer_size_in_bytes: The maximum size of the serialized representation.
+
+        :param zero_copy_threshold: If not None, byte-aligned arrays of standard-bit-length primitives that are at
+            least this many bytes large are not copied into the destination buffer. Instead, their memory is emitted
+            as a separate read-only fragment interleaved with the fragments of the destination buffer.
+            This avoids copying large payloads such as images or point clouds. The source arrays shall not be
+            modified until the fragments are no longer needed. In this mode, the output shall be obtained
+            from :attr:`fragmented_buffer` rather than :attr:`buffer`.
+        """
+        return _PlatformSpecificSerializer(buffer_size_in_bytes, zero_copy_threshold)
 
     @property
     def current_bit_length(self) -> int:
@@ -44,12 +60,47 @@ class Serializer(abc.ABC):
 
     @property
     def buffer(self) -> numpy.ndarray:
-        """Returns a properly sized read-only slice of the destination buffer zero-bit-padded to byte."""
+        """
+        Returns a properly sized read-only slice of the destination buffer zero-bit-padded to byte.
+        This property is not available if any of the data has been emitted as an external zero-copy fragment;
+        use :attr:`fragmented_buffer` in that case.
+        """
+        if self._fragments:
+            raise ValueError('The serialized representation is fragmented; use fragmented_buffer instead')
         out = self._buf[:(self._bit_offset + 7) // 8]
         out.flags.writeable = False
         assert out.base is self._buf    # Making sure we're not creating a copy, that might be costly
         return out
 
+    @property
+    def fragmented_buffer(self) -> typing.List[memoryview]:
+        """
+        Returns the serialized representation zero-bit-padded to byte as a list of read-only byte-aligned fragments
+        which are to be concatenated in order to obtain the final representation. The fragments refer either to the
+        destination buffer or to the memory of the source arrays emitted in the zero-copy mode; no data is copied.
+        There is always at least one fragment in the output, which may be empty.
+        """
+        head = self._buf[self._head_byte_offset:(self._bit_offset + 7) // 8 - self._external_byte_count]
+        head.flags.writeable = False
+        if len(head) > 0 or not self._fragments:
+            return self._fragments + [head.data]
+        return list(self._fragments)
+
+    def reset(self) -> None:
+        """
+        Discards the serialized representation and makes the instance ready to construct a new one from scratch
+        reusing the same destination buffer, which avoids a new buffer allocation.
+        Only the part of the buffer that has been used is zeroed, so the cost is proportional to the size of the
+        discarded serialized representation rather than the size of the buffer.
+        The fragments obtained from this instance earlier shall not be used after this method is invoked.
+        """
+        # Non-byte-aligned write operations may touch one extra byte after the current byte.
+        self._buf[:(self._bit_offset + 7) // 8 - self._external_byte_count + 1] = 0
+        self._bit_offset = 0
+        self._fragments = []
+        self._head_byte_offset = 0
+        self._external_byte_count = 0
+
     def skip_bits(self, bit_length: int) -> None:
         """This is used for padding bits."""
         self._bit_offset += bit_length
@@ -86,6 +137,20 @@ class Serializer(abc.ABC):
         self._buf[self._byte_offset:self._byte_offset + len(x)] = x
         self._bit_offset += len(x) * 8
 
+    def add_aligned_struct(self, fmt: struct.Struct, *values: typing.Any) -> None:
+        """
+        Packs the values using the precompiled little-endian format with a single native call.
+        This is used with data types whose layout is fixed and byte-aligned.
+        The current bit offset must be byte-aligned.
+        The values are not saturated; they shall be representable in the format, which is always the case in the
+        generated code because the field setters reject out-of-range values.
+        Raises :class:`struct.error` or :class:`OverflowError` otherwise, in which case the current bit offset
+        is not advanced.
+        """
+        assert self._bit_offset % 8 == 0
+        fmt.pack_into(self._buf, self._byte_offset, *values)
+        self._bit_offset += fmt.size * 8
+
     def add_aligned_u8(self, x: int) -> None:
         assert self._bit_offset % 8 == 0
         self._ensure_not_negative(x)
@@ -161,15 +226,41 @@ class Serializer(abc.ABC):
 
     def add_unaligned_bytes(self, value: numpy.ndarray) -> None:
         assert value.dtype == _Byte
-        # This is a faster variant of Ben Dyer's unaligned bit copy algorithm:
-        # https://github.com/UAVCAN/libuavcan/blob/fd8ba19bc9c09c05a/libuavcan/src/marshal/uc_bit_array_copy.cpp#L12
-        # It is faster because here we are aware that the source is always aligned, which we take advantage of.
         left = self._bit_offset % 8
-        right = 8 - left
-        for b in value:
-            self._buf[self._byte_offset] |= (b << left) & 0xFF
-            self._bit_offset += 8
-            self._buf[self._byte_offset] = b >> right
+        if left == 0:
+            self.add_aligned_bytes(value)
+            return
+        # This is a vectorized variant of Ben Dyer's unaligned bit copy algorithm:
+        # https://github.com/UAVCAN/libuavcan/blob/fd8ba19bc9c09c05a/libuavcan/src/marshal/uc_bit_array_copy.cpp#L12
+        # Each source byte is widened and shifted so that its low part lands in the current destination byte and
+        # its high part lands in the next one. The bits after the current offset are always zero, which allows us
+        # to merge both parts in using OR. This relies on the extra byte at the end of the destination buffer.
+        shifted = value.astype(numpy.uint16) << left
+        bo = self._byte_offset
+        self._buf[bo:bo + len(value)] |= (shifted & 0xFF).astype(_Byte)
+        self._buf[bo + 1:bo + len(value) + 1] |= (shifted >> 8).astype(_Byte)
+        self._bit_offset += len(value) * 8
+
+    def add_unaligned_array_of_unsigned(self, x: numpy.ndarray, bit_length: int) -> None:
+        """
+        Encodes an array of unsigned integers of an arbitrary (typically non-standard) bit length, such as ``uint12``,
+        using vectorized bit unpacking instead of elementwise serialization.
+        The values are truncated to the bit length (saturation must be implemented by the caller if needed).
+        No assumptions about alignment are made.
+        """
+        assert 1 <= bit_length < 64
+        x = numpy.asarray(x)
+        if len(x) > 0 and x.min() < 0:
+            raise ValueError(f'The requested serialization method is not defined on negative integers ({x.min()})')
+        self.add_unaligned_array_of_bits(_unpack_array_of_integers(x, bit_length))
+
+    def add_unaligned_array_of_signed(self, x: numpy.ndarray, bit_length: int) -> None:
+        """
+        Like :meth:`add_unaligned_array_of_unsigned` but for signed integers represented in two's complement.
+        Overflow handling is not implemented, see the class documentation.
+        """
+        assert 2 <= bit_length < 64
+        self.add_unaligned_array_of_bits(_unpack_array_of_integers(numpy.asarray(x), bit_length))
 
     def add_unaligned_unsigned(self, value: int, bit_length: int) -> None:
         self._ensure_not_negative(value)
@@ -199,6 +290,29 @@ class Serializer(abc.ABC):
     #
     # Private methods.
     #
+    def _add_aligned_bytes_zero_copy(self, x: numpy.ndarray) -> None:
+        """
+        Like :meth:`add_aligned_bytes`, but the source memory is emitted as a separate fragment instead of being
+        copied, provided that the zero-copy mode is enabled and the array is large enough.
+        """
+        assert self._bit_offset % 8 == 0
+        assert x.dtype == _Byte
+        if self._zero_copy_threshold is None or len(x) < self._zero_copy_threshold or not x.flags.c_contiguous:
+            self.add_aligned_bytes(x)
+            return
+        # Close the current head fragment of the own buffer and emit the external one after it.
+        head = self._buf[self._head_byte_offset:self._byte_offset]
+        head.flags.writeable = False
+        if len(head) > 0:
+            self._fragments.append(head.data)
+        ext = x.view()      # A new view object is needed to avoid altering the flags of the source array.
+        ext.flags.writeable = False
+        self._fragments.append(ext.data)
+        self._head_byte_offset = self._byte_offset
+        self._bit_offset += len(x) * 8
+        self._external_byte_count += len(x)
+        assert self._head_byte_offset == self._byte_offset
+
     @staticmethod
     def _unsigned_to_bytes(value: int, bit_length: int) -> numpy.ndarray:
         assert bit_length >= 1
@@ -227,10 +341,11 @@ class Serializer(abc.ABC):
 
     @property
     def _byte_offset(self) -> int:
-        return self._bit_offset // 8
+        """The offset in the destination buffer, which excludes the data emitted as external fragments."""
+        return self._bit_offset // 8 - self._external_byte_count
 
     def __str__(self) -> str:
-        s = ' '.join(map(_byte_as_bit_string, self.buffer))
+        s = ' '.join(_byte_as_bit_string(b) for frag in self.fragmented_buffer for b in frag)
         if self._bit_offset % 8 != 0:
             s, tail = s.rsplit(maxsplit=1)
             bits_to_cut_off = 8 - self._bit_offset % 8
@@ -251,7 +366,7 @@ class _LittleEndianSerializer(Serializer):
         # the generated serialized representation may be incorrect. NumPy seems to only support IEEE-754 compliant
         # platforms though so I don't expect any compatibility issues.
         assert x.dtype not in (numpy.bool, numpy.bool_, numpy.object)
-        self.add_aligned_bytes(x.view(_Byte))
+        self._add_aligned_bytes_zero_copy(x.view(_Byte))
 
     def add_unaligned_array_of_standard_bit_length_primitives(self, x: numpy.ndarray) -> None:
         # This is much slower than the aligned version because we have to manually copy and shift each byte,
@@ -274,6 +389,18 @@ _PlatformSpecificSerializer = {
 }[sys.byteorder]
 
 
+def _unpack_array_of_integers(x: numpy.ndarray, bit_length: int) -> numpy.ndarray:
+    """
+    Returns a flat array of bools where every consecutive group of ``bit_length`` items represents one element
+    of the source array starting from the least significant bit. The values are truncated to the bit length;
+    negative values are converted into two's complement.
+    """
+    wide = x.astype(numpy.int64).astype('<u8')  # Two's complement conversion of negative values happens here.
+    bits = numpy.unpackbits(wide.view(_Byte).reshape(-1, 8), axis=1, bitorder='little')
+    out: numpy.ndarray = bits[:, :bit_length].astype(dtype=numpy.bool).ravel()
+    return out
+
+
 def _byte_as_bit_string(x: int) -> str:
     return bin(x)[2:].zfill(8)
 
@@ -376,6 +503,84 @@ def _unittest_serializer_aligned() -> None:
         ser.buffer[0] = 123                                     # The buffer is read-only for safety reasons
 
 
+def _unittest_serializer_zero_copy() -> None:
+    from pytest import raises
+
+    large = numpy.arange(8, dtype=numpy.uint16)
+    small = numpy.array([0xdead], numpy.uint16)
+
+    ser = Serializer.new(50, zero_copy_threshold=16)
+    ser.add_aligned_u8(0xAA)
+    ser.add_aligned_array_of_standard_bit_length_primitives(small)     # Too small, copied
+    ser.add_aligned_array_of_standard_bit_length_primitives(large)     # Emitted as an external fragment
+    assert ser.current_bit_length == (1 + 2 + 16) * 8
+    frags = ser.fragmented_buffer
+    assert len(frags) == 2
+    assert bytes(frags[0]) == bytes([0xAA, 0xad, 0xde])
+    assert bytes(frags[1]) == large.tobytes()
+    assert frags[1].readonly
+    large[0] = 0xbeef                                                   # The memory is shared, not copied
+    assert bytes(ser.fragmented_buffer[1])[:2] == bytes([0xef, 0xbe])
+    assert large.flags.writeable                                        # The source array is not affected
+
+    with raises(ValueError):
+        _ = ser.buffer                                                  # The output is fragmented
+
+    ser.add_aligned_array_of_standard_bit_length_primitives(large)     # Two external fragments back-to-back
+    ser.add_unaligned_bit(True)                                         # Continue in the own buffer
+    ser.add_unaligned_unsigned(0b1111111, 7)
+    ser.add_aligned_u16(0x1234)
+    frags = ser.fragmented_buffer
+    assert [len(x) for x in frags] == [3, 16, 16, 3]
+    assert bytes(frags[3]) == bytes([0xFF, 0x34, 0x12])
+    assert ser.current_bit_length == (3 + 16 + 16 + 3) * 8
+    assert str(ser).replace(' ', '').startswith('10101010')
+
+    # When the zero-copy mode is disabled, the output is always a single fragment.
+    ser = Serializer.new(50)
+    ser.add_aligned_array_of_standard_bit_length_primitives(large)
+    frags = ser.fragmented_buffer
+    assert len(frags) == 1
+    assert bytes(frags[0]) == ser.buffer.tobytes() == large.tobytes()
+
+    # Empty output still yields one fragment.
+    assert [bytes(x) for x in Serializer.new(0, zero_copy_threshold=1).fragmented_buffer] == [b'']
+
+
+def _unittest_serializer_struct() -> None:
+    from pytest import raises
+    ser = Serializer.new(20)
+    ser.add_aligned_u8(0xAA)
+    ser.add_aligned_struct(struct.Struct('<Hb2xe'), 0x1234, -1, 1.0)
+    assert str(ser) == '10101010 00110100 00010010 11111111 00000000 00000000 00000000 00111100'
+    with raises(struct.error):
+        ser.add_aligned_struct(struct.Struct('<B'), 256)
+    with raises(OverflowError):
+        ser.add_aligned_struct(struct.Struct('<e'), 1e10)
+    assert ser.current_bit_length == 8 * 8
+
+
+# noinspection PyProtectedMember
+def _unittest_serializer_reset() -> None:
+    large = numpy.arange(8, dtype=numpy.uint16)
+    ser = Serializer.new(50, zero_copy_threshold=16)
+    for _ in range(3):
+        ser.add_unaligned_unsigned(0b101, 3)
+        ser.add_unaligned_signed(-1, 13)
+        ser.add_aligned_array_of_standard_bit_length_primitives(large)
+        ser.add_unaligned_bit(True)
+        ser.add_unaligned_f32(-1)
+        ser.skip_bits(7)
+        assert str(ser) == ('11111101 11111111 '
+                            + ' '.join(map(_byte_as_bit_string, large.view(_Byte)))
+                            + ' 00000001 00000000 00000000 01111111 00000001')
+        ser.reset()
+        assert not ser._buf.any()
+        assert ser.current_bit_length == 0
+        assert str(ser) == ''
+        assert [bytes(x) for x in ser.fragmented_buffer] == [b'']
+
+
 # noinspection PyProtectedMember
 def _unittest_serializer_unaligned() -> None:                   # Tricky cases with unaligned fields (very tricky)
     ser = Serializer.new(40)
@@ -456,3 +661,24 @@ def _unittest_serializer_unaligned() -> None:                   # Tricky cases w
                        '00000101'
 
     print('repr(serializer):', repr(ser))
+
+
+def _unittest_serializer_unaligned_array_of_integers() -> None:
+    from pytest import raises
+    ser = Serializer.new(20)
+    ser.add_unaligned_bit(True)
+    ser.add_unaligned_array_of_unsigned(numpy.array([0xABC, 0x123, 0xFFFF], numpy.uint16), 12)  # Last is truncated
+    ser.add_unaligned_array_of_signed(numpy.array([-1, 2], numpy.int8), 3)
+    assert ser.current_bit_length == 1 + 36 + 6
+    assert str(ser) == '01111001 01110101 00100100 11111110 11111111 xxxxx010'
+    with raises(ValueError):
+        ser.add_unaligned_array_of_unsigned(numpy.array([1, -1]), 5)
+
+    ref = Serializer.new(400)
+    ser = Serializer.new(400)
+    for bit_length in range(2, 64, 7):
+        values = numpy.random.randint(-2 ** (bit_length - 1), 2 ** (bit_length - 1), 10, dtype=numpy.int64)
+        for x in values:
+            ref.add_unaligned_signed(int(x), bit_length)
+        ser.add_unaligned_array_of_signed(values, bit_length)
+    assert ref.buffer.tobytes() == ser.buffer.tobytes()
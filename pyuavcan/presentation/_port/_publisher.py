@@ -166,6 +166,8 @@ class PublisherImpl(Closable, typing.Generic[MessageClass]):
         self._lock = asyncio.Lock(loop=loop)
         self._proxy_count = 0
         self._closed = False
+        # Publications are serialized by the lock, so a single buffer is sufficient.
+        self._serialization_buffer = pyuavcan.dsdl.SerializationBuffer(dtype)
 
     async def publish_until(self,
                             message:            MessageClass,
@@ -177,12 +179,16 @@ class PublisherImpl(Closable, typing.Generic[MessageClass]):
         async with self._lock:
             self._raise_if_closed()
             timestamp = pyuavcan.transport.Timestamp.now()
-            fragmented_payload = list(pyuavcan.dsdl.serialize(message))
-            transfer = pyuavcan.transport.Transfer(timestamp=timestamp,
-                                                   priority=priority,
-                                                   transfer_id=self.transfer_id_counter.get_then_increment(),
-                                                   fragmented_payload=fragmented_payload)
-            return await self.transport_session.send_until(transfer, monotonic_deadline)
+            fragmented_payload = self._serialization_buffer.serialize(message)
+            try:
+                transfer = pyuavcan.transport.Transfer(timestamp=timestamp,
+                                                       priority=priority,
+                                                       transfer_id=self.transfer_id_counter.get_then_increment(),
+                                                       fragmented_payload=fragmented_payload)
+                return await self.transport_session.send_until(transfer, monotonic_deadline)
+            finally:
+                # Output sessions do not retain references to the payload after send_until() has returned.
+                self._serialization_buffer.release()
 
     def register_proxy(self) -> None:
         self._raise_if_closed()
@@ -297,6 +297,10 @@ class OutputSession(Session):
         being pushed onto the media).
         This is a design limitation imposed by the underlying non-real-time platform that Python runs on;
         it is considered acceptable since PyUAVCAN is designed for soft-real-time applications at most.
+
+        Implementations shall not retain references to the memory of the payload fragments after this method has
+        returned or raised; if the payload is needed later (e.g., if it is queued for deferred processing),
+        it shall be copied. This allows the caller to reuse the payload buffers as soon as the method returns.
         """
         raise NotImplementedError
 
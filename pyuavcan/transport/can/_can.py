@@ -11,12 +11,13 @@ import asyncio
 import logging
 import dataclasses
 import pyuavcan.transport
-from .media import Media, TimestampedDataFrame, optimize_filter_configurations, FilterConfiguration
+from .media import Media, DataFrame, TimestampedDataFrame, optimize_filter_configurations, FilterConfiguration
 from ._session import CANInputSession, CANOutputSession
 from ._session import BroadcastCANOutputSession, UnicastCANOutputSession
-from ._frame import UAVCANFrame, TimestampedUAVCANFrame, TRANSFER_ID_MODULO
+from ._frame import TimestampedUAVCANFrame, TRANSFER_ID_MODULO
 from ._identifier import CANID, generate_filter_configurations
 from ._input_dispatch_table import InputDispatchTable
+from ._tx_queue import TransmissionQueue
 
 
 _logger = logging.getLogger(__name__)
@@ -30,6 +31,8 @@ class CANTransportStatistics(pyuavcan.transport.TransportStatistics):
         out_frames >= out_frames_loopback
         in_frames >= in_frames_uavcan >= in_frames_uavcan_accepted
         out_frames_loopback >= in_frames_loopback
+
+    The transmission queue metrics depend on the timing, so they are excluded from the equality comparison.
     """
     in_frames:                 int = 0  #: Number of genuine frames received from the bus (loopback not included).
     in_frames_uavcan:          int = 0  #: Subset of the above that happen to be valid UAVCAN frames.
@@ -41,6 +44,17 @@ class CANTransportStatistics(pyuavcan.transport.TransportStatistics):
     out_frames_timeout:  int = 0        #: Number of frames that were supposed to be sent but timed out.
     out_frames_loopback: int = 0        #: Number of sent frames that we requested loopback for.
 
+    #: Number of transfers awaiting transmission when the statistics were sampled, including the one being sent.
+    out_queue_depth:           int = dataclasses.field(default=0, compare=False)
+    #: The maximum number of transfers awaiting transmission observed so far.
+    out_queue_depth_max:       int = dataclasses.field(default=0, compare=False)
+    #: Total time, in seconds, spent by the transfers in the transmission queue before reaching the media.
+    out_queue_wait_time_total: float = dataclasses.field(default=0.0, compare=False)
+    #: The maximum time, in seconds, spent by a transfer in the transmission queue before reaching the media.
+    out_queue_wait_time_max:   float = dataclasses.field(default=0.0, compare=False)
+    #: Number of transfers that have left the transmission queue for the media; the denominator for the mean.
+    out_queue_transfers:       int = dataclasses.field(default=0, compare=False)
+
     @property
     def media_acceptance_filtering_efficiency(self) -> float:
         """
@@ -62,6 +76,13 @@ class CANTransportStatistics(pyuavcan.transport.TransportStatistics):
         """
         return self.out_frames_loopback - self.in_frames_loopback
 
+    @property
+    def out_queue_wait_time_mean(self) -> float:
+        """
+        The mean time, in seconds, spent by a transfer in the transmission queue before reaching the media.
+        """
+        return (self.out_queue_wait_time_total / self.out_queue_transfers) if self.out_queue_transfers > 0 else 0.0
+
 
 class CANTransport(pyuavcan.transport.Transport):
     """
@@ -80,9 +101,12 @@ class CANTransport(pyuavcan.transport.Transport):
         """
         self._maybe_media: typing.Optional[Media] = media
         self._local_node_id = int(local_node_id) if local_node_id is not None else None
-        self._media_lock = asyncio.Lock(loop=loop)
         self._loop = loop if loop is not None else asyncio.get_event_loop()
 
+        # Transfers are passed over to the media in the order of their CAN ID values rather than in the order of
+        # arrival, otherwise a long low-priority transfer would delay a high-priority one (priority inversion).
+        self._tx_queue = TransmissionQueue(self._send_to_media, self._loop)
+
         # Lookup performance for the output registry is not important because it's only used for loopback frames.
         # Hence we don't trade-off memory for speed here.
         self._output_registry: typing.Dict[pyuavcan.transport.OutputSessionSpecifier, CANOutputSession] = {}
@@ -90,7 +114,13 @@ class CANTransport(pyuavcan.transport.Transport):
         # Input lookup must be fast, so we use constant-complexity static lookup table.
         self._input_dispatch_table = InputDispatchTable()
 
+        # Parsing the CAN ID and constructing the session specifiers for every received frame is expensive,
+        # whereas the number of distinct CAN ID values on a real bus is small, so the results are cached.
+        # The value is None if the CAN ID is not a valid UAVCAN CAN ID.
+        self._route_cache: typing.Dict[int, typing.Optional[_Route]] = {}
+
         self._last_filter_configuration_set: typing.Optional[typing.Sequence[FilterConfiguration]] = None
+        self._last_filter_subject_ids: typing.Optional[typing.FrozenSet[int]] = None
 
         self._frame_stats = CANTransportStatistics()
 
@@ -163,7 +193,14 @@ class CANTransport(pyuavcan.transport.Transport):
             media.close()
 
     def sample_statistics(self) -> CANTransportStatistics:
-        return copy.copy(self._frame_stats)
+        out = copy.copy(self._frame_stats)
+        queue_stats = self._tx_queue.sample_statistics()
+        out.out_queue_depth = queue_stats.depth
+        out.out_queue_depth_max = queue_stats.depth_max
+        out.out_queue_wait_time_total = queue_stats.wait_time_total
+        out.out_queue_wait_time_max = queue_stats.wait_time_max
+        out.out_queue_transfers = queue_stats.transfers
+        return out
 
     def get_input_session(self,
                           specifier:        pyuavcan.transport.InputSessionSpecifier,
@@ -224,33 +261,37 @@ class CANTransport(pyuavcan.transport.Transport):
         self._output_registry[specifier] = session
         return session
 
-    async def _do_send_until(self, frames: typing.Iterable[UAVCANFrame], monotonic_deadline: float) -> bool:
+    async def _do_send_until(self, frames: typing.Sequence[DataFrame], monotonic_deadline: float) -> bool:
         """
         All frames shall share the same CAN ID value.
+        The frames whose turn did not come before the deadline are dropped without reaching the media.
         """
-        frames_list = list(frames)
-        del frames
-        async with self._media_lock:
-            if self._maybe_media is None:
-                raise pyuavcan.transport.ResourceClosedError(f'{self} is closed')
-            else:
-                num_sent = await self._maybe_media.send_until((x.compile() for x in frames_list), monotonic_deadline)
-            assert 0 <= num_sent <= len(frames_list), 'Media sub-layer API contract violation'
-            sent_frames, unsent_frames = frames_list[:num_sent], frames_list[num_sent:]
-
-            self._frame_stats.out_frames += len(sent_frames)
-            self._frame_stats.out_frames_timeout += len(unsent_frames)
-            self._frame_stats.out_frames_loopback += sum(1 for f in sent_frames if f.loopback)
+        if not frames:
+            return True
+        can_id_int = frames[0].identifier
+        num_sent = await self._tx_queue.send_until(can_id_int, frames, monotonic_deadline)
+        assert 0 <= num_sent <= len(frames)
+        sent_frames, unsent_frames = frames[:num_sent], frames[num_sent:]
+
+        self._frame_stats.out_frames += len(sent_frames)
+        self._frame_stats.out_frames_timeout += len(unsent_frames)
+        self._frame_stats.out_frames_loopback += sum(1 for f in sent_frames if f.loopback)
 
         if unsent_frames:
-            can_id_int_set = set(f.identifier for f in unsent_frames)
-            assert len(can_id_int_set) == 1, 'CAN transport layer internal contract violation'
-            can_id_int, = can_id_int_set
-            _logger.info('% frames of %d total with CAN ID 0x%08x could not be sent before the deadline',
-                         len(unsent_frames), num_sent, can_id_int)
+            assert all(f.identifier == can_id_int for f in unsent_frames), \
+                'CAN transport layer internal contract violation'
+            _logger.info('%d frames of %d total with CAN ID 0x%08x could not be sent before the deadline',
+                         len(unsent_frames), len(frames), can_id_int)
 
         return not unsent_frames
 
+    async def _send_to_media(self, frames: typing.Sequence[DataFrame], monotonic_deadline: float) -> int:
+        if self._maybe_media is None:
+            raise pyuavcan.transport.ResourceClosedError(f'{self} is closed')
+        num_sent = await self._maybe_media.send_until(frames, monotonic_deadline)
+        assert 0 <= num_sent <= len(frames), 'Media sub-layer API contract violation'
+        return num_sent
+
     def _on_frames_received(self, frames: typing.Iterable[TimestampedDataFrame]) -> None:
         for raw_frame in frames:
             try:
@@ -259,63 +300,95 @@ class CANTransport(pyuavcan.transport.Transport):
                 else:
                     self._frame_stats.in_frames += 1
 
-                cid = CANID.parse(raw_frame.identifier)
-                if cid is not None:                                             # Ignore non-UAVCAN CAN frames
+                try:
+                    route = self._route_cache[raw_frame.identifier]
+                except LookupError:
+                    route = self._make_route(raw_frame.identifier)
+                if route is not None:                                           # Ignore non-UAVCAN CAN frames
                     ufr = TimestampedUAVCANFrame.parse(raw_frame)
                     if ufr is not None:                                         # Ignore non-UAVCAN CAN frames
-                        self._handle_any_frame(cid, ufr)
+                        self._handle_any_frame(route, ufr)
             except Exception as ex:  # pragma: no cover
                 self._frame_stats.in_frames_errored += 1
                 _logger.exception(f'Unhandled exception while processing input CAN frame {raw_frame}: {ex}')
 
-    def _handle_any_frame(self, can_id: CANID, frame: TimestampedUAVCANFrame) -> None:
+    def _make_route(self, identifier: int) -> typing.Optional[_Route]:
+        """
+        Parses the CAN ID and stores the result in the cache. The oldest entry is evicted if the cache is full,
+        so that a node emitting random CAN ID values could not make the cache grow indefinitely.
+        """
+        can_id = CANID.parse(identifier)
+        route: typing.Optional[_Route] = None
+        if can_id is not None:
+            ds = can_id.data_specifier
+            src_nid = can_id.source_node_id
+            dst_nid = can_id.get_destination_node_id()
+            compute_index = self._input_dispatch_table.compute_index
+            selective_index = None
+            if src_nid is not None:
+                selective_index = compute_index(pyuavcan.transport.InputSessionSpecifier(ds, src_nid))
+            route = _Route(
+                can_id=can_id,
+                addressed_to_local_node=dst_nid is None or dst_nid == self._local_node_id,
+                selective_input_index=selective_index,
+                promiscuous_input_index=compute_index(pyuavcan.transport.InputSessionSpecifier(ds, None)),
+                output_specifier=pyuavcan.transport.OutputSessionSpecifier(ds, dst_nid),
+            )
+        if len(self._route_cache) >= _ROUTE_CACHE_CAPACITY:
+            del self._route_cache[next(iter(self._route_cache))]   # Dicts are ordered by insertion
+        self._route_cache[identifier] = route
+        return route
+
+    def _handle_any_frame(self, route: _Route, frame: TimestampedUAVCANFrame) -> None:
         if not frame.loopback:
             self._frame_stats.in_frames_uavcan += 1
-            if self._handle_received_frame(can_id, frame):
+            if self._handle_received_frame(route, frame):
                 self._frame_stats.in_frames_uavcan_accepted += 1
         else:
-            self._handle_loopback_frame(can_id, frame)
+            self._handle_loopback_frame(route, frame)
 
-    def _handle_received_frame(self, can_id: CANID, frame: TimestampedUAVCANFrame) -> bool:
+    def _handle_received_frame(self, route: _Route, frame: TimestampedUAVCANFrame) -> bool:
         assert not frame.loopback
-        ss = pyuavcan.transport.InputSessionSpecifier(can_id.data_specifier, can_id.source_node_id)
         accepted = False
-        dest_nid = can_id.get_destination_node_id()
-        if dest_nid is None or dest_nid == self._local_node_id:
-            session = self._input_dispatch_table.get(ss)
-            if session is not None:
-                # noinspection PyProtectedMember
-                session._push_frame(can_id, frame)
-                accepted = True
-
-            if ss.remote_node_id is not None:
-                ss = pyuavcan.transport.InputSessionSpecifier(ss.data_specifier, None)
-                session = self._input_dispatch_table.get(ss)
+        if route.addressed_to_local_node:
+            if route.selective_input_index is not None:
+                session = self._input_dispatch_table.get_by_index(route.selective_input_index)
                 if session is not None:
                     # noinspection PyProtectedMember
-                    session._push_frame(can_id, frame)
+                    session._push_frame(route.can_id, frame)
                     accepted = True
 
+            session = self._input_dispatch_table.get_by_index(route.promiscuous_input_index)
+            if session is not None:
+                # noinspection PyProtectedMember
+                session._push_frame(route.can_id, frame)
+                accepted = True
+
         return accepted
 
-    def _handle_loopback_frame(self, can_id: CANID, frame: TimestampedUAVCANFrame) -> None:
+    def _handle_loopback_frame(self, route: _Route, frame: TimestampedUAVCANFrame) -> None:
         assert frame.loopback
-        ss = pyuavcan.transport.OutputSessionSpecifier(can_id.data_specifier, can_id.get_destination_node_id())
         try:
-            session = self._output_registry[ss]
+            session = self._output_registry[route.output_specifier]
         except KeyError:
             _logger.info('No matching output session for loopback frame: %s; parsed CAN ID: %s; session specifier: %s. '
                          'Either the session has just been closed or the media driver is misbehaving.',
-                         frame, can_id, ss)
+                         frame, route.can_id, route.output_specifier)
         else:
             # noinspection PyProtectedMember
             session._handle_loopback_frame(frame)
 
     def _reconfigure_acceptance_filters(self) -> None:
-        subject_ids = set(
+        subject_ids = frozenset(
             ds.subject_id for ds in (x.specifier.data_specifier for x in self._input_dispatch_table.items)
             if isinstance(ds, pyuavcan.transport.MessageDataSpecifier)
         )
+        # The configuration depends only on the set of subjects (the local node-ID is immutable), so the costly
+        # optimization is skipped if the set did not change; e.g., when a service session or another session
+        # for an already subscribed subject is created or destroyed.
+        if subject_ids == self._last_filter_subject_ids and self._last_filter_configuration_set is not None:
+            return
+        self._last_filter_subject_ids = subject_ids
         fcs = generate_filter_configurations(subject_ids, self._local_node_id)
         assert len(fcs) > len(subject_ids)
         del subject_ids
@@ -331,3 +404,21 @@ class CANTransport(pyuavcan.transport.Transport):
                     raise
                 else:
                     self._last_filter_configuration_set = fcs
+
+
+@dataclasses.dataclass(frozen=True)
+class _Route:
+    """
+    Everything that is needed to dispatch a received frame that is derived from its CAN ID alone.
+    """
+    can_id:                  CANID
+    addressed_to_local_node: bool                   #: The frame is either broadcast or addressed to the local node.
+    selective_input_index:   typing.Optional[int]   #: Index in the dispatch table; None if the source is anonymous.
+    promiscuous_input_index: int                    #: Index in the dispatch table for the promiscuous input session.
+    output_specifier:        pyuavcan.transport.OutputSessionSpecifier   #: Used for the loopback frames.
+
+
+_ROUTE_CACHE_CAPACITY = 4096
+"""
+The maximum number of distinct CAN ID values whose routing information is cached.
+"""
@@ -13,8 +13,10 @@ from ._identifier import CANID
 
 class InputDispatchTable:
     """
-    Time-memory trade-off: the input dispatch table is tens of megabytes large, but the lookup is very fast and O(1).
-    This is necessary to ensure scalability for high-load applications such as real-time network monitoring.
+    The sessions are stored in a dict keyed by a unique integer index computed from the session specifier,
+    so the lookup is O(1) and the memory footprint is proportional to the number of sessions.
+    A flat table preallocated for every possible specifier would make the lookup only marginally faster
+    at the cost of tens of megabytes per transport instance and a noticeable construction delay.
     """
     _NUM_SUBJECTS = MessageDataSpecifier.SUBJECT_ID_MASK + 1
     _NUM_SERVICES = ServiceDataSpecifier.SERVICE_ID_MASK + 1
@@ -25,11 +27,7 @@ class InputDispatchTable:
     _TABLE_SIZE = (_NUM_SUBJECTS + _NUM_SERVICES * 2) * (_NUM_NODE_IDS + 1)
 
     def __init__(self) -> None:
-        # This method of construction is an order of magnitude faster than range-based. It matters here. A lot.
-        self._table: typing.List[typing.Optional[CANInputSession]] = [None] * (self._TABLE_SIZE + 1)
-
-        # A parallel dict is necessary for constant-complexity element listing. Traversing the table takes forever.
-        self._dict: typing.Dict[InputSessionSpecifier, CANInputSession] = {}
+        self._dict: typing.Dict[int, CANInputSession] = {}
 
     @property
     def items(self) -> typing.Iterable[CANInputSession]:
@@ -39,25 +37,32 @@ class InputDispatchTable:
         """
         This method is used only when a new input session is created; performance is not a priority.
         """
-        key = session.specifier
-        self._table[self._compute_index(key)] = session
-        self._dict[key] = session
+        self._dict[self.compute_index(session.specifier)] = session
 
     def get(self, specifier: InputSessionSpecifier) -> typing.Optional[CANInputSession]:
         """
         Constant-time lookup. Invoked for every received frame.
         """
-        return self._table[self._compute_index(specifier)]
+        return self._dict.get(self.compute_index(specifier))
+
+    def get_by_index(self, index: int) -> typing.Optional[CANInputSession]:
+        """
+        Like :meth:`get`, but the index is computed by the caller using :meth:`compute_index`.
+        This is useful if the index can be computed once and then reused for many lookups.
+        """
+        return self._dict.get(index)
 
     def remove(self, specifier: InputSessionSpecifier) -> None:
         """
         This method is used only when an input session is destroyed; performance is not a priority.
         """
-        self._table[self._compute_index(specifier)] = None
-        del self._dict[specifier]
+        del self._dict[self.compute_index(specifier)]
 
     @staticmethod
-    def _compute_index(specifier: InputSessionSpecifier) -> int:
+    def compute_index(specifier: InputSessionSpecifier) -> int:
+        """
+        Maps the specifier onto a unique non-negative integer below the number of possible specifiers.
+        """
         ds, nid = specifier.data_specifier, specifier.remote_node_id
         if isinstance(ds, MessageDataSpecifier):
             dim1 = ds.subject_id
@@ -99,6 +104,8 @@ def _unittest_input_dispatch_table() -> None:
     t.add(a)
     assert list(t.items) == [a]
     assert t.get(InputSessionSpecifier(MessageDataSpecifier(1234), None)) == a
+    assert t.get_by_index(t.compute_index(InputSessionSpecifier(MessageDataSpecifier(1234), None))) == a
+    assert t.get_by_index(t.compute_index(InputSessionSpecifier(MessageDataSpecifier(1234), 5))) is None
     t.remove(InputSessionSpecifier(MessageDataSpecifier(1234), None))
     assert len(list(t.items)) == 0
 
@@ -108,17 +115,66 @@ def _unittest_slow_input_dispatch_table_index() -> None:
     values: typing.Set[int] = set()
     for node_id in (*range(InputDispatchTable._NUM_NODE_IDS), None):
         for subj in range(InputDispatchTable._NUM_SUBJECTS):
-            out = InputDispatchTable._compute_index(InputSessionSpecifier(MessageDataSpecifier(subj), node_id))
+            out = InputDispatchTable.compute_index(InputSessionSpecifier(MessageDataSpecifier(subj), node_id))
             assert out not in values
             values.add(out)
             assert out < InputDispatchTable._TABLE_SIZE
 
         for serv in range(InputDispatchTable._NUM_SERVICES):
             for role in ServiceDataSpecifier.Role:
-                out = InputDispatchTable._compute_index(InputSessionSpecifier(ServiceDataSpecifier(serv, role),
-                                                                              node_id))
+                out = InputDispatchTable.compute_index(InputSessionSpecifier(ServiceDataSpecifier(serv, role),
+                                                                             node_id))
                 assert out not in values
                 values.add(out)
                 assert out < InputDispatchTable._TABLE_SIZE
 
     assert len(values) == InputDispatchTable._TABLE_SIZE
+
+
+# noinspection PyProtectedMember
+def _unittest_slow_input_dispatch_table_benchmark() -> None:
+    import sys
+    import time
+    import random
+    import asyncio
+    from pyuavcan.transport import PayloadMetadata
+
+    # The original implementation: a flat table preallocated for every possible specifier.
+    started_at = time.monotonic()
+    flat: typing.List[typing.Optional[CANInputSession]] = [None] * (InputDispatchTable._TABLE_SIZE + 1)
+    flat_construction_time = time.monotonic() - started_at
+    flat_size = sys.getsizeof(flat)
+
+    started_at = time.monotonic()
+    t = InputDispatchTable()
+    construction_time = time.monotonic() - started_at
+
+    specifiers = [InputSessionSpecifier(MessageDataSpecifier(random.randint(0, InputDispatchTable._NUM_SUBJECTS - 1)),
+                                        random.choice([None, random.randint(0, InputDispatchTable._NUM_NODE_IDS - 1)]))
+                  for _ in range(100)]
+    for ss in specifiers:
+        session = CANInputSession(ss, PayloadMetadata(0, 100), asyncio.get_event_loop(), lambda: None)
+        t.add(session)
+        flat[InputDispatchTable.compute_index(ss)] = session
+    size = sys.getsizeof(t._dict)
+
+    queries = [random.choice(specifiers) for _ in range(10_000)]
+    started_at = time.monotonic()
+    for ss in queries:
+        assert t.get(ss) is not None
+    lookup_rate = len(queries) / (time.monotonic() - started_at)
+
+    def flat_get(specifier: InputSessionSpecifier) -> typing.Optional[CANInputSession]:
+        return flat[InputDispatchTable.compute_index(specifier)]
+
+    started_at = time.monotonic()
+    for ss in queries:
+        assert flat_get(ss) is not None
+    flat_lookup_rate = len(queries) / (time.monotonic() - started_at)
+
+    print(f'Input dispatch table with {len(specifiers)} sessions: '
+          f'{size / 1024:.1f} KiB, constructed in {construction_time * 1e6:.0f} us, {lookup_rate:.0f} lookup/s; '
+          f'flat table: {flat_size / 1024:.1f} KiB, constructed in {flat_construction_time * 1e6:.0f} us, '
+          f'{flat_lookup_rate:.0f} lookup/s')
+    assert size * 100 < flat_size
+    assert lookup_rate > flat_lookup_rate * 0.5     # Generous margin to avoid spurious failures on loaded machines
@@ -9,6 +9,7 @@ import copy
 import typing
 import asyncio
 import logging
+import warnings
 import dataclasses
 import pyuavcan.util
 import pyuavcan.transport
@@ -31,8 +32,6 @@ class CANInputSession(_base.CANSession, pyuavcan.transport.InputSession):
     Per the UAVCAN specification. Units are seconds. Can be overridden after instantiation if needed.
     """
 
-    _QueueItem = typing.Tuple[_identifier.CANID, _frame.TimestampedUAVCANFrame]
-
     def __init__(self,
                  specifier:        pyuavcan.transport.InputSessionSpecifier,
                  payload_metadata: pyuavcan.transport.PayloadMetadata,
@@ -42,13 +41,16 @@ class CANInputSession(_base.CANSession, pyuavcan.transport.InputSession):
         self._specifier = specifier
         self._payload_metadata = payload_metadata
 
-        self._queue: asyncio.Queue[CANInputSession._QueueItem] = asyncio.Queue()
+        # The frames are reassembled as soon as they are received, so only complete transfers are queued.
+        self._queue: asyncio.Queue[pyuavcan.transport.TransferFrom] = asyncio.Queue()
         assert loop is not None
         self._loop = loop
         self._transfer_id_timeout_ns = int(CANInputSession.DEFAULT_TRANSFER_ID_TIMEOUT / _NANO)
 
-        self._receivers = [_transfer_reassembler.TransferReassembler(nid, payload_metadata.max_size_bytes)
-                           for nid in _node_id_range()]
+        # Reassemblers are created when the source node is first heard from and evicted when it goes silent.
+        # Most sources never publish on most subjects, so allocating one per node-ID upfront would be wasteful.
+        self._reassemblers: typing.Dict[int, _transfer_reassembler.TransferReassembler] = {}
+        self._next_eviction_check_ns = 0
 
         self._statistics = CANInputSessionStatistics()   # We could easily support per-source-node statistics if needed
 
@@ -59,29 +61,29 @@ class CANInputSession(_base.CANSession, pyuavcan.transport.InputSession):
         This is a part of the transport-internal API. It's a public method despite the name because Python's
         visibility handling capabilities are limited. I guess we could define a private abstract base to
         handle this but it feels like too much work. Why can't we have protected visibility in Python?
+
+        The frame is processed immediately in the context of the caller (which is the media receive handler);
+        the transfer is put into the queue when it is complete, so the application awaits once per transfer.
         """
-        try:
-            self._queue.put_nowait((can_id, frame))
-        except asyncio.QueueFull:
-            self._statistics.drops += 1
-            _logger.info('Input session %s: input queue overflow; frame %s (CAN ID fields: %s) is dropped',
-                         self, frame, can_id)
+        transfer = self._process_frame(can_id, frame)
+        if transfer is not None:
+            self._enqueue(transfer)
 
     @property
-    def frame_queue_capacity(self) -> typing.Optional[int]:
+    def transfer_queue_capacity(self) -> typing.Optional[int]:
         """
-        Capacity of the input frame queue. None means that the capacity is unlimited, which is the default.
+        Capacity of the input transfer queue. None means that the capacity is unlimited, which is the default.
         This may deplete the heap if input transfers are not consumed quickly enough so beware.
 
-        If the capacity is changed and the new value is smaller than the number of frames currently in the queue,
-        the newest frames will be discarded and the number of queue overruns will be incremented accordingly.
-        The complexity of a queue capacity change may be up to linear of the number of frames currently in the queue.
+        If the capacity is changed and the new value is smaller than the number of transfers currently in the queue,
+        the newest transfers will be discarded and accounted as dropped.
+        The complexity of a queue capacity change may be up to linear of the number of transfers in the queue.
         If the value is not None, it must be a positive integer, otherwise you get a :class:`ValueError`.
         """
         return self._queue.maxsize if self._queue.maxsize > 0 else None
 
-    @frame_queue_capacity.setter
-    def frame_queue_capacity(self, value: typing.Optional[int]) -> None:
+    @transfer_queue_capacity.setter
+    def transfer_queue_capacity(self, value: typing.Optional[int]) -> None:
         if value is not None and not value > 0:
             raise ValueError(f'Invalid value for queue capacity: {value}')
 
@@ -89,10 +91,28 @@ class CANInputSession(_base.CANSession, pyuavcan.transport.InputSession):
         self._queue = asyncio.Queue(int(value) if value is not None else 0, loop=self._loop)
         try:
             while True:
-                self._push_frame(*old_queue.get_nowait())
+                self._enqueue(old_queue.get_nowait())
         except asyncio.QueueEmpty:
             pass
 
+    @property
+    def frame_queue_capacity(self) -> typing.Optional[int]:
+        """
+        Deprecated alias of :attr:`transfer_queue_capacity`; will be removed in a future version.
+        The capacity used to be expressed in frames; now it is expressed in transfers.
+        """
+        warnings.warn('frame_queue_capacity is deprecated; use transfer_queue_capacity instead',
+                      category=DeprecationWarning,
+                      stacklevel=2)
+        return self.transfer_queue_capacity
+
+    @frame_queue_capacity.setter
+    def frame_queue_capacity(self, value: typing.Optional[int]) -> None:
+        warnings.warn('frame_queue_capacity is deprecated; use transfer_queue_capacity instead',
+                      category=DeprecationWarning,
+                      stacklevel=2)
+        self.transfer_queue_capacity = value
+
     @property
     def specifier(self) -> pyuavcan.transport.InputSessionSpecifier:
         return self._specifier
@@ -116,78 +136,158 @@ class CANInputSession(_base.CANSession, pyuavcan.transport.InputSession):
             raise ValueError(f'Invalid value for transfer-ID timeout [second]: {value}')
 
     async def receive_until(self, monotonic_deadline: float) -> typing.Optional[pyuavcan.transport.TransferFrom]:
-        out = await self._do_receive_until(monotonic_deadline)
-        assert out is None or self.specifier.remote_node_id is None \
+        try:
+            timeout = monotonic_deadline - self._loop.time()
+            if timeout > 0:
+                out = await asyncio.wait_for(self._queue.get(), timeout, loop=self._loop)
+            else:
+                out = self._queue.get_nowait()
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            # If there are unprocessed transfers, allow the caller to read them even if the instance is closed.
+            self._raise_if_closed()
+            return None
+        assert isinstance(out, pyuavcan.transport.TransferFrom)
+        assert self.specifier.remote_node_id is None \
             or out.source_node_id == self.specifier.remote_node_id, 'Internal input session protocol violation'
         return out
 
     def close(self) -> None:
         super(CANInputSession, self).close()
 
-    async def _do_receive_until(self, monotonic_deadline: float) -> typing.Optional[pyuavcan.transport.TransferFrom]:
-        while True:
-            try:
-                # Continue reading past the deadline until the queue is empty or a transfer is received.
-                timeout = monotonic_deadline - self._loop.time()
-                if timeout > 0:
-                    canid, frame = await asyncio.wait_for(self._queue.get(), timeout, loop=self._loop)
-                else:
-                    canid, frame = self._queue.get_nowait()
-                assert isinstance(canid, _identifier.CANID)
-                assert isinstance(frame, _frame.TimestampedUAVCANFrame)
-            except (asyncio.TimeoutError, asyncio.QueueEmpty):
-                # If there are unprocessed messages, allow the caller to read them even if the instance is closed.
-                self._raise_if_closed()
-                return None
-
-            self._statistics.frames += 1
-
-            if isinstance(canid, _identifier.MessageCANID):
-                assert isinstance(self._specifier.data_specifier, pyuavcan.transport.MessageDataSpecifier)
-                assert self._specifier.data_specifier.subject_id == canid.subject_id
-                source_node_id = canid.source_node_id
-                if source_node_id is None:
-                    # Anonymous transfer - no reconstruction needed
-                    self._statistics.transfers += 1
-                    self._statistics.payload_bytes += len(frame.padded_payload)
-                    out = pyuavcan.transport.TransferFrom(timestamp=frame.timestamp,
-                                                          priority=canid.priority,
-                                                          transfer_id=frame.transfer_id,
-                                                          fragmented_payload=[frame.padded_payload],
-                                                          source_node_id=None)
-                    _logger.debug('%s: Received anonymous transfer: %s; current stats: %s', self, out, self._statistics)
-                    return out
-
-            elif isinstance(canid, _identifier.ServiceCANID):
-                assert isinstance(self._specifier.data_specifier, pyuavcan.transport.ServiceDataSpecifier)
-                assert self._specifier.data_specifier.service_id == canid.service_id
-                assert (self._specifier.data_specifier.role == pyuavcan.transport.ServiceDataSpecifier.Role.REQUEST) \
-                    == canid.request_not_response
-                source_node_id = canid.source_node_id
-
-            else:
-                assert False
-
-            receiver = self._receivers[source_node_id]
-            result = receiver.process_frame(canid.priority, frame, self._transfer_id_timeout_ns)
-            if isinstance(result, _transfer_reassembler.TransferReassemblyErrorID):
-                self._statistics.errors += 1
-                self._statistics.reception_error_counters[result] += 1
-                _logger.debug('%s: Rejecting CAN frame %s because %s; current stats: %s',
-                              self, frame, result, self._statistics)
-            elif isinstance(result, pyuavcan.transport.TransferFrom):
+    def _enqueue(self, transfer: pyuavcan.transport.TransferFrom) -> None:
+        try:
+            self._queue.put_nowait(transfer)
+        except asyncio.QueueFull:
+            self._statistics.drops += 1
+            _logger.info('Input session %s: input queue overflow; transfer %s is dropped', self, transfer)
+
+    def _process_frame(self,
+                       canid: _identifier.CANID,
+                       frame: _frame.TimestampedUAVCANFrame) -> typing.Optional[pyuavcan.transport.TransferFrom]:
+        self._statistics.frames += 1
+
+        if isinstance(canid, _identifier.MessageCANID):
+            assert isinstance(self._specifier.data_specifier, pyuavcan.transport.MessageDataSpecifier)
+            assert self._specifier.data_specifier.subject_id == canid.subject_id
+            source_node_id = canid.source_node_id
+            if source_node_id is None:
+                # Anonymous transfer - no reconstruction needed
                 self._statistics.transfers += 1
-                self._statistics.payload_bytes += sum(map(len, result.fragmented_payload))
-                _logger.debug('%s: Received transfer: %s; current stats: %s', self, result, self._statistics)
-                return result
-            elif result is None:
-                pass        # Nothing to do - expecting more frames
-            else:
-                assert False
+                self._statistics.payload_bytes += len(frame.padded_payload)
+                out = pyuavcan.transport.TransferFrom(timestamp=frame.timestamp,
+                                                      priority=canid.priority,
+                                                      transfer_id=frame.transfer_id,
+                                                      fragmented_payload=[frame.padded_payload],
+                                                      source_node_id=None)
+                _logger.debug('%s: Received anonymous transfer: %s; current stats: %s', self, out, self._statistics)
+                return out
+
+        elif isinstance(canid, _identifier.ServiceCANID):
+            assert isinstance(self._specifier.data_specifier, pyuavcan.transport.ServiceDataSpecifier)
+            assert self._specifier.data_specifier.service_id == canid.service_id
+            assert (self._specifier.data_specifier.role == pyuavcan.transport.ServiceDataSpecifier.Role.REQUEST) \
+                == canid.request_not_response
+            source_node_id = canid.source_node_id
 
+        else:
+            assert False
+
+        self._evict_idle_reassemblers(frame.timestamp.monotonic_ns)
+        receiver = self._get_reassembler(source_node_id)
+        result = receiver.process_frame(canid.priority, frame, self._transfer_id_timeout_ns)
+        if isinstance(result, _transfer_reassembler.TransferReassemblyErrorID):
+            self._statistics.errors += 1
+            self._statistics.reception_error_counters[result] += 1
+            _logger.debug('%s: Rejecting CAN frame %s because %s; current stats: %s',
+                          self, frame, result, self._statistics)
+        elif isinstance(result, pyuavcan.transport.TransferFrom):
+            self._statistics.transfers += 1
+            self._statistics.payload_bytes += sum(map(len, result.fragmented_payload))
+            _logger.debug('%s: Received transfer: %s; current stats: %s', self, result, self._statistics)
+            return result
+        elif result is None:
+            pass        # Nothing to do - expecting more frames
+        else:
+            assert False
+        return None
+
+    def _get_reassembler(self, source_node_id: int) -> _transfer_reassembler.TransferReassembler:
+        try:
+            return self._reassemblers[source_node_id]
+        except LookupError:
+            reasm = _transfer_reassembler.TransferReassembler(source_node_id, self._payload_metadata.max_size_bytes)
+            self._reassemblers[source_node_id] = reasm
+            _logger.debug('%s: New reassembler for node %d (%d total)', self, source_node_id, len(self._reassemblers))
+            return reasm
+
+    def _evict_idle_reassemblers(self, monotonic_ns: int) -> None:
+        """
+        A reassembler that has not seen any frames for longer than the transfer-ID timeout would treat the next
+        frame exactly like a new reassembler does, so it can be removed without affecting the behavior.
+        The check is performed at most once per eviction interval, so its cost is amortized.
+        """
+        if monotonic_ns < self._next_eviction_check_ns:
+            return
+        idle_timeout_ns = self._transfer_id_timeout_ns * _REASSEMBLER_EVICTION_TIMEOUT_MULTIPLIER
+        self._next_eviction_check_ns = monotonic_ns + idle_timeout_ns
+        for source_node_id, reasm in list(self._reassemblers.items()):
+            if monotonic_ns - reasm.last_frame_monotonic_ns > idle_timeout_ns:
+                del self._reassemblers[source_node_id]
+                _logger.debug('%s: Evicted the idle reassembler for node %d', self, source_node_id)
 
-def _node_id_range() -> typing.Iterable[int]:
-    return range(_identifier.CANID.NODE_ID_MASK + 1)
 
+_REASSEMBLER_EVICTION_TIMEOUT_MULTIPLIER = 4
+"""
+A reassembler is evicted if it has not seen any frames for this many transfer-ID timeouts.
+"""
 
 _NANO = 1e-9
+
+
+def _unittest_can_input_session_reassembler_eviction() -> None:
+    from pyuavcan.transport import InputSessionSpecifier, MessageDataSpecifier, PayloadMetadata, Priority, Timestamp
+
+    loop = asyncio.new_event_loop()
+    ses = CANInputSession(InputSessionSpecifier(MessageDataSpecifier(1234), None),
+                          PayloadMetadata(0, 100),
+                          loop,
+                          lambda: None)
+    assert not ses._reassemblers                # Nothing is allocated until the sources are heard from
+    ses.transfer_id_timeout = 1.0
+
+    def push(source_node_id: int, transfer_id: int, monotonic_ns: int) -> None:
+        canid = _identifier.MessageCANID(Priority.NOMINAL, source_node_id, 1234)
+        ses._push_frame(canid, _frame.TimestampedUAVCANFrame(identifier=canid.compile([]),
+                                                             padded_payload=memoryview(b'abc'),
+                                                             transfer_id=transfer_id,
+                                                             start_of_transfer=True,
+                                                             end_of_transfer=True,
+                                                             toggle_bit=True,
+                                                             loopback=False,
+                                                             timestamp=Timestamp(0, monotonic_ns)))
+
+    async def receive() -> typing.Optional[pyuavcan.transport.TransferFrom]:
+        return await ses.receive_until(0)
+
+    push(10, 0, 1_000_000_000)
+    push(11, 0, 1_000_000_000)
+    push(11, 0, 2_000_000_000)              # Duplicate within the transfer-ID timeout
+    assert loop.run_until_complete(receive()).source_node_id == 10   # type: ignore
+    assert loop.run_until_complete(receive()).source_node_id == 11   # type: ignore
+    assert loop.run_until_complete(receive()) is None
+    assert set(ses._reassemblers) == {10, 11}
+    assert ses.sample_statistics().errors == 1
+
+    # Node 10 keeps publishing while node 11 goes silent, so its reassembler is eventually evicted.
+    for i in range(1, 10):
+        push(10, i, 1_000_000_000 + i * 1_000_000_000)
+        transfer = loop.run_until_complete(receive())
+        assert transfer is not None and transfer.transfer_id == i
+    assert set(ses._reassemblers) == {10}
+
+    # The evicted node is accepted again as if nothing happened.
+    push(11, 0, 11_000_000_000)
+    assert loop.run_until_complete(receive()).source_node_id == 11   # type: ignore
+    assert set(ses._reassemblers) == {10, 11}
+    ses.close()
+    loop.close()
@@ -8,14 +8,14 @@ from __future__ import annotations
 import copy
 import typing
 import logging
-import itertools
 import dataclasses
 import pyuavcan.transport
 from .. import _frame, _identifier
+from ..media import DataFrame
 from . import _base, _transfer_sender
 
 
-SendHandler = typing.Callable[[typing.Iterable[_frame.UAVCANFrame], float], typing.Awaitable[bool]]
+SendHandler = typing.Callable[[typing.Sequence[DataFrame], float], typing.Awaitable[bool]]
 
 _logger = logging.getLogger(__name__)
 
@@ -117,18 +117,16 @@ class CANOutputSession(_base.CANSession, pyuavcan.transport.OutputSession):
                              monotonic_deadline: float) -> bool:
         self._raise_if_closed()
 
-        # Decompose the outgoing transfer into individual CAN frames
-        frames, auxiliary_iter = itertools.tee(_transfer_sender.serialize_transfer(
+        # Compile the outgoing transfer into CAN frames ready for the media
+        frames = _transfer_sender.compile_transfer(
             compiled_identifier=can_id.compile(transfer.fragmented_payload),
             transfer_id=transfer.transfer_id,
             fragmented_payload=transfer.fragmented_payload,
             max_frame_payload_bytes=self._transport.protocol_parameters.mtu,
             loopback_first_frame=self._feedback_handler is not None
-        ))
-        first_frame = next(auxiliary_iter)
-        num_frames = 1 + sum(1 for _ in auxiliary_iter)
+        )
+        num_frames = len(frames)
         assert num_frames > 0
-        del auxiliary_iter
 
         # Ensure we're not trying to emit a multi-frame anonymous transfer - that's illegal
         if can_id.source_node_id is None and num_frames > 1:
@@ -136,9 +134,9 @@ class CANOutputSession(_base.CANSession, pyuavcan.transport.OutputSession):
                 f'Anonymous nodes cannot emit multi-frame transfers. CANID: {can_id}, transfer: {transfer}')
 
         # If a loopback was requested, register it in the pending loopback registry
-        if first_frame.loopback:
-            key = _PendingFeedbackKey(compiled_identifier=first_frame.identifier,
-                                      transfer_id_modulus=first_frame.transfer_id)
+        if frames[0].loopback:
+            key = _PendingFeedbackKey(compiled_identifier=frames[0].identifier,
+                                      transfer_id_modulus=transfer.transfer_id % _frame.TRANSFER_ID_MODULO)
             try:
                 old = self._pending_feedback[key]
             except KeyError:
@@ -35,6 +35,14 @@ class TransferReassembler:
         self._crc = pyuavcan.transport.commons.crc.CRC16CCITT()
         self._payload_truncated = False
         self._fragmented_payload: typing.List[memoryview] = []
+        self._last_frame_monotonic_ns = 0
+
+    @property
+    def last_frame_monotonic_ns(self) -> int:
+        """
+        The monotonic timestamp of the last processed frame, or zero if no frames have been processed yet.
+        """
+        return self._last_frame_monotonic_ns
 
     def process_frame(self,
                       priority:               pyuavcan.transport.Priority,
@@ -47,6 +55,8 @@ class TransferReassembler:
         timestamp values are monotonically increasing. The timestamp of a transfer will be the lowest (earliest)
         timestamp value of its frames (ignoring frames with mismatching transfer ID or toggle bit).
         """
+        self._last_frame_monotonic_ns = frame.timestamp.monotonic_ns
+
         # FIRST STAGE - DETECTION OF NEW TRANSFERS.
         # Decide if we need to begin a new transfer.
         tid_timed_out = \
@@ -8,6 +8,7 @@ import typing
 import itertools
 import pyuavcan
 from .. import _frame
+from ..media import DataFrame, FrameFormat
 
 
 _PADDING_PATTERN = b'\x00'
@@ -73,6 +74,77 @@ def serialize_transfer(compiled_identifier:     int,
                                      loopback=first and loopback_first_frame)
 
 
+def compile_transfer(compiled_identifier:     int,
+                     transfer_id:             int,
+                     fragmented_payload:      typing.Sequence[memoryview],
+                     max_frame_payload_bytes: int,
+                     loopback_first_frame:    bool) -> typing.List[DataFrame]:
+    """
+    Produces the same frames as :func:`serialize_transfer` followed by :meth:`UAVCANFrame.compile`, but in one pass:
+    the payload, padding, transfer CRC, and tail bytes of all frames are written into one buffer allocated upfront,
+    and the data of each resulting frame is a view into that buffer.
+    The payload is copied exactly once; no intermediate frame objects are created.
+    """
+    if max_frame_payload_bytes < 1:  # pragma: no cover
+        raise ValueError(f'Invalid max payload: {max_frame_payload_bytes}')
+
+    payload_length = sum(map(len, fragmented_payload))
+    if payload_length <= max_frame_payload_bytes:               # SINGLE-FRAME TRANSFER
+        padding_length = _frame.UAVCANFrame.get_required_padding(payload_length)
+        crc_length = 0
+    else:                                                       # MULTI-FRAME TRANSFER
+        last_frame_payload_length = payload_length % max_frame_payload_bytes
+        crc_length = _frame.TRANSFER_CRC_LENGTH_BYTES
+        if last_frame_payload_length + crc_length >= max_frame_payload_bytes:
+            padding_length = 0
+        else:
+            padding_length = _frame.UAVCANFrame.get_required_padding(last_frame_payload_length + crc_length)
+
+    # The stream is the concatenation of the padded payloads of all frames, excluding the tail bytes.
+    # Stream offset X is located at buffer offset X + X // max_frame_payload_bytes because of the tail bytes.
+    stream_length = payload_length + padding_length + crc_length
+    num_frames = max(1, -(-stream_length // max_frame_payload_bytes))
+    stride = max_frame_payload_bytes + 1
+    buffer = bytearray(stream_length + num_frames)             # Zero-initialized, so the padding is already there
+
+    offset = 0
+    for frag in fragmented_payload:
+        frag_offset, frag_length = 0, len(frag)
+        while frag_offset < frag_length:
+            size = min(max_frame_payload_bytes - offset % max_frame_payload_bytes, frag_length - frag_offset)
+            start = offset + offset // max_frame_payload_bytes
+            buffer[start:start + size] = frag[frag_offset:frag_offset + size]
+            frag_offset += size
+            offset += size
+
+    if crc_length > 0:
+        crc = pyuavcan.transport.commons.crc.CRC16CCITT.new(*fragmented_payload, bytes(padding_length))
+        offset += padding_length
+        for x in crc.value_as_bytes:
+            buffer[offset + offset // max_frame_payload_bytes] = x
+            offset += 1
+
+    view = memoryview(buffer)
+    tail_base = transfer_id % _frame.TRANSFER_ID_MODULO
+    out: typing.List[DataFrame] = []
+    for index in range(num_frames):
+        start = index * stride
+        end = min(start + stride, len(buffer))
+        tail = tail_base
+        if index == 0:
+            tail |= 1 << 7                                      # Start of transfer
+        if index == num_frames - 1:
+            tail |= 1 << 6                                      # End of transfer
+        if index % 2 == 0:
+            tail |= 1 << 5                                      # Toggle bit
+        buffer[end - 1] = tail
+        out.append(DataFrame(identifier=compiled_identifier,
+                             data=view[start:end],
+                             format=FrameFormat.EXTENDED,
+                             loopback=index == 0 and loopback_first_frame))
+    return out
+
+
 def _unittest_can_serialize_transfer() -> None:
     from ..media import DataFrame, FrameFormat
 
@@ -152,3 +224,36 @@ def _unittest_can_serialize_transfer() -> None:
         mkf(123456, b'\x0b\x0c\x0d\x0e\x0f\x10\x11\x12\x13\x14\x15', 19, False, False, False),
         mkf(123456, b'\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x00\x32\xF6', 19, False, True, True),
     ] == list(run(123456, 32323219, [mv(bytes(range(0x1E)))], 11, False))
+
+
+def _unittest_can_compile_transfer() -> None:
+    import os
+    import random
+
+    def reference(compiled_identifier:     int,
+                  transfer_id:             int,
+                  fragmented_payload:      typing.Sequence[memoryview],
+                  max_frame_payload_bytes: int,
+                  loopback:                bool) -> typing.List[DataFrame]:
+        return [f.compile() for f in serialize_transfer(compiled_identifier=compiled_identifier,
+                                                        transfer_id=transfer_id,
+                                                        fragmented_payload=fragmented_payload,
+                                                        max_frame_payload_bytes=max_frame_payload_bytes,
+                                                        loopback_first_frame=loopback)]
+
+    for max_frame_payload_bytes in (7, 63):
+        for payload_length in list(range(0, 3 * max_frame_payload_bytes + 3)) + [1000, 1001, 5000]:
+            payload = os.urandom(payload_length)
+            cuts = sorted(random.randint(0, payload_length) for _ in range(random.randint(0, 4)))
+            fragmented_payload = [memoryview(payload[a:b]) for a, b in zip([0] + cuts, cuts + [payload_length])]
+            args = (random.randint(0, 2 ** 29 - 1),
+                    random.randint(0, 2 ** 56),
+                    fragmented_payload,
+                    max_frame_payload_bytes,
+                    random.choice([False, True]))
+            compiled = compile_transfer(*args)
+            assert compiled == reference(*args)
+            assert all(isinstance(f.data, memoryview) for f in compiled)
+
+    frame, = compile_transfer(123, 1, [], 7, True)
+    assert frame.identifier == 123 and bytes(frame.data) == b'\xE1' and frame.loopback
@@ -0,0 +1,266 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import heapq
+import typing
+import asyncio
+import itertools
+import dataclasses
+from .media import DataFrame, FrameFormat
+
+
+SendHandler = typing.Callable[[typing.Sequence[DataFrame], float], typing.Awaitable[int]]
+"""
+Passes the frames over to the media and returns the number of frames that were sent before the deadline.
+"""
+
+
+@dataclasses.dataclass
+class TransmissionQueueStatistics:
+    depth:           int = 0    #: Number of transfers awaiting transmission, including the one being transmitted.
+    depth_max:       int = 0    #: The maximum value of the above observed so far.
+    transfers:       int = 0    #: Number of transfers that have reached the media (at least partially).
+    wait_time_total: float = 0  #: Total time, in seconds, spent by the above transfers waiting for the media.
+    wait_time_max:   float = 0  #: The maximum time a transfer has spent waiting for the media, in seconds.
+
+
+class TransmissionQueue:
+    """
+    Schedules the outgoing transfers for transmission in the order of their CAN ID values, like the CAN bus
+    arbitration does: the transfer with the lowest CAN ID is passed over to the media first.
+    Multi-frame transfers are passed over to the media in chunks of limited size, which allows a newly arrived
+    transfer of higher priority to preempt a long transfer of lower priority at a frame boundary instead of
+    waiting for its completion. Transfers with the same CAN ID are never interleaved; they are sent in the
+    order of arrival.
+
+    There is no dedicated task: the transmission is performed by the task of one of the senders whose transfer
+    is waiting in the queue; when its transfer is done, the duty is handed over to the owner of the next transfer.
+    Therefore, if the queue is empty, a new transfer is passed over to the media immediately, without involving
+    other tasks.
+    """
+
+    def __init__(self,
+                 send_handler:            SendHandler,
+                 loop:                    asyncio.AbstractEventLoop,
+                 max_frames_per_dispatch: int = 8):
+        """
+        :param send_handler: Invoked with a chunk of frames of one transfer that share the same CAN ID.
+        :param loop: The event loop to use.
+        :param max_frames_per_dispatch: The maximum number of frames passed over to the media at once.
+            A transfer of higher priority may have to wait until this many frames are sent.
+        """
+        if max_frames_per_dispatch < 1:
+            raise ValueError(f'Invalid number of frames per dispatch: {max_frames_per_dispatch}')
+        self._send_handler = send_handler
+        self._loop = loop
+        self._max_frames_per_dispatch = int(max_frames_per_dispatch)
+        self._heap: typing.List[typing.Tuple[int, int, _Entry]] = []
+        self._sequence_counter = itertools.count()
+        self._in_flight: typing.Optional[_Entry] = None
+        self._busy = False
+        self._stats = TransmissionQueueStatistics()
+
+    def sample_statistics(self) -> TransmissionQueueStatistics:
+        self._stats.depth = self._depth
+        return dataclasses.replace(self._stats)
+
+    async def send_until(self,
+                         can_id:             int,
+                         frames:             typing.Sequence[DataFrame],
+                         monotonic_deadline: float) -> int:
+        """
+        Returns the number of frames of the transfer that were sent before the deadline. The frames that were not
+        passed over to the media before the deadline are dropped. Exceptions raised by the send handler while
+        transmitting this transfer are propagated to the caller.
+        """
+        entry = _Entry(frames=frames, deadline=monotonic_deadline, enqueued_at=self._loop.time())
+        heapq.heappush(self._heap, (can_id, next(self._sequence_counter), entry))
+        self._stats.depth_max = max(self._stats.depth_max, self._depth)
+        try:
+            while not entry.done:
+                if self._busy:
+                    entry.waiter = self._loop.create_future()
+                    await entry.waiter
+                else:
+                    await self._dispatch_until_done(entry)
+        except asyncio.CancelledError:
+            entry.cancelled = True  # The entry will be removed from the heap by the dispatcher.
+            raise
+        finally:
+            entry.waiter = None
+            if not self._busy:
+                self._hand_over()
+
+        if entry.exception is not None:
+            raise entry.exception
+        return entry.num_sent
+
+    async def _dispatch_until_done(self, own: _Entry) -> None:
+        self._busy = True
+        try:
+            while not own.done and not own.cancelled:
+                _can_id, _seq, entry = heapq.heappop(self._heap)
+                if entry.cancelled:
+                    continue
+                if self._loop.time() >= entry.deadline:
+                    self._finalize(entry)
+                    continue
+
+                if entry.num_sent == 0:
+                    wait_time = self._loop.time() - entry.enqueued_at
+                    self._stats.transfers += 1
+                    self._stats.wait_time_total += wait_time
+                    self._stats.wait_time_max = max(self._stats.wait_time_max, wait_time)
+
+                chunk = entry.frames[entry.num_sent:entry.num_sent + self._max_frames_per_dispatch]
+                self._in_flight = entry
+                try:
+                    num_sent = await self._send_handler(chunk, entry.deadline)
+                except asyncio.CancelledError:
+                    # The outcome of the chunk is unknown, so the transfer is aborted rather than resumed later.
+                    self._finalize(entry)
+                    raise
+                except Exception as ex:
+                    entry.exception = ex
+                    self._finalize(entry)
+                    continue
+                finally:
+                    self._in_flight = None
+
+                assert 0 <= num_sent <= len(chunk), 'Media sub-layer API contract violation'
+                entry.num_sent += num_sent
+                if num_sent < len(chunk) or entry.num_sent >= len(entry.frames):
+                    self._finalize(entry)
+                else:
+                    heapq.heappush(self._heap, (_can_id, _seq, entry))
+        finally:
+            self._busy = False
+
+    def _hand_over(self) -> None:
+        """
+        Wakes up the owner of the next transfer in the queue so that it continues the transmission.
+        """
+        while self._heap:
+            entry = self._heap[0][-1]
+            if entry.cancelled:
+                heapq.heappop(self._heap)
+            else:
+                if entry.waiter is not None and not entry.waiter.done():
+                    entry.waiter.set_result(None)
+                break
+
+    @staticmethod
+    def _finalize(entry: _Entry) -> None:
+        entry.done = True
+        if entry.waiter is not None and not entry.waiter.done():
+            entry.waiter.set_result(None)
+
+    @property
+    def _depth(self) -> int:
+        return sum(1 for _, _, e in self._heap if not e.cancelled) + (1 if self._in_flight is not None else 0)
+
+
+@dataclasses.dataclass
+class _Entry:
+    frames:      typing.Sequence[DataFrame]
+    deadline:    float
+    enqueued_at: float
+    num_sent:    int = 0
+    done:        bool = False
+    cancelled:   bool = False
+    exception:   typing.Optional[Exception] = None
+    waiter:      typing.Optional[asyncio.Future[None]] = None
+
+
+def _unittest_can_tx_queue() -> None:
+    loop = asyncio.new_event_loop()
+    log: typing.List[typing.Tuple[int, int]] = []
+    media_budget = [999]
+
+    def mk(can_id: int, count: int) -> typing.List[DataFrame]:
+        return [DataFrame(identifier=can_id, data=bytearray([i]), format=FrameFormat.EXTENDED, loopback=False)
+                for i in range(count)]
+
+    async def send(frames: typing.Sequence[DataFrame], deadline: float) -> int:
+        assert deadline > 0
+        await asyncio.sleep(0.001)
+        num_sent = min(len(frames), media_budget[0])
+        media_budget[0] -= num_sent
+        log.extend((f.identifier, f.data[0]) for f in frames[:num_sent])
+        if frames[0].identifier == 0xBAD:
+            raise RuntimeError('Induced failure')
+        return num_sent
+
+    queue = TransmissionQueue(send, loop, max_frames_per_dispatch=2)
+
+    async def run() -> None:
+        deadline = loop.time() + 10.0
+        # A long low-priority transfer is preempted by the high-priority one that arrives later.
+        low = loop.create_task(queue.send_until(300, mk(300, 7), deadline))
+        await asyncio.sleep(0)      # Now the first chunk of the low-priority transfer is being transmitted.
+        mid = loop.create_task(queue.send_until(200, mk(200, 3), deadline))
+        high = loop.create_task(queue.send_until(100, mk(100, 1), deadline))
+        same = loop.create_task(queue.send_until(300, mk(300, 1), deadline))   # Must not interleave with the first
+        await asyncio.sleep(0)
+        assert queue.sample_statistics().depth == 4
+        assert await low == 7
+        assert await mid == 3
+        assert await high == 1
+        assert await same == 1
+        assert log == [
+            (300, 0), (300, 1),
+            (100, 0),
+            (200, 0), (200, 1), (200, 2),
+            (300, 2), (300, 3), (300, 4), (300, 5), (300, 6),
+            (300, 0),
+        ]
+        stats = queue.sample_statistics()
+        assert stats.depth == 0
+        assert stats.depth_max == 4
+        assert stats.transfers == 4
+        assert stats.wait_time_max >= 0.001
+        assert stats.wait_time_total >= stats.wait_time_max
+        log.clear()
+
+        # Expired transfers are dropped without reaching the media.
+        blocker = loop.create_task(queue.send_until(100, mk(100, 1), deadline))
+        await asyncio.sleep(0)
+        assert await queue.send_until(50, mk(50, 3), loop.time() + 0.0001) == 0
+        assert await blocker == 1
+        assert log == [(100, 0)]
+        log.clear()
+
+        # The media refuses to send some frames.
+        media_budget[0] = 3
+        assert await queue.send_until(10, mk(10, 5), deadline) == 3
+        media_budget[0] = 999
+        log.clear()
+
+        # Exceptions are delivered to the owner of the failed transfer only.
+        bad = loop.create_task(queue.send_until(0xBAD, mk(0xBAD, 1), deadline))
+        good = loop.create_task(queue.send_until(0xBAE, mk(0xBAE, 2), deadline))
+        try:
+            await bad
+        except RuntimeError as ex:
+            assert 'Induced' in str(ex)
+        else:  # pragma: no cover
+            assert False
+        assert await good == 2
+
+        # A cancelled waiter does not stall the queue.
+        first = loop.create_task(queue.send_until(1, mk(1, 4), deadline))
+        await asyncio.sleep(0)
+        cancelled = loop.create_task(queue.send_until(2, mk(2, 1), deadline))
+        last = loop.create_task(queue.send_until(3, mk(3, 1), deadline))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        assert await first == 4
+        assert await last == 1
+        assert queue.sample_statistics().depth == 0
+
+    loop.run_until_complete(run())
+    loop.close()
@@ -0,0 +1,166 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+"""
+Serialization of recorded CAN traffic. Two formats are supported:
+
+- The log format of ``candump -l`` from can-utils, one frame per line::
+
+    (1436509052.249713) vcan0 044#2A366D2A
+    (1436509052.449713) vcan0 1ABCDEF0##1112233
+
+  Base (11-bit) identifiers are written with 3 hex digits, extended (29-bit) ones with 8.
+  CAN FD frames use a double separator followed by the FD flags nibble.
+  Remote and error frames are skipped, as well as the unparseable lines.
+
+- The compact binary format, which is much cheaper to produce and to parse.
+  The file begins with :data:`BINARY_MAGIC` followed by records, each of which is a :data:`BINARY_RECORD_HEADER`
+  followed by the frame data: system timestamp in nanoseconds (u64), CAN ID (u32), flags (u8), data length (u8).
+  All fields are little-endian. Bit 0 of the flags is set for extended identifiers;
+  bits 1 and 2 contain the :class:`Direction`.
+"""
+
+from __future__ import annotations
+import enum
+import mmap
+import struct
+import typing
+import logging
+import binascii
+from ._frame import FrameFormat, DataFrame
+
+
+class Direction(enum.IntEnum):
+    """
+    Candump logs do not carry the direction, so all frames parsed from them are reported as received.
+    """
+    RECEIVED = 0
+    LOOPBACK = 1        #: A transmitted frame that was looped back by the media; it is a duplicate of the original.
+    TRANSMITTED = 2
+
+
+CaptureRecord = typing.Tuple[int, int, FrameFormat, bytearray, Direction]
+"""
+System timestamp in nanoseconds, CAN ID, frame format, data, and the direction of the frame.
+"""
+
+BINARY_MAGIC = b'UCANCAP\x01'
+
+BINARY_RECORD_HEADER = struct.Struct('<QIBB')
+
+BINARY_FLAG_EXTENDED = 1
+BINARY_DIRECTION_SHIFT = 1     # Bits 1 and 2 of the flags contain the direction.
+
+_CANDUMP_ERROR_FLAG = 0x2000_0000
+
+_logger = logging.getLogger(__name__)
+
+
+def parse_binary(buffer: typing.Union[bytes, bytearray, memoryview, mmap.mmap],
+                 offset: int = len(BINARY_MAGIC)) -> typing.Iterator[CaptureRecord]:
+    """
+    The buffer can be anything that supports the buffer protocol, such as a memory-mapped file.
+    The magic is expected to be checked by the caller. A truncated record at the end is ignored.
+    """
+    unpack_from = BINARY_RECORD_HEADER.unpack_from
+    header_size = BINARY_RECORD_HEADER.size
+    end = len(buffer)
+    while offset + header_size <= end:
+        system_ns, identifier, flags, length = unpack_from(buffer, offset)
+        offset += header_size
+        if offset + length > end:
+            _logger.info('Truncated record at the end of the binary capture is ignored')
+            break
+        yield (system_ns,
+               identifier,
+               FrameFormat.EXTENDED if flags & BINARY_FLAG_EXTENDED else FrameFormat.BASE,
+               bytearray(buffer[offset:offset + length]),
+               Direction((flags >> BINARY_DIRECTION_SHIFT) & 3))
+        offset += length
+
+
+def serialize_binary(system_ns: int, frame: DataFrame, direction: Direction) -> bytes:
+    """
+    Produces one record of the binary format (without the magic).
+    """
+    flags = (BINARY_FLAG_EXTENDED if frame.format == FrameFormat.EXTENDED else 0) | \
+        (int(direction) << BINARY_DIRECTION_SHIFT)
+    return BINARY_RECORD_HEADER.pack(system_ns, frame.identifier, flags, len(frame.data)) + bytes(frame.data)
+
+
+def parse_candump_line(line: bytes) -> typing.Optional[CaptureRecord]:
+    """
+    Returns None if the line does not represent a data frame.
+    """
+    try:
+        timestamp, _iface, frame = line.split()[:3]
+        if not (timestamp.startswith(b'(') and timestamp.endswith(b')')):
+            return None
+        seconds, _, fraction = timestamp[1:-1].partition(b'.')
+        system_ns = int(seconds) * 1_000_000_000 + int(fraction[:9].ljust(9, b'0'))
+
+        identifier_hex, _, data_hex = frame.partition(b'#')
+        if data_hex.startswith(b'#'):
+            data_hex = data_hex[2:]                 # CAN FD frame: drop the separator and the flags nibble
+        elif data_hex.startswith(b'R'):
+            return None                             # Remote transmission request
+        identifier = int(identifier_hex, 16)
+        if identifier & _CANDUMP_ERROR_FLAG:
+            return None
+        frame_format = FrameFormat.EXTENDED if len(identifier_hex) > 3 else FrameFormat.BASE
+        return system_ns, identifier, frame_format, bytearray(binascii.unhexlify(data_hex)), Direction.RECEIVED
+    except ValueError:
+        return None
+
+
+def format_candump_line(system_ns: int, interface_name: str, frame: DataFrame) -> str:
+    seconds, nanoseconds = divmod(system_ns, 1_000_000_000)
+    identifier = f'{frame.identifier:08X}' if frame.format == FrameFormat.EXTENDED else f'{frame.identifier:03X}'
+    separator = '#' if len(frame.data) <= 8 else '##0'
+    data = bytes(frame.data).hex().upper()
+    return f'({seconds}.{nanoseconds // 1000:06d}) {interface_name} {identifier}{separator}{data}'
+
+
+def _unittest_can_capture_format() -> None:
+    lines = [
+        b'(1436509052.249713) vcan0 044#2A366D2A',
+        b'(1436509052.449713) vcan0 1ABCDEF0##1112233',
+        b'(1436509052.5) can1 12345678#',
+        b'(1436509052.649713) vcan0 123#R',                 # RTR
+        b'(1436509052.749713) vcan0 20000080#0000000000000000',    # Error frame
+        b'garbage',
+        b'(1436509052.949713) vcan0 123#ABC',               # Odd number of hex digits
+    ]
+    parsed = list(map(parse_candump_line, lines))
+    assert parsed == [
+        (1436509052_249713000, 0x044, FrameFormat.BASE, bytearray(b'\x2A\x36\x6D\x2A'), Direction.RECEIVED),
+        (1436509052_449713000, 0x1ABCDEF0, FrameFormat.EXTENDED, bytearray(b'\x11\x22\x33'), Direction.RECEIVED),
+        (1436509052_500000000, 0x12345678, FrameFormat.EXTENDED, bytearray(), Direction.RECEIVED),
+        None,
+        None,
+        None,
+        None,
+    ]
+    frame = DataFrame(0x1ABCDEF0, bytearray(b'\x11\x22\x33'), FrameFormat.EXTENDED, loopback=False)
+    assert format_candump_line(1436509052_449713000, 'vcan0', frame) == '(1436509052.449713) vcan0 1ABCDEF0#112233'
+    assert parse_candump_line(format_candump_line(1436509052_449713000, 'vcan0', frame).encode()) == parsed[1]
+    frame = DataFrame(0x044, bytearray(range(12)), FrameFormat.BASE, loopback=False)
+    assert parse_candump_line(format_candump_line(123_000_000_000, 'can0', frame).encode()) == \
+        (123_000_000_000, 0x044, FrameFormat.BASE, bytearray(range(12)), Direction.RECEIVED)
+
+    frames = [
+        DataFrame(0x1ABCDEF0, bytearray(b'\x11\x22\x33'), FrameFormat.EXTENDED, loopback=False),
+        DataFrame(0x123, bytearray(range(64)), FrameFormat.BASE, loopback=True),
+        DataFrame(0, bytearray(), FrameFormat.EXTENDED, loopback=False),
+    ]
+    blob = BINARY_MAGIC + b''.join(serialize_binary(i * 1000, f, Direction(i)) for i, f in enumerate(frames))
+    assert list(parse_binary(blob)) == [
+        (0, 0x1ABCDEF0, FrameFormat.EXTENDED, bytearray(b'\x11\x22\x33'), Direction.RECEIVED),
+        (1000, 0x123, FrameFormat.BASE, bytearray(range(64)), Direction.LOOPBACK),
+        (2000, 0, FrameFormat.EXTENDED, bytearray(), Direction.TRANSMITTED),
+    ]
+    assert len(list(parse_binary(memoryview(blob)[:-1]))) == 2      # The last record is truncated
+    assert len(list(parse_binary(blob[:-15]))) == 1
@@ -5,9 +5,10 @@
 #
 
 from __future__ import annotations
+import heapq
 import typing
-import itertools
 import dataclasses
+import numpy
 from ._frame import FrameFormat
 
 
@@ -98,21 +99,108 @@ def optimize_filter_configurations(configurations: typing.Iterable[FilterConfigu
     The function returns the input set unchanged in this case.
     If the target number of configurations is not positive, a ValueError is raised.
 
-    The time complexity of this implementation is ``O(K!)``; it should be optimized.
+    The algorithm is greedy: at every step, the pair of configurations whose merge product has the highest
+    :attr:`FilterConfiguration.rank` is merged; ties are resolved in favor of the pair that occurs first in the input.
+    The best candidate pair of every configuration is kept in a priority queue, so that after every step only
+    the candidates that involve the operands of the merge need to be re-evaluated.
+    The time complexity is ``O(K^2 log K)`` in typical cases and ``O(K^3)`` in the worst case.
     """
     if target_number_of_configurations < 1:
         raise ValueError(f'The number of configurations must be positive; found {target_number_of_configurations}')
 
     configurations = list(configurations)
-    while len(configurations) > target_number_of_configurations:
-        options = itertools.starmap(lambda ia, ib: (ia[0], ib[0], ia[1].merge(ib[1])),
-                                    itertools.permutations(enumerate(configurations), 2))
-        index_replace, index_remove, merged = max(options, key=lambda x: x[2].rank)
-        configurations[index_replace] = merged
-        del configurations[index_remove]  # Invalidates indexes
+    if len(configurations) <= target_number_of_configurations:
+        return configurations
+
+    # The slots retain the original order of the configurations; a merge product replaces the first of its operands.
+    # The ranks of the merge products of all pairs of slots are kept in a matrix which is computed once with NumPy;
+    # after a merge, only the row and the column of the merge product need to be updated.
+    # Every slot is associated with its best merge partner among the slots that follow it, so that the best pair
+    # overall is the best of these K candidates. Since a merge product never ranks higher with a third configuration
+    # than either of its operands, a merge only affects the candidates that refer to its operands.
+    # The version counter of a slot is incremented whenever its candidate is replaced, which invalidates the old
+    # candidate in the priority queue; stale candidates are discarded lazily when popped.
+    identifiers = numpy.array([x.identifier for x in configurations], dtype=numpy.int64)
+    masks = numpy.array([x.mask for x in configurations], dtype=numpy.int64)
+    formats = numpy.array([int(x.format or 0) for x in configurations], dtype=numpy.int64)
+    slots: typing.List[typing.Optional[FilterConfiguration]] = list(configurations)
+    rank_matrix = _compute_merge_ranks(identifiers, masks, formats, identifiers, masks, formats)
+    numpy.fill_diagonal(rank_matrix, _NO_RANK)
+    alive = numpy.ones(len(slots), dtype=numpy.bool)
+    partners: typing.List[typing.Optional[int]] = [None] * len(slots)
+    ranks = [0] * len(slots)
+    versions = [0] * len(slots)
+    queue: typing.List[typing.Tuple[int, int, int, int]] = []
+
+    def update_candidate(ia: int) -> None:
+        versions[ia] += 1
+        partners[ia] = None
+        if ia + 1 < len(slots):
+            ib = ia + 1 + int(numpy.argmax(rank_matrix[ia, ia + 1:]))  # The first one is returned in case of a tie.
+            if rank_matrix[ia, ib] != _NO_RANK:
+                partners[ia], ranks[ia] = ib, int(rank_matrix[ia, ib])
+                heapq.heappush(queue, (-ranks[ia], ia, ib, versions[ia]))
+
+    for index in range(len(slots)):
+        update_candidate(index)
+
+    remaining = len(slots)
+    while remaining > target_number_of_configurations:
+        _, ia, ib, version = heapq.heappop(queue)
+        if version != versions[ia]:
+            continue                                        # Stale: the candidate has been replaced since.
+        a, b = slots[ia], slots[ib]
+        assert a is not None and b is not None and partners[ia] == ib
+        merged = a.merge(b)
+        slots[ia] = merged
+        slots[ib] = None
+        remaining -= 1
+        identifiers[ia], masks[ia], formats[ia] = merged.identifier, merged.mask, int(merged.format or 0)
+        alive[ib] = False
+        versions[ib] += 1
+        rank_matrix[ib] = _NO_RANK
+        rank_matrix[:, ib] = _NO_RANK
+        rank_matrix[ia] = numpy.where(alive,
+                                      _compute_merge_ranks(identifiers[ia:ia + 1], masks[ia:ia + 1],
+                                                           formats[ia:ia + 1], identifiers, masks, formats)[0],
+                                      _NO_RANK)
+        rank_matrix[ia, ia] = _NO_RANK
+        rank_matrix[:, ia] = rank_matrix[ia]
+        for index in range(ib):
+            if slots[index] is None:
+                continue
+            if index == ia or partners[index] == ib or \
+                    (partners[index] == ia and rank_matrix[index, ia] != ranks[index]):
+                update_candidate(index)
+
+    out = [x for x in slots if x is not None]
+    assert len(out) == target_number_of_configurations
+    assert all(map(lambda x: isinstance(x, FilterConfiguration), out))
+    return out
+
+
+def _compute_merge_ranks(a_identifiers: numpy.ndarray, a_masks: numpy.ndarray, a_formats: numpy.ndarray,
+                         b_identifiers: numpy.ndarray, b_masks: numpy.ndarray, b_formats: numpy.ndarray) \
+        -> numpy.ndarray:
+    """
+    Returns a matrix where the element at (i, j) equals ``a[i].merge(b[j]).rank``.
+    The configurations are represented as arrays of identifiers, masks, and formats, where the format is zero if
+    it is not specified. The merge products are not constructed; see :meth:`FilterConfiguration.merge`.
+    """
+    a_identifiers, a_masks, a_formats = a_identifiers[:, None], a_masks[:, None], a_formats[:, None]
+    mask = a_masks & b_masks & ~(a_identifiers ^ b_identifiers)
+    same_format = (a_formats == b_formats) & (a_formats != 0)
+    mask &= numpy.where(same_format, (1 << a_formats) - 1, 2 ** _AMBIVALENT_BIT_LENGTH - 1)
+    # Population count of 32-bit integers using the well-known SWAR algorithm.
+    mask = mask - ((mask >> 1) & 0x55555555)
+    mask = (mask & 0x33333333) + ((mask >> 2) & 0x33333333)
+    mask = (((mask + (mask >> 4)) & 0x0F0F0F0F) * 0x01010101 & 0xFFFFFFFF) >> 24
+    out: numpy.ndarray = (mask - numpy.where(same_format, 0, _AMBIVALENT_BIT_LENGTH)).astype(numpy.int8)
+    return out
+
 
-    assert all(map(lambda x: isinstance(x, FilterConfiguration), configurations))
-    return configurations
+_AMBIVALENT_BIT_LENGTH = int(max(FrameFormat))
+_NO_RANK = numpy.iinfo(numpy.int8).min
 
 
 def _unittest_can_media_filter_faults() -> None:
@@ -162,3 +250,50 @@ def _unittest_can_media_filter_merge() -> None:
 
     assert FilterConfiguration(0b111, 0b111, FrameFormat.EXTENDED).merge(
         FilterConfiguration(0b111, 0b111, FrameFormat.BASE)).rank == -29 + 3
+
+
+def _unittest_can_media_filter_optimization_benchmark() -> None:
+    import time
+    import random
+    import itertools
+
+    def reference(configurations: typing.Iterable[FilterConfiguration],
+                  target_number_of_configurations: int) -> typing.Sequence[FilterConfiguration]:
+        # The original O(K!) implementation of the algorithm where every pass evaluates all permutations.
+        configurations = list(configurations)
+        while len(configurations) > target_number_of_configurations:
+            options = itertools.starmap(lambda ia, ib: (ia[0], ib[0], ia[1].merge(ib[1])),
+                                        itertools.permutations(enumerate(configurations), 2))
+            index_replace, index_remove, merged = max(options, key=lambda x: x[2].rank)
+            configurations[index_replace] = merged
+            del configurations[index_remove]
+        return configurations
+
+    def make(count: int) -> typing.List[FilterConfiguration]:
+        out = []
+        for _ in range(count):
+            fmt = random.choice([FrameFormat.BASE, FrameFormat.EXTENDED, FrameFormat.EXTENDED, None])
+            max_value = 2 ** int(fmt or max(FrameFormat)) - 1
+            out.append(FilterConfiguration(random.randint(0, max_value), random.randint(0, max_value), fmt))
+        return out
+
+    # The new implementation shall produce exactly the same result as the original one.
+    for _ in range(30):
+        source = make(random.randint(1, 20))
+        target = random.randint(1, 10)
+        assert list(optimize_filter_configurations(source, target)) == list(reference(source, target))
+
+    source = make(40)
+    started_at = time.monotonic()
+    result = optimize_filter_configurations(source, 8)
+    elapsed = time.monotonic() - started_at
+    started_at = time.monotonic()
+    assert list(result) == list(reference(source, 8))
+    elapsed_reference = time.monotonic() - started_at
+    print(f'Filter optimization of {len(source)} configurations: '
+          f'{elapsed * 1e3:.1f} ms, reference: {elapsed_reference * 1e3:.1f} ms')
+
+    source = make(300)
+    started_at = time.monotonic()
+    optimize_filter_configurations(source, 8)
+    print(f'Filter optimization of {len(source)} configurations: {(time.monotonic() - started_at) * 1e3:.1f} ms')
@@ -19,7 +19,9 @@ class FrameFormat(enum.IntEnum):
 @dataclasses.dataclass(frozen=True)
 class DataFrame:
     identifier: int
-    data:       bytearray
+    data:       typing.Union[bytearray, memoryview]
+    """Received frames may refer to a shared receive buffer instead of owning a copy of their data."""
+
     format:     FrameFormat
     loopback:   bool
     """Loopback request for outgoing frames; loopback indicator for received frames."""
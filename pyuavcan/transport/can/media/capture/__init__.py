@@ -0,0 +1,22 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+"""
+Capture of the CAN traffic passing through any media implementation into a file, with low overhead.
+The capture can be replayed later using :class:`pyuavcan.transport.can.media.replay.ReplayMedia`
+or converted into the candump log format using :func:`convert_to_candump`.
+
+The media instance is wrapped before it is passed to the transport::
+
+    media = CaptureMedia(SocketCANMedia('vcan0', 64), CaptureWriter('capture.bin'))
+    transport = pyuavcan.transport.can.CANTransport(media, 42)
+"""
+
+from ._writer import CaptureWriter as CaptureWriter
+from ._writer import CaptureWriterStatistics as CaptureWriterStatistics
+
+from ._capture import CaptureMedia as CaptureMedia
+from ._capture import convert_to_candump as convert_to_candump
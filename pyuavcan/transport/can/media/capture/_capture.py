@@ -0,0 +1,120 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import mmap
+import typing
+import asyncio
+import pyuavcan.util
+import pyuavcan.transport
+import pyuavcan.transport.can.media as _media
+from .. import _capture_format
+from .._capture_format import Direction
+from ._writer import CaptureWriter
+
+
+class CaptureMedia(_media.Media):
+    """
+    Wraps another media instance and records every frame that passes through it using the supplied writer:
+    received frames, transmitted frames, and loopback frames. Everything else is delegated to the wrapped instance.
+
+    Received frames are recorded with their original timestamps; transmitted frames are timestamped when
+    the wrapped media accepts them for transmission. Only the frames that pass the acceptance filters are
+    received by the transport, so only those are recorded.
+
+    The writer is closed together with the media.
+    """
+
+    def __init__(self, inner: _media.Media, writer: CaptureWriter) -> None:
+        self._inner = inner
+        self._writer = writer
+        self._closed = False
+        super(CaptureMedia, self).__init__()
+
+    @property
+    def inner(self) -> _media.Media:
+        return self._inner
+
+    @property
+    def writer(self) -> CaptureWriter:
+        return self._writer
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._inner.loop
+
+    @property
+    def interface_name(self) -> str:
+        return self._inner.interface_name
+
+    @property
+    def mtu(self) -> int:
+        return self._inner.mtu
+
+    @property
+    def number_of_acceptance_filters(self) -> int:
+        return self._inner.number_of_acceptance_filters
+
+    def start(self, handler: _media.Media.ReceivedFramesHandler, no_automatic_retransmission: bool) -> None:
+        def capture_and_forward(frames: typing.Iterable[_media.TimestampedDataFrame]) -> None:
+            frames = list(frames)
+            if not self._closed:
+                write = self._writer.write
+                for f in frames:
+                    write(f.timestamp.system_ns, f, Direction.LOOPBACK if f.loopback else Direction.RECEIVED)
+            handler(frames)
+
+        self._inner.start(capture_and_forward, no_automatic_retransmission)
+
+    def configure_acceptance_filters(self, configuration: typing.Sequence[_media.FilterConfiguration]) -> None:
+        self._inner.configure_acceptance_filters(configuration)
+
+    async def send_until(self, frames: typing.Iterable[_media.DataFrame], monotonic_deadline: float) -> int:
+        frames = list(frames)
+        num_sent = await self._inner.send_until(frames, monotonic_deadline)
+        if not self._closed:
+            system_ns = pyuavcan.transport.Timestamp.now().system_ns
+            for f in frames[:num_sent]:
+                self._writer.write(system_ns, f, Direction.TRANSMITTED)
+        return num_sent
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            try:
+                self._inner.close()
+            finally:
+                self._writer.close()
+
+    @staticmethod
+    def list_available_interface_names() -> typing.Iterable[str]:
+        return []   # The interfaces are those of the wrapped media.
+
+    def __repr__(self) -> str:
+        return pyuavcan.util.repr_attributes(self, self._inner, self._writer)
+
+
+def convert_to_candump(source_path: str, destination: typing.TextIO, interface_name: str = 'can0') -> int:
+    """
+    Converts a capture from the compact binary format into the candump log format, one frame per line.
+    The loopback frames are omitted because they duplicate the transmitted ones, and the candump format
+    does not distinguish the direction of the frames.
+    Returns the number of frames written.
+    """
+    count = 0
+    with open(source_path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            raise ValueError(f'{source_path} is empty')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(_capture_format.BINARY_MAGIC)] != _capture_format.BINARY_MAGIC:
+                raise ValueError(f'{source_path} is not a binary CAN capture')
+            for system_ns, identifier, frame_format, data, direction in _capture_format.parse_binary(mm):
+                if direction == Direction.LOOPBACK:
+                    continue
+                frame = _media.DataFrame(identifier, data, frame_format, loopback=False)
+                destination.write(_capture_format.format_candump_line(system_ns, interface_name, frame) + '\n')
+                count += 1
+    return count
@@ -0,0 +1,251 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import typing
+import logging
+import threading
+import dataclasses
+import pyuavcan.util
+import pyuavcan.transport
+from .. import _capture_format
+from .._frame import DataFrame, FrameFormat
+from .._capture_format import Direction
+
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class CaptureWriterStatistics:
+    frames:        int = 0  #: Number of frames stored in the ring buffer.
+    drops:         int = 0  #: Number of frames lost because the ring buffer was full.
+    bytes_written: int = 0  #: Number of bytes written to the file, including the magic.
+    flushes:       int = 0  #: Number of block writes performed by the background thread.
+
+
+class CaptureWriter:
+    """
+    Writes captured CAN frames into a file in the compact binary capture format,
+    which can be replayed using :class:`pyuavcan.transport.can.media.replay.ReplayMedia`
+    or converted into the candump log format using :func:`convert_to_candump`.
+
+    The frames are appended to a preallocated ring buffer, which is cheap and never blocks;
+    a background thread flushes the buffer into the file in large blocks.
+    If the thread falls behind so that the buffer overflows, the new frames are dropped;
+    the number of dropped frames is reported via :meth:`sample_statistics` and logged.
+
+    The ring buffer has a single producer (the event loop) and a single consumer (the flushing thread).
+    Each side advances only its own position, and the positions are never wrapped (only the indexes
+    into the buffer are), so no lock is needed: a stale position may only make the other side underestimate
+    the amount of data or free space available.
+    """
+
+    def __init__(self,
+                 path:             str,
+                 buffer_capacity:  int = 4 * 1024 ** 2,
+                 flush_block_size: int = 256 * 1024,
+                 flush_interval:   float = 0.5) -> None:
+        """
+        :param path: The output file. It is overwritten if it exists.
+
+        :param buffer_capacity: The size of the ring buffer in bytes.
+            It should accommodate the traffic accumulated during the flush interval plus the worst-case
+            write latency of the storage.
+
+        :param flush_block_size: The background thread is woken up when this many bytes are accumulated.
+
+        :param flush_interval: The maximum time, in seconds, the captured frames can spend in the buffer
+            if the traffic is low.
+        """
+        self._capacity = int(buffer_capacity)
+        self._flush_block_size = int(flush_block_size)
+        if not (0 < self._flush_block_size <= self._capacity):
+            raise ValueError(f'Invalid buffer capacity {self._capacity} or flush block size {self._flush_block_size}')
+        self._flush_interval = float(flush_interval)
+        self._path = str(path)
+
+        self._buffer = bytearray(self._capacity)
+        self._head = 0      # Total number of bytes appended; only the producer updates it.
+        self._tail = 0      # Total number of bytes written to the file; only the consumer updates it.
+        self._stats = CaptureWriterStatistics()
+        self._wakeup = threading.Event()
+        self._closing = False
+        self._closed = False
+        self._failed = False
+
+        # Unbuffered, because the data is written in large blocks anyway.
+        self._file = open(self._path, 'wb', buffering=0)
+        self._write_fully(memoryview(_capture_format.BINARY_MAGIC))
+        self._stats.bytes_written += len(_capture_format.BINARY_MAGIC)
+
+        self._thread = threading.Thread(target=self._thread_function, name=str(self), daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def write(self, system_ns: int, frame: DataFrame, direction: Direction) -> None:
+        """
+        Appends the frame to the ring buffer. Never blocks. If there is not enough free space, the frame is dropped.
+        """
+        if self._closed:
+            raise pyuavcan.transport.ResourceClosedError(repr(self))
+        data = frame.data
+        size = _HEADER_SIZE + len(data)
+        if self._head - self._tail + size > self._capacity or self._failed:
+            self._stats.drops += 1
+            return
+
+        offset = self._head % self._capacity
+        if offset + size <= self._capacity:     # The common case: the record is serialized in place.
+            flags = (_capture_format.BINARY_FLAG_EXTENDED if frame.format == FrameFormat.EXTENDED else 0) | \
+                (direction << _capture_format.BINARY_DIRECTION_SHIFT)
+            _pack_header_into(self._buffer, offset, system_ns, frame.identifier, flags, len(data))
+            self._buffer[offset + _HEADER_SIZE:offset + size] = data
+        else:
+            record = _capture_format.serialize_binary(system_ns, frame, direction)
+            first = self._capacity - offset
+            self._buffer[offset:] = record[:first]
+            self._buffer[:size - first] = record[first:]
+        self._head += size      # Make the record visible to the consumer only when it is complete.
+        self._stats.frames += 1
+
+        if self._head - self._tail >= self._flush_block_size and not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def sample_statistics(self) -> CaptureWriterStatistics:
+        return dataclasses.replace(self._stats)
+
+    def close(self) -> None:
+        """
+        Writes the remaining buffered frames into the file and closes it. Blocks until that is done.
+        Does nothing if already closed.
+        """
+        if not self._closed:
+            self._closed = True
+            self._closing = True
+            self._wakeup.set()
+            self._thread.join()
+            self._file.close()
+
+    def _thread_function(self) -> None:
+        reported_drops = 0
+        view = memoryview(self._buffer)
+        try:
+            while True:
+                self._wakeup.wait(self._flush_interval)
+                self._wakeup.clear()
+                closing = self._closing             # Sampled before the head, so nothing is left behind.
+                head, tail = self._head, self._tail
+                if head > tail:
+                    start, end = tail % self._capacity, head % self._capacity
+                    if start < end:
+                        self._write_fully(view[start:end])
+                    else:
+                        self._write_fully(view[start:])
+                        self._write_fully(view[:end])
+                    self._tail = head               # Release the space to the producer
+                    self._stats.bytes_written += head - tail
+                    self._stats.flushes += 1
+
+                drops = self._stats.drops
+                if drops != reported_drops:
+                    _logger.warning('%s is falling behind: %d frames dropped (%d total)',
+                                    self, drops - reported_drops, drops)
+                    reported_drops = drops
+                if closing:
+                    break
+        except Exception as ex:
+            _logger.exception('%s: write failure, all further frames will be dropped: %s', self, ex)
+            self._failed = True
+        finally:
+            view.release()
+
+    def _write_fully(self, data: memoryview) -> None:
+        # An unbuffered file may write less than requested, so the remainder is written until nothing is left.
+        while len(data) > 0:
+            data = data[self._file.write(data):]
+
+    def __repr__(self) -> str:
+        return pyuavcan.util.repr_attributes(self, self._path, capacity=self._capacity)
+
+
+_HEADER_SIZE = _capture_format.BINARY_RECORD_HEADER.size
+_pack_header_into = _capture_format.BINARY_RECORD_HEADER.pack_into
+
+
+def _unittest_can_capture_writer() -> None:
+    import os
+    import random
+    import tempfile
+
+    frames = [
+        (index * 1000,
+         DataFrame(random.randint(0, 2 ** 29 - 1), bytearray(os.urandom(random.choice([0, 1, 8, 12, 64]))),
+                   FrameFormat.EXTENDED, loopback=False),
+         random.choice(list(Direction)))
+        for index in range(10_000)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'capture.bin')
+        # The capacity is not a multiple of the record size, so the records are split at the wrap-around point.
+        writer = CaptureWriter(path, buffer_capacity=10_007, flush_block_size=1000, flush_interval=0.01)
+        assert writer.path == path
+        for system_ns, frame, direction in frames:
+            writer.write(system_ns, frame, direction)
+            if random.random() < 0.01:
+                writer._thread.join(0.001)      # Let the writer catch up sometimes
+        writer.close()
+        writer.close()      # Idempotency
+
+        stats = writer.sample_statistics()
+        print('Capture writer statistics:', stats)
+        assert stats.frames + stats.drops == len(frames)
+        assert stats.frames > 0
+        assert stats.bytes_written == os.path.getsize(path)
+
+        with open(path, 'rb') as f:
+            blob = f.read()
+        assert blob.startswith(_capture_format.BINARY_MAGIC)
+        parsed = list(_capture_format.parse_binary(blob))
+        assert len(parsed) == stats.frames
+        # The frames that were not dropped are stored in the original order.
+        reference = {ts: (frame.identifier, frame.data, direction) for ts, frame, direction in frames}
+        assert sorted(x[0] for x in parsed) == [x[0] for x in parsed]
+        for system_ns, identifier, _fmt, data, direction in parsed:
+            assert reference[system_ns] == (identifier, data, direction)
+
+        # Short writes are continued until the whole block is written.
+        class ShortWriter:
+            def __init__(self, file: typing.Any) -> None:
+                self.file = file
+
+            def write(self, data: memoryview) -> int:
+                return typing.cast(int, self.file.write(data[:7]))
+
+            def close(self) -> None:
+                self.file.close()
+
+        writer = CaptureWriter(path, flush_interval=0.01)
+        writer._file = ShortWriter(writer._file)    # type: ignore
+        for system_ns, frame, direction in frames[:100]:
+            writer.write(system_ns, frame, direction)
+        writer.close()
+        stats = writer.sample_statistics()
+        assert stats.frames == 100 and stats.drops == 0
+        assert stats.bytes_written == os.path.getsize(path)
+        with open(path, 'rb') as f:
+            parsed = list(_capture_format.parse_binary(f.read()))
+        assert [(x[0], x[1], x[3]) for x in parsed] == [(ts, fr.identifier, fr.data) for ts, fr, _ in frames[:100]]
+
+        # If the buffer is too small, every frame is dropped.
+        writer = CaptureWriter(path, buffer_capacity=10, flush_block_size=10)
+        writer.write(0, frames[0][1], Direction.RECEIVED)
+        writer.close()
+        assert writer.sample_statistics().drops == 1
+        assert os.path.getsize(path) == len(_capture_format.BINARY_MAGIC)
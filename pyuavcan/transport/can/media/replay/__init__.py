@@ -0,0 +1,20 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+"""
+Replay of recorded CAN traffic without any hardware, for offline analysis, profiling, and regression testing.
+The recordings can be made with ``candump -l`` from can-utils or in the compact binary format;
+the format is detected automatically.
+
+The transport is constructed and the sessions are set up as usual; the replay is then started explicitly::
+
+    media = ReplayMedia('capture.log')
+    transport = pyuavcan.transport.can.CANTransport(media, None)
+    session = transport.get_input_session(...)
+    num_frames = await media.replay()
+"""
+
+from ._replay import ReplayMedia as ReplayMedia
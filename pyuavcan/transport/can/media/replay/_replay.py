@@ -0,0 +1,237 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import mmap
+import time
+import typing
+import asyncio
+import logging
+import pyuavcan.transport
+import pyuavcan.transport.can.media as _media
+from .. import _capture_format
+
+
+_logger = logging.getLogger(__name__)
+
+
+class ReplayMedia(_media.Media):
+    """
+    Feeds the CAN frames recorded in a file to the transport as if they were received from the bus.
+    The file is memory-mapped rather than loaded, so captures of any size can be replayed.
+    Acceptance filtering is emulated in software.
+
+    Outgoing frames are discarded as if they were transmitted successfully; those that request loopback
+    are looped back to the transport.
+    """
+
+    def __init__(self,
+                 path:      str,
+                 mtu:       int = max(_media.Media.VALID_MTU_SET),
+                 real_time: bool = False,
+                 loop:      typing.Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        :param path: The capture file in the candump log format or in the compact binary format.
+
+        :param mtu: The MTU reported to the transport. Does not affect the replayed frames.
+
+        :param real_time: If True, the frames are delivered at the same pace as they were recorded.
+            If False (default), they are delivered as fast as the transport can process them,
+            which is useful for throughput measurement.
+            Either way, the monotonic timestamps of the frames preserve the original intervals between them,
+            so the timing-dependent logic of the transport (such as the transfer-ID timeout) behaves
+            as it did during the recording. The system timestamps are those from the capture.
+
+        :param loop: The event loop to use. Defaults to :func:`asyncio.get_event_loop`.
+        """
+        self._mtu = int(mtu)
+        if self._mtu not in self.VALID_MTU_SET:
+            raise ValueError(f'Invalid MTU: {self._mtu} not in {self.VALID_MTU_SET}')
+        self._path = str(path)
+        self._real_time = bool(real_time)
+        self._loop = loop if loop is not None else asyncio.get_event_loop()
+
+        self._file = open(self._path, 'rb')
+        try:
+            # Empty files cannot be mapped.
+            self._mmap: typing.Optional[mmap.mmap] = \
+                mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._file.seek(0, 2) > 0 else None
+        except Exception:
+            self._file.close()
+            raise
+        self._is_binary = self._mmap is not None and \
+            self._mmap[:len(_capture_format.BINARY_MAGIC)] == _capture_format.BINARY_MAGIC
+
+        self._handler: typing.Optional[_media.Media.ReceivedFramesHandler] = None
+        self._acceptance_filters: typing.List[typing.Tuple[int, int, typing.Optional[_media.FrameFormat]]] = []
+        self._replaying = False
+        self._closed = False
+
+        super(ReplayMedia, self).__init__()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    @property
+    def interface_name(self) -> str:
+        return self._path
+
+    @property
+    def mtu(self) -> int:
+        return self._mtu
+
+    @property
+    def number_of_acceptance_filters(self) -> int:
+        return _NUMBER_OF_ACCEPTANCE_FILTERS
+
+    def start(self, handler: _media.Media.ReceivedFramesHandler, no_automatic_retransmission: bool) -> None:
+        """
+        Nothing is replayed until :meth:`replay` is invoked.
+        """
+        if self._closed:
+            raise pyuavcan.transport.ResourceClosedError(repr(self))
+        if self._handler is not None:
+            raise RuntimeError('The RX frame handler is already set up')
+        self._handler = handler
+        del no_automatic_retransmission     # Nothing to retransmit
+
+    def configure_acceptance_filters(self, configuration: typing.Sequence[_media.FilterConfiguration]) -> None:
+        if self._closed:
+            raise pyuavcan.transport.ResourceClosedError(repr(self))
+        self._acceptance_filters = [(x.identifier & x.mask, x.mask, x.format) for x in configuration]
+        _logger.debug('%s acceptance filters configured: %s', self, ', '.join(map(str, configuration)))
+
+    async def send_until(self, frames: typing.Iterable[_media.DataFrame], monotonic_deadline: float) -> int:
+        if self._closed:
+            raise pyuavcan.transport.ResourceClosedError(repr(self))
+        frames = list(frames)
+        timestamp = pyuavcan.transport.Timestamp.now()
+        loopback = [
+            _media.TimestampedDataFrame(identifier=f.identifier,
+                                        data=f.data,
+                                        format=f.format,
+                                        loopback=True,
+                                        timestamp=timestamp)
+            for f in frames if f.loopback
+        ]
+        if loopback and self._handler is not None:
+            self._handler(loopback)
+        return len(frames)
+
+    async def replay(self) -> int:
+        """
+        Delivers the recorded frames to the transport and returns when the end of the capture is reached.
+        Can be invoked again to replay the capture from the beginning.
+        The frames are delivered in batches; in the real-time mode, a batch never spans a pause between frames.
+
+        All frames that were on the bus are delivered as received, including those that were transmitted by the
+        capturing node; the loopback frames are not replayed because they duplicate the transmitted ones.
+        Frames that are not valid data frames or that do not fit into the media MTU are skipped.
+        The frames that are rejected by the acceptance filters are skipped as well,
+        but they are included in the returned number of frames read from the capture.
+        """
+        if self._closed:
+            raise pyuavcan.transport.ResourceClosedError(repr(self))
+        if self._handler is None:
+            raise RuntimeError('The media is not started')
+        if self._replaying:
+            raise RuntimeError('The replay is already in progress')
+        self._replaying = True
+        try:
+            return await self._replay(self._handler)
+        finally:
+            self._replaying = False
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            if self._mmap is not None:
+                self._mmap.close()
+            self._file.close()
+
+    @staticmethod
+    def list_available_interface_names() -> typing.Iterable[str]:
+        return []   # There are no interfaces to discover; the capture file is specified explicitly.
+
+    async def _replay(self, handler: _media.Media.ReceivedFramesHandler) -> int:
+        monotonic_offset_ns: typing.Optional[int] = None
+        num_frames = 0
+        batch: typing.List[_media.TimestampedDataFrame] = []
+
+        def flush() -> None:
+            nonlocal batch
+            if batch:
+                try:
+                    handler(batch)
+                except Exception as ex:
+                    _logger.exception('%s unhandled exception in the receive handler: %s; lost frames: %s',
+                                      self, ex, batch)
+                batch = []      # The handler may keep a reference to the old one.
+
+        for system_ns, identifier, frame_format, data, direction in self._read_records():
+            if direction == _capture_format.Direction.LOOPBACK:
+                continue    # A duplicate of the transmitted frame, which is replayed as received.
+            if monotonic_offset_ns is None:
+                monotonic_offset_ns = time.monotonic_ns() - system_ns
+            monotonic_ns = system_ns + monotonic_offset_ns
+            num_frames += 1
+            if not self._test_acceptance(identifier, frame_format) or len(data) > self._mtu:
+                continue
+            try:
+                frame = _media.TimestampedDataFrame(identifier=identifier,
+                                                    data=data,
+                                                    format=frame_format,
+                                                    loopback=False,
+                                                    timestamp=pyuavcan.transport.Timestamp(system_ns=system_ns,
+                                                                                           monotonic_ns=monotonic_ns))
+            except ValueError as ex:
+                _logger.debug('%s skipping an invalid frame: %s', self, ex)
+                continue
+
+            if self._real_time:
+                delay = monotonic_ns * 1e-9 - time.monotonic()
+                if delay > 0:
+                    flush()
+                    await asyncio.sleep(delay, loop=self._loop)
+            batch.append(frame)
+            if len(batch) >= _MAX_FRAMES_PER_BATCH:
+                flush()
+                await asyncio.sleep(0, loop=self._loop)     # Let other tasks consume the received transfers.
+            if self._closed:
+                break
+
+        flush()
+        _logger.info('%s replayed %d frames', self, num_frames)
+        return num_frames
+
+    def _read_records(self) -> typing.Iterator[_capture_format.CaptureRecord]:
+        mm = self._mmap
+        if mm is None:
+            return
+        if self._is_binary:
+            yield from _capture_format.parse_binary(mm)
+        else:
+            mm.seek(0)
+            parse = _capture_format.parse_candump_line
+            for line in iter(mm.readline, b''):
+                record = parse(line)
+                if record is not None:
+                    yield record
+
+    def _test_acceptance(self, identifier: int, frame_format: _media.FrameFormat) -> bool:
+        for reference, mask, fmt in self._acceptance_filters:
+            if identifier & mask == reference and (fmt is None or fmt == frame_format):
+                return True
+        return False
+
+
+_NUMBER_OF_ACCEPTANCE_FILTERS = 64
+"""
+The filters are emulated in software; a large number would slow down the replay.
+"""
+
+_MAX_FRAMES_PER_BATCH = 100
@@ -4,9 +4,13 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+from __future__ import annotations
+import os
 import enum
 import time
+import ctypes
 import errno
+import itertools
 import typing
 import socket
 import struct
@@ -33,7 +37,11 @@ class SocketCANMedia(_media.Media):
 
     SocketCAN documentation: https://www.kernel.org/doc/Documentation/networking/can.txt
     """
-    def __init__(self, iface_name: str, mtu: int, loop: typing.Optional[asyncio.AbstractEventLoop] = None) -> None:
+    def __init__(self,
+                 iface_name:            str,
+                 mtu:                   int,
+                 loop:                  typing.Optional[asyncio.AbstractEventLoop] = None,
+                 receive_in_event_loop: bool = False) -> None:
         """
         CAN Classic/FD is selected automatically based on the MTU. It is not possible to use CAN FD with MTU of 8 bytes.
 
@@ -43,6 +51,13 @@ class SocketCANMedia(_media.Media):
             This value must belong to Media.VALID_MTU_SET.
 
         :param loop: The event loop to use. Defaults to :func:`asyncio.get_event_loop`.
+
+        :param receive_in_event_loop: If True, the socket is registered with the event loop using
+            :meth:`asyncio.AbstractEventLoop.add_reader` and the received frames are processed directly in the loop,
+            which reduces the receive latency because there is no hand-off between threads.
+            If False (default), the frames are received by a dedicated background thread and then passed over to
+            the event loop; this mode may be preferable if the event loop is heavily loaded because the frames are
+            removed from the socket buffer regardless of the loop being busy.
         """
         self._mtu = int(mtu)
         if self._mtu not in self.VALID_MTU_SET:
@@ -61,9 +76,28 @@ class SocketCANMedia(_media.Media):
         self._sock = _make_socket(iface_name, can_fd=self._is_fd)
         self._closed = False
         self._maybe_thread: typing.Optional[threading.Thread] = None
+        self._receive_in_event_loop = bool(receive_in_event_loop)
+        self._reader_registered = False
         self._loopback_enabled = False
 
         self._ancillary_data_buffer_size = socket.CMSG_SPACE(_TIMEVAL_STRUCT.size)  # Used for recvmsg()
+        self._batch_receiver = _BatchReceiver.new(self._sock, self._native_frame_size, self._ancillary_data_buffer_size)
+        if self._batch_receiver is None:
+            _logger.info('%s recvmmsg() is not available, frames will be received one by one', self)
+
+        # The frames are compiled into a contiguous buffer that is allocated once and then transmitted in batches.
+        # The lock is needed because the buffer is shared between concurrent invocations of send_until().
+        self._batch_sender = _BatchSender.new(self._sock, self._native_frame_size)
+        if self._batch_sender is not None:
+            self._tx_buffer = self._batch_sender.buffer
+        else:
+            _logger.info('%s sendmmsg() is not available, frames will be sent one by one', self)
+            self._tx_buffer = bytearray(self._native_frame_size * _TX_BATCH_CAPACITY)
+        self._tx_lock = asyncio.Lock(loop=self._loop)
+
+        # Used for estimating the number of frames rejected by the kernel; see kernel_filtered_frame_count.
+        self._initial_interface_rx_frame_count = _read_interface_rx_frame_count(self._iface_name)
+        self._received_bus_frame_count = 0
 
         super(SocketCANMedia, self).__init__()
 
@@ -89,45 +123,96 @@ class SocketCANMedia(_media.Media):
         """
         return 512
 
+    @property
+    def kernel_filtered_frame_count(self) -> typing.Optional[int]:
+        """
+        An estimate of the number of frames received by the interface since this instance was created that were
+        rejected by the acceptance filters in the kernel, so they never reached the application.
+        The value is computed as the growth of the interface statistics counter ``rx_packets`` minus the number of
+        frames that were actually delivered to this instance from the bus.
+        On virtual interfaces such as ``vcan``, frames transmitted by the local host are included into the
+        statistics counter as well, so the estimate is an upper bound there.
+        None if the interface statistics are not available.
+        """
+        rx = _read_interface_rx_frame_count(self._iface_name)
+        if rx is None or self._initial_interface_rx_frame_count is None:
+            return None
+        return max(0, rx - self._initial_interface_rx_frame_count - self._received_bus_frame_count)
+
     def start(self, handler: _media.Media.ReceivedFramesHandler, no_automatic_retransmission: bool) -> None:
-        if self._maybe_thread is None:
+        if self._maybe_thread is not None or self._reader_registered:
+            raise RuntimeError('The RX frame handler is already set up')
+        if self._receive_in_event_loop:
+            self._loop.add_reader(self._sock.fileno(), self._on_socket_readable, handler)
+            self._reader_registered = True
+        else:
             self._maybe_thread = threading.Thread(target=self._thread_function,
                                                   name=str(self),
                                                   args=(handler,),
                                                   daemon=True)
             self._maybe_thread.start()
-            if no_automatic_retransmission:
-                _logger.info('%s non-automatic retransmission is not supported', self)
-        else:
-            raise RuntimeError('The RX frame handler is already set up')
+        if no_automatic_retransmission:
+            _logger.info('%s non-automatic retransmission is not supported', self)
 
     def configure_acceptance_filters(self, configuration: typing.Sequence[_media.FilterConfiguration]) -> None:
         if self._closed:
             raise pyuavcan.transport.ResourceClosedError(repr(self))
-        _logger.info('%s FIXME: acceptance filter configuration is not yet implemented; please submit patches! '
-                     'Requested configuration: %s',
-                     self, ', '.join(map(str, configuration)))
+        # An empty set of filters means that all frames are rejected, as required by the media interface contract.
+        native = b''.join(_CAN_FILTER_STRUCT.pack(*_make_native_filter(x)) for x in configuration)
+        self._sock.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_FILTER, native)
+        _logger.debug('%s acceptance filters configured: %s', self, ', '.join(map(str, configuration)))
 
     async def send_until(self, frames: typing.Iterable[_media.DataFrame], monotonic_deadline: float) -> int:
+        frames = list(frames)
         num_sent = 0
-        for f in frames:
-            if self._closed:
-                raise pyuavcan.transport.ResourceClosedError(repr(self))
-            self._set_loopback_enabled(f.loopback)
-            try:
-                await asyncio.wait_for(self._loop.sock_sendall(self._sock, self._compile_native_frame(f)),
-                                       timeout=monotonic_deadline - self._loop.time(),
-                                       loop=self._loop)
-            except asyncio.TimeoutError:
-                break
-            else:
-                num_sent += 1
+        async with self._tx_lock:
+            while num_sent < len(frames):
+                if self._closed:
+                    raise pyuavcan.transport.ResourceClosedError(repr(self))
+                # The deadline is checked once per batch rather than once per frame.
+                if self._loop.time() >= monotonic_deadline:
+                    break
+                # The loopback flag is a socket option, so a batch may only contain frames where it is the same.
+                loopback = frames[num_sent].loopback
+                batch_size = 0
+                for f in itertools.islice(frames, num_sent, num_sent + _TX_BATCH_CAPACITY):
+                    if f.loopback != loopback:
+                        break
+                    self._compile_native_frame_into(f, batch_size)
+                    batch_size += 1
+                self._set_loopback_enabled(loopback)
+                batch_sent = await self._send_batch(batch_size, monotonic_deadline)
+                num_sent += batch_sent
+                if batch_sent < batch_size:
+                    break
         return num_sent
 
     def close(self) -> None:
         self._closed = True
+        if self._reader_registered:
+            self._loop.remove_reader(self._sock.fileno())
+            self._reader_registered = False
         self._sock.close()
 
+    def _on_socket_readable(self, handler: _media.Media.ReceivedFramesHandler) -> None:
+        # The number of frames read per invocation is limited to avoid starving other tasks if the bus is flooded;
+        # the remaining frames will be read at the next iteration of the event loop.
+        try:
+            frames = self._read_available_frames(time.monotonic_ns(), _MAX_FRAMES_PER_EVENT_LOOP_ITERATION)
+        except OSError as ex:
+            _logger.exception('%s input/output error; stopping: %s', self, ex)
+            self.close()
+            return
+        except Exception as ex:
+            _logger.exception('%s read failure: %s', self, ex)
+            return
+        if len(frames) > 0:
+            try:
+                handler(frames)
+            except Exception as exc:
+                _logger.exception('%s unhandled exception in the receive handler: %s; lost frames: %s',
+                                  self, exc, frames)
+
     def _thread_function(self, handler: _media.Media.ReceivedFramesHandler) -> None:
         def handler_wrapper(frs: typing.Sequence[_media.TimestampedDataFrame]) -> None:
             try:
@@ -143,14 +228,7 @@ class SocketCANMedia(_media.Media):
                 # We don't check the return values because it is guaranteed by design that on a properly functioning
                 # bus we'll always be getting >=1 frame per second. If this expectation is violated, we'll simply
                 # abort the read on EAGAIN, no big deal.
-                ts_mono_ns = time.monotonic_ns()
-                frames: typing.List[_media.TimestampedDataFrame] = []
-                try:
-                    while True:
-                        frames.append(self._read_frame(ts_mono_ns))
-                except OSError as ex:
-                    if ex.errno != errno.EAGAIN:
-                        raise
+                frames = self._read_available_frames(time.monotonic_ns())
                 if len(frames) > 0:
                     self._loop.call_soon_threadsafe(handler_wrapper, frames)
             except OSError as ex:
@@ -165,6 +243,46 @@ class SocketCANMedia(_media.Media):
         self._closed = True
         _logger.info('%s thread is about to exit', self)
 
+    def _read_available_frames(self,
+                               ts_mono_ns: int,
+                               limit: typing.Optional[int] = None) -> typing.List[_media.TimestampedDataFrame]:
+        """
+        Reads the frames from the socket until it is empty or the limit (if any) is reached.
+        """
+        frames: typing.List[_media.TimestampedDataFrame] = []
+        try:
+            while limit is None or len(frames) < limit:
+                if self._batch_receiver is not None:
+                    frames += self._read_batch(self._batch_receiver, ts_mono_ns)
+                else:
+                    frames.append(self._read_frame(ts_mono_ns))
+        except OSError as ex:
+            if ex.errno != errno.EAGAIN:
+                raise
+        return frames
+
+    def _read_batch(self, receiver: _BatchReceiver, ts_mono_ns: int) -> typing.List[_media.TimestampedDataFrame]:
+        """
+        Reads all frames that are available in the socket (up to the batch size) using one system call.
+        The data of each frame is a memoryview slice of the buffer shared by the batch rather than a copy.
+        Raises EAGAIN if there are no frames to read.
+        """
+        buffer, metadata = receiver.receive()
+        out: typing.List[_media.TimestampedDataFrame] = []
+        for index, (msg_flags, ts_system_ns, length) in enumerate(metadata):
+            loopback = bool(msg_flags & socket.MSG_CONFIRM)
+            if not loopback:
+                self._received_bus_frame_count += 1
+            assert ts_system_ns > 0, 'Missing the timestamp; does the driver support timestamping?'
+            offset = index * self._native_frame_size
+            frame = SocketCANMedia._parse_native_frame(buffer[offset:offset + length],
+                                                       loopback=loopback,
+                                                       timestamp=pyuavcan.transport.Timestamp(system_ns=ts_system_ns,
+                                                                                              monotonic_ns=ts_mono_ns))
+            if frame is not None:
+                out.append(frame)
+        return out
+
     def _read_frame(self, ts_mono_ns: int) -> _media.TimestampedDataFrame:
         while True:
             data, ancdata, msg_flags, _addr = self._sock.recvmsg(self._native_frame_size,
@@ -173,6 +291,8 @@ class SocketCANMedia(_media.Media):
             assert msg_flags & socket.MSG_CTRUNC == 0, 'The ancillary data buffer is not large enough'
 
             loopback = bool(msg_flags & socket.MSG_CONFIRM)
+            if not loopback:
+                self._received_bus_frame_count += 1
             ts_system_ns = 0
             for cmsg_level, cmsg_type, cmsg_data in ancdata:
                 if cmsg_level == socket.SOL_SOCKET and cmsg_type == _SO_TIMESTAMP:
@@ -188,21 +308,84 @@ class SocketCANMedia(_media.Media):
             if out is not None:
                 return out
 
-    def _compile_native_frame(self, source: _media.DataFrame) -> bytes:
+    async def _send_batch(self, count: int, monotonic_deadline: float) -> int:
+        """
+        Transmits the first count native frames from the transmission buffer using as few system calls as possible.
+        The socket is awaited for writability only if its buffer is full.
+        Returns the number of frames that were sent before the deadline.
+        """
+        num_sent = 0
+        while num_sent < count:
+            try:
+                num_sent += self._transmit(num_sent, count - num_sent)
+            except BlockingIOError:
+                if not await self._wait_writable(monotonic_deadline):
+                    break
+        return num_sent
+
+    def _transmit(self, first: int, count: int) -> int:
+        """
+        Non-blocking. Returns the number of frames sent starting from the specified index in the transmission buffer.
+        Raises EAGAIN if none could be sent.
+        """
+        if self._batch_sender is not None:
+            return self._batch_sender.send(first, count)
+        size = self._native_frame_size
+        buffer = memoryview(self._tx_buffer)
+        for index in range(first, first + count):
+            try:
+                self._sock.send(buffer[index * size:(index + 1) * size])
+            except BlockingIOError:
+                if index == first:
+                    raise
+                return index - first
+        return count
+
+    async def _wait_writable(self, monotonic_deadline: float) -> bool:
+        """
+        Returns False if the socket did not become writable before the deadline.
+        """
+        fd = self._sock.fileno()
+        future = self._loop.create_future()
+
+        def on_writable() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        self._loop.add_writer(fd, on_writable)
+        try:
+            await asyncio.wait_for(future, timeout=monotonic_deadline - self._loop.time(), loop=self._loop)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._loop.remove_writer(fd)
+        return True
+
+    def _compile_native_frame_into(self, source: _media.DataFrame, index: int) -> None:
+        """
+        Writes the native representation of the frame into the transmission buffer at the specified frame index.
+        """
         flags = _CANFD_BRS if self._is_fd else 0
         ident = source.identifier | (_CAN_EFF_FLAG if source.format == _media.FrameFormat.EXTENDED else 0)
-        header = _FRAME_HEADER_STRUCT.pack(ident, len(source.data), flags)
-        out = header + source.data.ljust(self._native_frame_data_capacity, b'\x00')
-        assert len(out) == self._native_frame_size
-        return out
+        data_length = len(source.data)
+        assert data_length <= self._native_frame_data_capacity
+        offset = index * self._native_frame_size
+        _FRAME_HEADER_STRUCT.pack_into(self._tx_buffer, offset, ident, data_length, flags)
+        offset += _FRAME_HEADER_STRUCT.size
+        self._tx_buffer[offset:offset + data_length] = source.data
+        self._tx_buffer[offset + data_length:offset + self._native_frame_data_capacity] = \
+            _ZERO_PADDING[:self._native_frame_data_capacity - data_length]
 
     @staticmethod
-    def _parse_native_frame(source: bytes,
+    def _parse_native_frame(source: typing.Union[bytes, memoryview],
                             loopback: bool,
                             timestamp: pyuavcan.transport.Timestamp) \
             -> typing.Optional[_media.TimestampedDataFrame]:
+        """
+        If the source is a memoryview, the data of the output frame will be its slice; otherwise, a copy.
+        """
         header_size = _FRAME_HEADER_STRUCT.size
-        ident_raw, data_length, _flags = _FRAME_HEADER_STRUCT.unpack(source[:header_size])
+        ident_raw, data_length, _flags = _FRAME_HEADER_STRUCT.unpack_from(source)
         if (ident_raw & _CAN_RTR_FLAG) or (ident_raw & _CAN_ERR_FLAG):  # Unsupported format, ignore silently
             _logger.debug('Frame dropped: id_raw=%08x', ident_raw)
             return None
@@ -211,7 +394,7 @@ class SocketCANMedia(_media.Media):
         assert len(data) == data_length
         ident = ident_raw & _CAN_EFF_MASK
         return _media.TimestampedDataFrame(identifier=ident,
-                                           data=bytearray(data),
+                                           data=data if isinstance(data, memoryview) else bytearray(data),
                                            format=frame_format,
                                            loopback=loopback,
                                            timestamp=timestamp)
@@ -257,6 +440,14 @@ class _NativeFrameDataCapacity(enum.IntEnum):
 _FRAME_HEADER_STRUCT = struct.Struct('=IBB2x')  # Using standard size because the native definition relies on stdint.h
 _TIMEVAL_STRUCT = struct.Struct('@Ll')          # Using native size because the native definition uses plain integers
 
+# Used in the event loop mode; see SocketCANMedia.__init__().
+_MAX_FRAMES_PER_EVENT_LOOP_ITERATION = 1024
+
+# The maximum number of frames transmitted per system call.
+_TX_BATCH_CAPACITY = 64
+
+_ZERO_PADDING = bytes(_NativeFrameDataCapacity.CAN_FD)
+
 # From the Linux kernel; not exposed via the Python's socket module
 _SO_TIMESTAMP = 29
 
@@ -268,6 +459,211 @@ _CAN_ERR_FLAG = 0x20000000
 
 _CAN_EFF_MASK = 0x1FFFFFFF
 
+# struct can_filter {
+#     canid_t can_id;
+#     canid_t can_mask;
+# };
+_CAN_FILTER_STRUCT = struct.Struct('=II')
+
+
+def _make_native_filter(configuration: _media.FilterConfiguration) -> typing.Tuple[int, int]:
+    """
+    Returns the CAN ID and the mask for struct can_filter.
+    The format flag is matched only if the configuration specifies the frame format.
+    Remote transmission requests are always rejected because they are not used by UAVCAN.
+    """
+    can_id = configuration.identifier
+    can_mask = configuration.mask | _CAN_RTR_FLAG
+    if configuration.format is not None:
+        can_mask |= _CAN_EFF_FLAG
+        if configuration.format == _media.FrameFormat.EXTENDED:
+            can_id |= _CAN_EFF_FLAG
+    return can_id, can_mask
+
+
+def _read_interface_rx_frame_count(iface_name: str) -> typing.Optional[int]:
+    try:
+        with open(f'/sys/class/net/{iface_name}/statistics/rx_packets') as f:
+            return int(f.read())
+    except (OSError, ValueError) as ex:
+        _logger.debug('Could not read the statistics of the interface %r: %s', iface_name, ex)
+        return None
+
+
+class _BatchReceiver:
+    """
+    Receives multiple native frames per system call using ``recvmmsg()`` into buffers that are allocated once.
+    The received frames are then copied out of the reusable buffer using a single copy per batch,
+    so that the frames can refer to the data without the risk of it being overwritten by the next batch.
+    """
+
+    def __init__(self,
+                 recvmmsg:                  typing.Callable[..., int],
+                 sock:                      socket.SocketType,
+                 native_frame_size:         int,
+                 ancillary_data_buffer_size: int,
+                 batch_size:                int):
+        """
+        Do not call this directly. Use :meth:`new` to instantiate.
+        """
+        self._recvmmsg = recvmmsg
+        self._sock = sock
+        self._frame_size = int(native_frame_size)
+        self._control_size = int(ancillary_data_buffer_size)
+        self._batch_size = int(batch_size)
+
+        self._data = ctypes.create_string_buffer(self._frame_size * self._batch_size)
+        self._control = ctypes.create_string_buffer(self._control_size * self._batch_size)
+        self._iov = (pyuavcan.transport.commons.IOVec * self._batch_size)()
+        self._headers = (pyuavcan.transport.commons.MMsgHdr * self._batch_size)()
+        for i in range(self._batch_size):
+            self._iov[i].iov_base = ctypes.addressof(self._data) + i * self._frame_size
+            self._iov[i].iov_len = self._frame_size
+            hdr = self._headers[i].msg_hdr
+            hdr.msg_iov = ctypes.addressof(self._iov[i])
+            hdr.msg_iovlen = 1
+            hdr.msg_control = ctypes.addressof(self._control) + i * self._control_size
+            hdr.msg_controllen = self._control_size
+        # Raw access to the headers is much faster than accessing the fields of the ctypes structures one by one.
+        self._headers_raw = memoryview(self._headers).cast('B')
+        self._control_raw = memoryview(self._control).cast('B')
+        self._header_size = ctypes.sizeof(pyuavcan.transport.commons.MMsgHdr)
+        self._msg_flags_offset = pyuavcan.transport.commons.MsgHdr.msg_flags.offset
+        self._msg_controllen_offset = pyuavcan.transport.commons.MsgHdr.msg_controllen.offset
+        self._msg_len_offset = pyuavcan.transport.commons.MMsgHdr.msg_len.offset
+
+    @staticmethod
+    def new(sock: socket.SocketType,
+            native_frame_size: int,
+            ancillary_data_buffer_size: int,
+            batch_size: int = 64) -> typing.Optional[_BatchReceiver]:
+        """
+        Returns None if recvmmsg() is not available on this platform.
+        """
+        recvmmsg = pyuavcan.transport.commons.load_libc_function(
+            'recvmmsg',
+            [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+        )
+        if recvmmsg is None:
+            return None
+        return _BatchReceiver(recvmmsg, sock, native_frame_size, ancillary_data_buffer_size, batch_size)
+
+    def receive(self) -> typing.Tuple[memoryview, typing.List[typing.Tuple[int, int, int]]]:
+        """
+        Returns the received native frames in a new buffer, where the frame number N begins at the offset
+        N times the native frame size, and the list of (msg_flags, system timestamp in nanoseconds, length) per frame.
+        The length may be less than the native frame size: a CAN FD socket delivers Classic CAN frames as
+        ``struct can_frame``, which is shorter than ``struct canfd_frame``.
+        The timestamp is zero if it is not available. Raises EAGAIN if there are no frames to read.
+        """
+        count = self._recvmmsg(self._sock.fileno(), self._headers, self._batch_size, socket.MSG_DONTWAIT, None)
+        if count < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+        raw = self._headers_raw
+        metadata: typing.List[typing.Tuple[int, int, int]] = []
+        for i in range(count):
+            base = i * self._header_size
+            msg_flags, = _INT_STRUCT.unpack_from(raw, base + self._msg_flags_offset)
+            msg_len, = _UINT_STRUCT.unpack_from(raw, base + self._msg_len_offset)
+            assert msg_flags & socket.MSG_TRUNC == 0, 'The data buffer is not large enough'
+            assert msg_flags & socket.MSG_CTRUNC == 0, 'The ancillary data buffer is not large enough'
+            controllen, = _SIZE_STRUCT.unpack_from(raw, base + self._msg_controllen_offset)
+            ts_system_ns = 0
+            if controllen >= _CMSG_TIMESTAMP_STRUCT.size:
+                _len, level, kind, sec, usec = _CMSG_TIMESTAMP_STRUCT.unpack_from(self._control_raw,
+                                                                                  i * self._control_size)
+                if level == socket.SOL_SOCKET and kind == _SO_TIMESTAMP:
+                    ts_system_ns = (sec * 1_000_000 + usec) * 1000
+            # The kernel updates the length of the ancillary data, so it has to be restored for the next call.
+            _SIZE_STRUCT.pack_into(raw, base + self._msg_controllen_offset, self._control_size)
+            metadata.append((msg_flags, ts_system_ns, msg_len))
+
+        return memoryview(ctypes.string_at(self._data, count * self._frame_size)), metadata
+
+
+class _BatchSender:
+    """
+    Transmits multiple native frames per system call using ``sendmmsg()``.
+    The frames are to be compiled by the caller into :attr:`buffer`, which is allocated once and shared with
+    the kernel via ctypes; the frame number N begins at the offset N times the native frame size.
+    """
+
+    def __init__(self,
+                 sendmmsg:          typing.Callable[..., int],
+                 sock:              socket.SocketType,
+                 native_frame_size: int,
+                 batch_size:        int):
+        """
+        Do not call this directly. Use :meth:`new` to instantiate.
+        """
+        self._sendmmsg = sendmmsg
+        self._sock = sock
+        self._frame_size = int(native_frame_size)
+        self._batch_size = int(batch_size)
+
+        # The ctypes array shares the memory of the bytearray, which also prevents the latter from being resized.
+        self._buffer = bytearray(self._frame_size * self._batch_size)
+        self._data = (ctypes.c_char * len(self._buffer)).from_buffer(self._buffer)
+        self._iov = (pyuavcan.transport.commons.IOVec * self._batch_size)()
+        self._headers = (pyuavcan.transport.commons.MMsgHdr * self._batch_size)()
+        for i in range(self._batch_size):
+            self._iov[i].iov_base = ctypes.addressof(self._data) + i * self._frame_size
+            self._iov[i].iov_len = self._frame_size
+            hdr = self._headers[i].msg_hdr
+            hdr.msg_iov = ctypes.addressof(self._iov[i])
+            hdr.msg_iovlen = 1
+        self._headers_address = ctypes.addressof(self._headers)
+        self._header_size = ctypes.sizeof(pyuavcan.transport.commons.MMsgHdr)
+
+    @staticmethod
+    def new(sock: socket.SocketType,
+            native_frame_size: int,
+            batch_size: int = _TX_BATCH_CAPACITY) -> typing.Optional[_BatchSender]:
+        """
+        Returns None if sendmmsg() is not available on this platform.
+        """
+        sendmmsg = pyuavcan.transport.commons.load_libc_function(
+            'sendmmsg',
+            [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+        )
+        if sendmmsg is None:
+            return None
+        return _BatchSender(sendmmsg, sock, native_frame_size, batch_size)
+
+    @property
+    def buffer(self) -> bytearray:
+        """
+        The writable buffer where the frames to transmit are to be placed. Its size equals the native frame size
+        times the batch size.
+        """
+        return self._buffer
+
+    def send(self, first: int, count: int) -> int:
+        """
+        Transmits the specified number of frames from the buffer starting from the specified frame index.
+        Returns the number of frames that were sent, which may be less than requested if the socket buffer is full.
+        Raises EAGAIN if none could be sent.
+        """
+        if not (0 <= first and count > 0 and first + count <= self._batch_size):
+            raise ValueError(f'Invalid range of frames: [{first}, {first + count})')
+        count = self._sendmmsg(self._sock.fileno(),
+                               self._headers_address + first * self._header_size,
+                               count,
+                               socket.MSG_DONTWAIT)
+        if count < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        return count
+
+
+_INT_STRUCT = struct.Struct('@i')
+_UINT_STRUCT = struct.Struct('@I')
+_SIZE_STRUCT = struct.Struct('@N')
+# struct cmsghdr { size_t cmsg_len; int cmsg_level; int cmsg_type; } followed by struct timeval { long; long; }
+_CMSG_TIMESTAMP_STRUCT = struct.Struct('@Nii' + _TIMEVAL_STRUCT.format.lstrip('@'))
+
 
 def _make_socket(iface_name: str, can_fd: bool) -> socket.SocketType:
     s = socket.socket(socket.PF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
@@ -287,3 +683,129 @@ def _make_socket(iface_name: str, can_fd: bool) -> socket.SocketType:
         raise
 
     return s
+
+
+def _unittest_socketcan_native_filter() -> None:
+    from pyuavcan.transport.can.media import FrameFormat, FilterConfiguration
+    assert _make_native_filter(FilterConfiguration(0x123, 0x7FF, FrameFormat.BASE)) == \
+        (0x123, 0x7FF | _CAN_EFF_FLAG | _CAN_RTR_FLAG)
+    assert _make_native_filter(FilterConfiguration(0x1234567, 0x1FFFFF00, FrameFormat.EXTENDED)) == \
+        (0x1234567 | _CAN_EFF_FLAG, 0x1FFFFF00 | _CAN_EFF_FLAG | _CAN_RTR_FLAG)
+    assert _make_native_filter(FilterConfiguration.new_promiscuous()) == (0, _CAN_RTR_FLAG)
+    assert _CAN_FILTER_STRUCT.size == 8
+
+
+def _unittest_socketcan_batch_receiver() -> None:
+    # A datagram socket pair is used instead of a CAN socket because the latter may be unavailable in the environment.
+    frame_size = _FRAME_HEADER_STRUCT.size + _NativeFrameDataCapacity.CAN_FD
+    tx, rx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        rx.setsockopt(socket.SOL_SOCKET, _SO_TIMESTAMP, 1)
+        receiver = _BatchReceiver.new(rx, frame_size, socket.CMSG_SPACE(_TIMEVAL_STRUCT.size), batch_size=4)
+        assert receiver is not None
+        for i in range(6):
+            tx.send(_FRAME_HEADER_STRUCT.pack(0x100 + i, i, 0) + bytes([i] * 64))
+
+        ts = pyuavcan.transport.Timestamp.now()
+        frames: typing.List[_media.TimestampedDataFrame] = []
+        for expected_count in (4, 2):
+            buffer, metadata = receiver.receive()
+            assert len(metadata) == expected_count
+            assert len(buffer) == frame_size * expected_count
+            for index, (msg_flags, ts_system_ns, length) in enumerate(metadata):
+                assert msg_flags == 0
+                assert ts_system_ns > 0
+                assert length == frame_size
+                frame = SocketCANMedia._parse_native_frame(buffer[index * frame_size:index * frame_size + length],
+                                                           loopback=False,
+                                                           timestamp=ts)
+                assert frame is not None
+                assert isinstance(frame.data, memoryview)       # No copy
+                frames.append(frame)
+
+        assert [f.identifier for f in frames] == [0x100 + i for i in range(6)]
+        assert [bytes(f.data) for f in frames] == [bytes([i] * i) for i in range(6)]
+        assert all(f.format == _media.FrameFormat.BASE for f in frames)
+
+        try:
+            receiver.receive()
+        except OSError as ex:
+            assert ex.errno == errno.EAGAIN
+        else:  # pragma: no cover
+            assert False
+    finally:
+        tx.close()
+        rx.close()
+
+
+def _unittest_socketcan_batch_receiver_mixed_frame_sizes() -> None:
+    # A CAN FD socket delivers Classic CAN frames as struct can_frame (CAN_MTU), which is shorter than the buffer.
+    classic_frame_size = _FRAME_HEADER_STRUCT.size + _NativeFrameDataCapacity.CAN_CLASSIC
+    fd_frame_size = _FRAME_HEADER_STRUCT.size + _NativeFrameDataCapacity.CAN_FD
+    tx, rx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        rx.setsockopt(socket.SOL_SOCKET, _SO_TIMESTAMP, 1)
+        receiver = _BatchReceiver.new(rx, fd_frame_size, socket.CMSG_SPACE(_TIMEVAL_STRUCT.size), batch_size=4)
+        assert receiver is not None
+        tx.send(_FRAME_HEADER_STRUCT.pack(0x100, 3, 0) + bytes([1, 2, 3, 0, 0, 0, 0, 0]))
+        tx.send(_FRAME_HEADER_STRUCT.pack(0x101, 12, 0) + bytes(range(12)) + bytes(52))
+        tx.send(_FRAME_HEADER_STRUCT.pack(0x102 | _CAN_EFF_FLAG, 8, 0) + bytes(range(8)))
+
+        buffer, metadata = receiver.receive()
+        assert [length for _, _, length in metadata] == [classic_frame_size, fd_frame_size, classic_frame_size]
+        ts = pyuavcan.transport.Timestamp.now()
+        frames = []
+        for index, (_, _, length) in enumerate(metadata):
+            frame = SocketCANMedia._parse_native_frame(buffer[index * fd_frame_size:index * fd_frame_size + length],
+                                                       loopback=False,
+                                                       timestamp=ts)
+            assert frame is not None
+            frames.append(frame)
+
+        assert [f.identifier for f in frames] == [0x100, 0x101, 0x102]
+        assert [bytes(f.data) for f in frames] == [bytes([1, 2, 3]), bytes(range(12)), bytes(range(8))]
+        assert [f.format for f in frames] == [_media.FrameFormat.BASE, _media.FrameFormat.BASE,
+                                              _media.FrameFormat.EXTENDED]
+    finally:
+        tx.close()
+        rx.close()
+
+
+def _unittest_socketcan_batch_sender() -> None:
+    # A datagram socket pair is used instead of a CAN socket because the latter may be unavailable in the environment.
+    frame_size = _FRAME_HEADER_STRUCT.size + _NativeFrameDataCapacity.CAN_CLASSIC
+    tx, rx = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        tx.setblocking(False)
+        sender = _BatchSender.new(tx, frame_size, batch_size=8)
+        assert sender is not None
+        assert len(sender.buffer) == frame_size * 8
+        for i in range(8):
+            sender.buffer[i * frame_size:(i + 1) * frame_size] = _FRAME_HEADER_STRUCT.pack(0x100 + i, i, 0) + \
+                bytes([i] * 8)
+
+        assert sender.send(2, 5) == 5
+        for i in range(2, 7):
+            assert rx.recv(1024) == _FRAME_HEADER_STRUCT.pack(0x100 + i, i, 0) + bytes([i] * 8)
+
+        # Fill up the socket buffer; at some point the frames are sent partially and then not at all.
+        expected: typing.List[int] = []
+        while True:
+            try:
+                expected += range(sender.send(0, 8))
+            except OSError as ex:
+                assert ex.errno == errno.EAGAIN
+                break
+        assert len(expected) > 0
+        for index in expected:
+            assert rx.recv(1024) == _FRAME_HEADER_STRUCT.pack(0x100 + index, index, 0) + bytes([index] * 8)
+
+        try:
+            sender.send(7, 2)
+        except ValueError:
+            pass
+        else:  # pragma: no cover
+            assert False
+    finally:
+        tx.close()
+        rx.close()
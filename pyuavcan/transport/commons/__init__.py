@@ -17,3 +17,6 @@ from . import crc as crc
 from . import high_overhead_transport as high_overhead_transport
 
 from ._refragment import refragment as refragment
+
+from ._mmsg import IOVec as IOVec, MsgHdr as MsgHdr, MMsgHdr as MMsgHdr
+from ._mmsg import load_libc_function as load_libc_function
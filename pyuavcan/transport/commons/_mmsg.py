@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import typing
+import functools
+
+
+# struct iovec, struct msghdr, and struct mmsghdr from the Linux API; used with recvmmsg() and sendmmsg().
+class IOVec(ctypes.Structure):
+    _fields_ = [
+        ('iov_base', ctypes.c_void_p),
+        ('iov_len',  ctypes.c_size_t),
+    ]
+
+
+class MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name',       ctypes.c_void_p),
+        ('msg_namelen',    ctypes.c_uint32),
+        ('msg_iov',        ctypes.c_void_p),
+        ('msg_iovlen',     ctypes.c_size_t),
+        ('msg_control',    ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags',      ctypes.c_int),
+    ]
+
+
+class MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_hdr', MsgHdr),
+        ('msg_len', ctypes.c_uint),
+    ]
+
+
+def load_libc_function(name: str, argtypes: typing.List[typing.Any]) -> typing.Optional[typing.Callable[..., int]]:
+    """
+    Returns the specified function from the C standard library with errno capturing enabled
+    (see :func:`ctypes.get_errno`), assuming that it returns int.
+    Returns None if the function is not available on this platform.
+    """
+    libc = _load_libc()
+    if libc is None:
+        return None
+    try:
+        fun = getattr(libc, name)
+    except AttributeError:
+        return None
+    fun.restype = ctypes.c_int
+    fun.argtypes = argtypes
+    return typing.cast(typing.Callable[..., int], fun)
+
+
+@functools.lru_cache(None)
+def _load_libc() -> typing.Optional[ctypes.CDLL]:
+    # The library lookup may invoke external tools, so it is done only once.
+    libc_name = ctypes.util.find_library('c')
+    if libc_name is None:
+        return None
+    try:
+        return ctypes.CDLL(libc_name, use_errno=True)
+    except OSError:
+        return None
+
+
+def _unittest_mmsg() -> None:
+    import sys
+    assert MsgHdr.msg_flags.offset + ctypes.sizeof(ctypes.c_int) <= ctypes.sizeof(MsgHdr)
+    assert MMsgHdr.msg_len.offset == ctypes.sizeof(MsgHdr)
+    assert load_libc_function('there_is_no_such_function', []) is None
+    if sys.platform.startswith('linux'):
+        assert load_libc_function('recvmmsg', [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint,
+                                               ctypes.c_int, ctypes.c_void_p]) is not None
@@ -4,10 +4,17 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+import struct
 import typing
+import logging
+import warnings
+import numpy
 from ._base import CRCAlgorithm
 
 
+_logger = logging.getLogger(__name__)
+
+
 class CRC32C(CRCAlgorithm):
     """
     `32-Bit Cyclic Redundancy Codes for Internet Applications (Philip Koopman)
@@ -38,16 +45,25 @@ class CRC32C(CRCAlgorithm):
     True
     >>> CRC32C.new(b'123', b'', b'456789').value
     3808858755
+
+    The backend is selected automatically when the module is imported.
+    If the optional third-party package `crc32c <https://pypi.org/project/crc32c>`_ is installed,
+    it is used; otherwise, the value is computed in Python using slicing-by-8 for short inputs and
+    a NumPy-vectorized implementation for long inputs.
+    The name of the selected backend is available via :attr:`BACKEND`.
     """
+
+    BACKEND: str = ''
+    """
+    The name of the backend that is used to compute the CRC; one of: ``native``, ``python``.
+    """
+
     def __init__(self) -> None:
         assert len(self._TABLE) == 256
         self._value = 0xFFFFFFFF
 
     def add(self, data: typing.Union[bytes, bytearray, memoryview]) -> None:
-        val = self._value
-        for x in data:
-            val = (val >> 8) ^ self._TABLE[x ^ (val & 0xFF)]
-        self._value = val
+        self._value = _update(self._value, data)
 
     def check_residue(self) -> bool:
         return self._value == 0xB798B438    # Checked before the output XOR is applied.
@@ -95,3 +111,189 @@ class CRC32C(CRCAlgorithm):
         0xF36E6F75, 0x0105EC76, 0x12551F82, 0xE03E9C81, 0x34F4F86A, 0xC69F7B69, 0xD5CF889D, 0x27A40B9E,
         0x79B737BA, 0x8BDCB4B9, 0x988C474D, 0x6AE7C44E, 0xBE2DA0A5, 0x4C4623A6, 0x5F16D052, 0xAD7D5351,
     ]
+
+
+# Each of the functions below accepts the CRC register value before the output XOR and returns the updated one.
+_UpdateFunction = typing.Callable[[int, typing.Union[bytes, bytearray, memoryview]], int]
+
+
+def _update_bytewise(val: int, data: typing.Union[bytes, bytearray, memoryview]) -> int:
+    table = CRC32C._TABLE
+    for x in data:
+        val = (val >> 8) ^ table[x ^ (val & 0xFF)]
+    return val
+
+
+def _make_slicing_tables() -> typing.List[typing.List[int]]:
+    """
+    Table k maps a byte to the CRC of that byte followed by k zero bytes.
+    """
+    base = CRC32C._TABLE
+    out = [list(base)]
+    for _ in range(7):
+        prev = out[-1]
+        out.append([(x >> 8) ^ base[x & 0xFF] for x in prev])
+    return out
+
+
+_SLICING_TABLES = _make_slicing_tables()
+
+
+def _update_sliced(val: int, data: typing.Union[bytes, bytearray, memoryview]) -> int:
+    """
+    Slicing-by-8: processes eight bytes per iteration using eight lookup tables.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        data = memoryview(data).cast('B')
+    t0, t1, t2, t3, t4, t5, t6, t7 = _SLICING_TABLES
+    body = len(data) // 8 * 8
+    for lo, hi in struct.iter_unpack('<II', data[:body]):
+        lo ^= val
+        val = (t7[lo & 0xFF] ^ t6[(lo >> 8) & 0xFF] ^ t5[(lo >> 16) & 0xFF] ^ t4[lo >> 24]
+               ^ t3[hi & 0xFF] ^ t2[(hi >> 8) & 0xFF] ^ t1[(hi >> 16) & 0xFF] ^ t0[hi >> 24])
+    for x in data[body:]:
+        val = (val >> 8) ^ t0[x ^ (val & 0xFF)]
+    return val
+
+
+_VECTORIZED_LANE_LENGTH = 16
+_VECTORIZED_MIN_SIZE = 4096
+_VECTORIZED_TABLE = numpy.array(CRC32C._TABLE, dtype=numpy.uint32)
+_BYTE_BITS = ((numpy.arange(256)[:, None] >> numpy.arange(8)) & 1).astype(bool)
+
+_shift_matrices: typing.List[typing.List[int]] = []
+_shift_tables: typing.List[typing.List[numpy.ndarray]] = []
+
+
+def _get_shift_tables(level: int) -> typing.List[numpy.ndarray]:
+    """
+    Feeding zero bytes into the CRC register is a linear map over GF(2). The four tables for the given level
+    apply the map that feeds ``_VECTORIZED_LANE_LENGTH * 2**level`` zero bytes, one register byte per table.
+    They are built on first use and kept for the lifetime of the process.
+    """
+    while len(_shift_tables) <= level:
+        if not _shift_matrices:
+            # Column k is the image of the register value with only bit k set.
+            matrix = [_update_bytewise(1 << k, bytes(_VECTORIZED_LANE_LENGTH)) for k in range(32)]
+        else:
+            prev = _shift_matrices[-1]
+            matrix = [_apply_shift_matrix(prev, c) for c in prev]   # Doubles the number of zero bytes.
+        columns = numpy.array(matrix, dtype=numpy.uint32).reshape(4, 8)
+        tables = [numpy.bitwise_xor.reduce(numpy.where(_BYTE_BITS, c, numpy.uint32(0)), axis=1).astype(numpy.uint32)
+                  for c in columns]
+        _shift_matrices.append(matrix)
+        _shift_tables.append(tables)
+    return _shift_tables[level]
+
+
+def _apply_shift_matrix(matrix: typing.List[int], val: int) -> int:
+    out = 0
+    for column in matrix:
+        if val & 1:
+            out ^= column
+        val >>= 1
+    return out
+
+
+def _update_vectorized(val: int, data: typing.Union[bytes, bytearray, memoryview]) -> int:
+    """
+    The input is split into a power-of-two number of equal lanes whose CRC registers are updated in parallel,
+    the first lane starting from the current value and the others from zero. The register update is linear,
+    so the lanes are then merged pairwise: the left register is shifted over the length of the right lane
+    (as if that many zero bytes were fed into it) and XORed with the right register.
+    The remainder that does not fill a whole number of lanes is processed by :func:`_update_sliced`.
+    """
+    if len(data) < _VECTORIZED_MIN_SIZE:
+        return _update_sliced(val, data)
+    num_lanes = 1
+    while num_lanes * 2 * _VECTORIZED_LANE_LENGTH <= len(data):
+        num_lanes *= 2
+    body = num_lanes * _VECTORIZED_LANE_LENGTH
+    lanes = numpy.frombuffer(data, dtype=numpy.uint8, count=body).reshape(num_lanes, _VECTORIZED_LANE_LENGTH)
+
+    regs = numpy.zeros(num_lanes, dtype=numpy.uint32)
+    regs[0] = val
+    for j in range(_VECTORIZED_LANE_LENGTH):
+        regs = (regs >> 8) ^ _VECTORIZED_TABLE[(lanes[:, j] ^ regs) & 0xFF]
+
+    level = 0
+    while len(regs) > 1:
+        t0, t1, t2, t3 = _get_shift_tables(level)
+        left, right = regs[0::2], regs[1::2]
+        regs = t0[left & 0xFF] ^ t1[(left >> 8) & 0xFF] ^ t2[(left >> 16) & 0xFF] ^ t3[left >> 24] ^ right
+        level += 1
+
+    return _update_sliced(int(regs[0]), memoryview(data)[body:])
+
+
+def _load_native() -> typing.Optional[_UpdateFunction]:
+    try:
+        with warnings.catch_warnings():
+            # The library warns if it falls back to its own software implementation, which is still much faster.
+            warnings.simplefilter('ignore')
+            import crc32c  # type: ignore
+        compute = crc32c.crc32c
+    except (ImportError, AttributeError):
+        return None
+
+    def update(val: int, data: typing.Union[bytes, bytearray, memoryview]) -> int:
+        # The library accepts and returns the value with the output XOR applied.
+        return int(compute(data, val ^ 0xFFFFFFFF)) ^ 0xFFFFFFFF
+
+    return update
+
+
+def _select_backend() -> typing.Tuple[str, _UpdateFunction]:
+    native = _load_native()
+    if native is not None and native(0xFFFFFFFF, b'123456789') ^ 0xFFFFFFFF == 0xE3069283:
+        return 'native', native
+    return 'python', _update_vectorized
+
+
+CRC32C.BACKEND, _update = _select_backend()
+_logger.debug('CRC32C backend: %s', CRC32C.BACKEND)
+
+
+def _unittest_crc32c_backends() -> None:
+    import os
+    import random
+
+    backends: typing.Dict[str, _UpdateFunction] = {
+        'sliced': _update_sliced,
+        'vectorized': _update_vectorized,
+    }
+    native = _load_native()
+    if native is not None:
+        backends['native'] = native
+
+    for size in (0, 1, 7, 8, 9, 63, 1000, _VECTORIZED_MIN_SIZE - 1, _VECTORIZED_MIN_SIZE, 12345, 100_000):
+        data = os.urandom(size)
+        split = random.randint(0, size)
+        reference = _update_bytewise(0xFFFFFFFF, data)
+        for name, fun in backends.items():
+            assert fun(fun(0xFFFFFFFF, data[:split]), memoryview(data)[split:]) == reference, (name, size)
+        assert CRC32C.new(data[:split], bytearray(data[split:])).value == reference ^ 0xFFFFFFFF
+
+
+def _unittest_slow_crc32c_benchmark() -> None:
+    import os
+    import time
+
+    backends: typing.Dict[str, _UpdateFunction] = {
+        'bytewise': _update_bytewise,
+        'sliced': _update_sliced,
+        'vectorized': _update_vectorized,
+    }
+    native = _load_native()
+    if native is not None:
+        backends['native'] = native
+
+    for size in (64, 1024, 65536, 1024 ** 2):
+        data = os.urandom(size)
+        for name, fun in backends.items():
+            iterations = max(1, 2 ** 20 // size)
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                fun(0xFFFFFFFF, data)
+            elapsed = time.perf_counter() - started_at
+            print(f'CRC32C {name:>10} {size:>8} bytes: {iterations * size / elapsed * 1e-6:8.1f} MB/s')
@@ -100,11 +100,12 @@ class LoopbackTransport(pyuavcan.transport.Transport):
             if specifier.remote_node_id not in {self.local_node_id, None}:
                 return True  # Drop the transfer.
 
+            # The payload is copied because the output session shall not retain references to the caller's memory.
             tr_from = pyuavcan.transport.TransferFrom(
                 timestamp=tr.timestamp,
                 priority=tr.priority,
                 transfer_id=tr.transfer_id % self.protocol_parameters.transfer_id_modulo,
-                fragmented_payload=tr.fragmented_payload,
+                fragmented_payload=[memoryview(bytearray(x)) for x in tr.fragmented_payload],
                 source_node_id=self.local_node_id,
             )
 
@@ -0,0 +1,217 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import os
+import sys
+import ctypes
+import socket
+import struct
+import typing
+import logging
+import pyuavcan
+
+
+_logger = logging.getLogger(__name__)
+
+
+class BatchReceiver:
+    """
+    Receives multiple datagrams per system call using ``recvmmsg()`` into buffers that are allocated once,
+    along with their kernel receive timestamps (``SO_TIMESTAMPNS``). GNU/Linux only.
+
+    Each received datagram is copied out of the reusable buffer into a new buffer of the exact size,
+    because the rest of the stack is zero-copy and may keep references to the data indefinitely.
+    The buffers are not bound to a particular socket, so one instance can be shared by any number
+    of sockets served by the same thread, which keeps the memory footprint independent of the number of sockets.
+    """
+
+    def __init__(self, recvmmsg: typing.Callable[..., int], mtu: int, batch_size: int):
+        """
+        Do not call this directly. Use :meth:`new` to instantiate.
+        """
+        self._recvmmsg = recvmmsg
+        self._mtu = int(mtu)
+        self._batch_size = int(batch_size)
+        self._control_size = socket.CMSG_SPACE(_TIMESPEC_STRUCT.size)
+
+        self._data = ctypes.create_string_buffer(self._mtu * self._batch_size)
+        self._names = ctypes.create_string_buffer(_SOCKADDR_SIZE * self._batch_size)
+        self._control = ctypes.create_string_buffer(self._control_size * self._batch_size)
+        self._iov = (pyuavcan.transport.commons.IOVec * self._batch_size)()
+        self._headers = (pyuavcan.transport.commons.MMsgHdr * self._batch_size)()
+        for i in range(self._batch_size):
+            self._iov[i].iov_base = ctypes.addressof(self._data) + i * self._mtu
+            self._iov[i].iov_len = self._mtu
+            hdr = self._headers[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self._names) + i * _SOCKADDR_SIZE
+            hdr.msg_namelen = _SOCKADDR_SIZE
+            hdr.msg_iov = ctypes.addressof(self._iov[i])
+            hdr.msg_iovlen = 1
+            hdr.msg_control = ctypes.addressof(self._control) + i * self._control_size
+            hdr.msg_controllen = self._control_size
+        # Raw access to the headers is much faster than accessing the fields of the ctypes structures one by one.
+        self._headers_raw = memoryview(self._headers).cast('B')
+        self._names_raw = memoryview(self._names).cast('B')
+        self._control_raw = memoryview(self._control).cast('B')
+        self._header_size = ctypes.sizeof(pyuavcan.transport.commons.MMsgHdr)
+        self._data_address = ctypes.addressof(self._data)
+        self._msg_namelen_offset = pyuavcan.transport.commons.MsgHdr.msg_namelen.offset
+        self._msg_flags_offset = pyuavcan.transport.commons.MsgHdr.msg_flags.offset
+        self._msg_controllen_offset = pyuavcan.transport.commons.MsgHdr.msg_controllen.offset
+        self._msg_len_offset = pyuavcan.transport.commons.MMsgHdr.msg_len.offset
+
+    @staticmethod
+    def new(mtu: int, batch_size: int = 64) -> typing.Optional[BatchReceiver]:
+        """
+        :param mtu: The size of the buffer for one datagram. Longer datagrams are truncated.
+        :param batch_size: The maximum number of datagrams received per system call.
+        :return: None if the platform does not support batch reception.
+        """
+        if not sys.platform.startswith('linux'):
+            return None
+        recvmmsg = pyuavcan.transport.commons.load_libc_function(
+            'recvmmsg',
+            [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+        )
+        if recvmmsg is None:  # pragma: no cover
+            return None
+        return BatchReceiver(recvmmsg, mtu, batch_size)
+
+    @staticmethod
+    def configure_socket(sock: socket.socket) -> bool:
+        """
+        Enables the kernel receive timestamping on the socket.
+        Only IPv4 sockets are supported; for other sockets, this method does nothing and returns False,
+        in which case the socket shall be read without the batch receiver.
+        """
+        if sock.family != socket.AF_INET:
+            return False
+        sock.setsockopt(socket.SOL_SOCKET, _SO_TIMESTAMPNS, 1)
+        return True
+
+    @property
+    def mtu(self) -> int:
+        return self._mtu
+
+    def receive(self, sock: socket.socket) -> typing.List[typing.Tuple[bytes, int, pyuavcan.transport.Timestamp]]:
+        """
+        Reads the datagrams that are available in the socket (up to the batch size) without blocking.
+        Returns a list of (data, source IP address as an integer, timestamp) per datagram.
+        The system timestamp is provided by the kernel; the monotonic timestamp is derived from it.
+        Raises EAGAIN if there are no datagrams to read.
+        The socket shall be configured using :meth:`configure_socket` beforehand.
+        """
+        count = self._recvmmsg(sock.fileno(), self._headers, self._batch_size, socket.MSG_DONTWAIT, None)
+        if count < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+        # The monotonic clock is sampled once per batch; the monotonic timestamp of each datagram is then
+        # adjusted by the time that has passed since its reception according to the system clock.
+        now = pyuavcan.transport.Timestamp.now()
+        raw = self._headers_raw
+        names = self._names_raw
+        out: typing.List[typing.Tuple[bytes, int, pyuavcan.transport.Timestamp]] = []
+        for i in range(count):
+            base = i * self._header_size
+            msg_flags, = _INT_STRUCT.unpack_from(raw, base + self._msg_flags_offset)
+            msg_len, = _UINT_STRUCT.unpack_from(raw, base + self._msg_len_offset)
+            if msg_flags & socket.MSG_TRUNC:  # pragma: no cover
+                _logger.warning('%r: A datagram was longer than %d bytes and therefore it has been truncated. '
+                                'Enlarge the read buffer to squelch this warning.', self, self._mtu)
+            data = ctypes.string_at(self._data_address + i * self._mtu, msg_len)
+
+            source_ip, = _SOCKADDR_IN_ADDRESS_STRUCT.unpack_from(names,
+                                                                 i * _SOCKADDR_SIZE + _SOCKADDR_IN_ADDRESS_OFFSET)
+
+            ts = now
+            controllen, = _SIZE_STRUCT.unpack_from(raw, base + self._msg_controllen_offset)
+            if controllen >= _CMSG_TIMESTAMP_STRUCT.size:
+                _len, level, kind, sec, nsec = _CMSG_TIMESTAMP_STRUCT.unpack_from(self._control_raw,
+                                                                                  i * self._control_size)
+                if level == socket.SOL_SOCKET and kind == _SO_TIMESTAMPNS:
+                    system_ns = sec * 1_000_000_000 + nsec
+                    ts = pyuavcan.transport.Timestamp(system_ns=system_ns,
+                                                      monotonic_ns=now.monotonic_ns - max(0, now.system_ns - system_ns))
+
+            # The kernel updates the lengths of the address and the ancillary data, so they have to be restored.
+            _SIZE_STRUCT.pack_into(raw, base + self._msg_controllen_offset, self._control_size)
+            _UINT32_STRUCT.pack_into(raw, base + self._msg_namelen_offset, _SOCKADDR_SIZE)
+            out.append((data, source_ip, ts))
+
+        return out
+
+    def __repr__(self) -> str:
+        return pyuavcan.util.repr_attributes(self, mtu=self._mtu, batch_size=self._batch_size)
+
+
+# From the Linux kernel; not exposed via the Python's socket module
+_SO_TIMESTAMPNS = 35
+
+_INT_STRUCT = struct.Struct('@i')
+_UINT_STRUCT = struct.Struct('@I')
+_UINT32_STRUCT = struct.Struct('=I')
+_SIZE_STRUCT = struct.Struct('@N')
+_TIMESPEC_STRUCT = struct.Struct('@ll')
+# struct cmsghdr { size_t cmsg_len; int cmsg_level; int cmsg_type; } followed by struct timespec { long; long; }
+_CMSG_TIMESTAMP_STRUCT = struct.Struct('@Nii' + _TIMESPEC_STRUCT.format.lstrip('@'))
+# struct sockaddr_in { sa_family_t sin_family; in_port_t sin_port; struct in_addr sin_addr; ... }
+_SOCKADDR_IN_ADDRESS_OFFSET = 4
+_SOCKADDR_IN_ADDRESS_STRUCT = struct.Struct('!I')
+_SOCKADDR_SIZE = 16
+
+
+def _unittest_batch_receiver() -> None:
+    from pytest import raises
+
+    if not sys.platform.startswith('linux'):  # pragma: no cover
+        assert BatchReceiver.new(1000) is None
+        return
+
+    receiver = BatchReceiver.new(100, batch_size=4)
+    assert receiver is not None
+    assert receiver.mtu == 100
+
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    tx_a = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    tx_b = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        rx.bind(('127.100.0.100', 0))
+        assert BatchReceiver.configure_socket(rx)
+        tx_a.bind(('127.100.0.1', 0))
+        tx_b.bind(('127.100.0.2', 0))
+
+        with raises(BlockingIOError):
+            receiver.receive(rx)
+
+        ts = pyuavcan.transport.Timestamp.now()
+        for i in range(6):
+            (tx_a if i % 2 == 0 else tx_b).sendto(bytes([i] * i * 10), rx.getsockname())
+        tx_a.sendto(bytes(150), rx.getsockname())
+
+        out = receiver.receive(rx)
+        assert [(data, ip) for data, ip, _ in out] == [
+            (bytes([i] * i * 10), 0x7F64_0001 if i % 2 == 0 else 0x7F64_0002) for i in range(4)
+        ]
+        out += receiver.receive(rx)
+        assert len(out) == 7
+        assert [data for data, _, _ in out[4:]] == [bytes([4] * 40), bytes([5] * 50), bytes(100)]  # Truncated
+        now = pyuavcan.transport.Timestamp.now()
+        for _, _, t in out:
+            assert ts.system_ns <= t.system_ns <= now.system_ns
+            assert ts.monotonic_ns <= t.monotonic_ns <= now.monotonic_ns
+        assert out[0][2].system_ns <= out[-1][2].system_ns
+
+        with raises(BlockingIOError):
+            receiver.receive(rx)
+    finally:
+        rx.close()
+        tx_a.close()
+        tx_b.close()
+
+    with socket.socket(socket.AF_INET6, socket.SOCK_DGRAM) as sock_v6:
+        assert not BatchReceiver.configure_socket(sock_v6)
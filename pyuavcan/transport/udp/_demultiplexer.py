@@ -6,6 +6,7 @@
 
 from __future__ import annotations
 import time
+import errno
 import typing
 import asyncio
 import logging
@@ -14,10 +15,13 @@ import dataclasses
 import socket
 import pyuavcan
 from ._frame import UDPFrame
+from ._batch_receiver import BatchReceiver
 
 
 _READ_TIMEOUT = 1.0
 
+_MAX_DATAGRAMS_PER_EVENT_LOOP_ITERATION = 1024
+
 _logger = logging.getLogger(__name__)
 
 
@@ -64,21 +68,26 @@ class UDPDemultiplexer:
     def __init__(self,
                  sock:           socket.socket,
                  udp_mtu:        int,
-                 node_id_mapper: typing.Callable[[str], typing.Optional[int]],
+                 node_id_mapper: typing.Callable[[int], typing.Optional[int]],
                  local_node_id:  typing.Optional[int],
                  statistics:     UDPDemultiplexerStatistics,
-                 loop:           asyncio.AbstractEventLoop):
+                 loop:           asyncio.AbstractEventLoop,
+                 batch_receiver: typing.Optional[BatchReceiver] = None):
         """
         :param sock: The instance takes ownership of the socket; it will be closed when the instance is closed.
         :param udp_mtu: The size of the socket read buffer. Make it large. If not sure, make it larger.
-        :param node_id_mapper: A mapping: ``(ip_address) -> Optional[node_id]``.
+        :param node_id_mapper: A mapping: ``(ip_address) -> Optional[node_id]``, where the IP address is
+            represented as an integer (see :meth:`NetworkMap.map_raw_ip_address_to_node_id`).
         :param local_node_id: The node-ID of the local node or None. Needed to discard own-generated broadcast traffic.
         :param statistics: A reference to the external statistics object that will be updated by the instance.
         :param loop: The event loop. You know the drill.
+        :param batch_receiver: If provided, the datagrams are received in batches with kernel timestamps
+            (see :class:`BatchReceiver`); otherwise, they are received one by one and timestamped in user space.
+            The instance can be shared with other demultiplexers that use the same event loop.
+            It is not used if the event loop does not support :meth:`asyncio.AbstractEventLoop.add_reader`
+            or if the socket is not supported by the batch receiver (e.g., an IPv6 socket).
         """
         self._sock = sock
-        self._sock.settimeout(_READ_TIMEOUT)
-
         self._udp_mtu = int(udp_mtu)
         self._node_id_mapper = node_id_mapper
         self._local_node_id = local_node_id
@@ -91,12 +100,29 @@ class UDPDemultiplexer:
         assert isinstance(self._loop, asyncio.AbstractEventLoop)
 
         self._closed = False
+        self._reading = True    # Reset when the instance is closed or when the socket is found to be unusable.
         self._listeners: typing.Dict[typing.Optional[int], UDPDemultiplexer.Listener] = {}
 
-        self._thread = threading.Thread(target=self._thread_entry_point,
-                                        name='demultiplexer_socket_reader',
-                                        daemon=True)
-        self._thread.start()
+        # The socket is polled by the event loop together with all other sockets, so that the number of threads
+        # does not grow with the number of subscriptions and the datagrams are processed without a hand-off
+        # between threads. Some event loops do not support this (e.g., the proactor loop on Windows);
+        # with those, we fall back to a dedicated reader thread.
+        self._fileno = self._sock.fileno()
+        self._maybe_thread: typing.Optional[threading.Thread] = None
+        self._batch_receiver = batch_receiver
+        if self._batch_receiver is not None and not self._batch_receiver.configure_socket(self._sock):
+            _logger.debug('%r: The batch receiver does not support this socket, reading datagrams one by one', self)
+            self._batch_receiver = None
+        try:
+            self._sock.setblocking(False)
+            self._loop.add_reader(self._fileno, self._on_socket_readable)
+        except NotImplementedError:
+            _logger.debug('%r: The event loop does not support add_reader(), using the reader thread', self)
+            self._sock.settimeout(_READ_TIMEOUT)
+            self._maybe_thread = threading.Thread(target=self._thread_entry_point,
+                                                  name='demultiplexer_socket_reader',
+                                                  daemon=True)
+            self._maybe_thread.start()
 
     def add_listener(self, source_node_id: typing.Optional[int], handler: Listener) -> None:
         """
@@ -141,11 +167,19 @@ class UDPDemultiplexer:
         """
         if self.has_listeners:
             raise RuntimeError('Do not close the demultiplexer with active listeners, suka!')
-        self._closed = True
-        self._sock.close()
-        # We don't wait for the thread to join because who cares?
-
-    def _dispatch_frame(self, source_ip: str, frame: typing.Optional[UDPFrame]) -> None:
+        if not self._closed:
+            self._closed = True
+            self._stop_reading()
+            self._sock.close()
+            # We don't wait for the reader thread to join (if there is one) because who cares?
+
+    def _stop_reading(self) -> None:
+        if self._reading:
+            self._reading = False
+            if self._maybe_thread is None:
+                self._loop.remove_reader(self._fileno)
+
+    def _dispatch_frame(self, source_ip: int, frame: typing.Optional[UDPFrame]) -> None:
         if self._closed:
             # A check for closure is mandatory here because there is a period of uncertainty between the point
             # when this method is invoked from the reader thread and the point where the event loop gets around
@@ -174,7 +208,8 @@ class UDPDemultiplexer:
 
         # Update the statistics.
         if not handled:
-            ip_nid: typing.Union[str, int] = source_node_id if source_node_id is not None else source_ip
+            ip_nid: typing.Union[str, int] = \
+                source_node_id if source_node_id is not None else self._format_address(source_ip)
             try:
                 self._statistics.dropped_datagrams[ip_nid] += 1
             except LookupError:
@@ -186,16 +221,61 @@ class UDPDemultiplexer:
             except LookupError:
                 self._statistics.accepted_datagrams[source_node_id] = 1
 
+    def _on_socket_readable(self) -> None:
+        # The number of datagrams read per invocation is limited to avoid starving other tasks if the network
+        # is flooded; the remaining datagrams will be read at the next iteration of the event loop.
+        # Errors like ECONNREFUSED (caused by an ICMP message) or ENOBUFS are transient, so we keep reading;
+        # the datagrams that were read before the error are still processed.
+        datagrams: typing.List[typing.Tuple[bytes, int, pyuavcan.transport.Timestamp]] = []
+        try:
+            self._read_available_datagrams(datagrams, _MAX_DATAGRAMS_PER_EVENT_LOOP_ITERATION)
+        except OSError as ex:
+            if ex.errno == errno.EBADF or self._sock.fileno() < 0:
+                _logger.exception('%r: The socket has been closed unexpectedly! No more data will be read.', self)
+                self._stop_reading()
+            else:
+                _logger.exception('%r: Socket read failure: %s; will continue', self, ex)
+        for data, source_ip, ts in datagrams:
+            self._dispatch_frame(source_ip, UDPFrame.parse(memoryview(data), ts))
+
+    def _read_available_datagrams(self,
+                                  out:   typing.List[typing.Tuple[bytes, int, pyuavcan.transport.Timestamp]],
+                                  limit: int) -> None:
+        """
+        Appends the datagrams read from the socket to the list until the socket is empty or the limit is reached.
+        """
+        try:
+            while len(out) < limit:
+                if self._batch_receiver is not None:
+                    out += self._batch_receiver.receive(self._sock)
+                else:
+                    # A new buffer is needed for each datagram; see the explanation in the reader thread function.
+                    data, endpoint = self._sock.recvfrom(self._udp_mtu)
+                    out.append((data, self._parse_address(endpoint[0]), pyuavcan.transport.Timestamp.now()))
+                    if len(data) >= self._udp_mtu:  # pragma: no cover
+                        _logger.warning('%r: A datagram from %r is %d bytes long which is not less than '
+                                        'the size of the buffer, therefore it might have been truncated. '
+                                        'Enlarge the read buffer to squelch this warning.',
+                                        self, endpoint, len(data))
+        except BlockingIOError:
+            pass
+
+    def _parse_address(self, text: str) -> int:
+        return int.from_bytes(socket.inet_pton(self._sock.family, text), 'big')
+
+    def _format_address(self, address: int) -> str:
+        family = self._sock.family
+        return socket.inet_ntop(family, address.to_bytes(16 if family == socket.AF_INET6 else 4, 'big'))
+
     def _thread_entry_point(self) -> None:
-        while not self._closed:
+        while self._reading:
             try:
                 # Notice that we MUST create a new buffer for each received datagram to avoid race conditions.
                 # Buffer memory cannot be shared because the rest of the stack is completely zero-copy;
                 # meaning that the data we allocate here, at the very bottom of the protocol stack,
                 # is likely to be carried all the way up to the application layer without being copied.
                 data, endpoint = self._sock.recvfrom(self._udp_mtu)
-                source_ip = endpoint[0]
-                assert isinstance(source_ip, str)
+                source_ip = self._parse_address(endpoint[0])
 
                 # TODO: use socket timestamping when running on Linux (Windows does not support timestamping).
                 ts = pyuavcan.transport.Timestamp.now()
@@ -220,7 +300,7 @@ class UDPDemultiplexer:
                     _logger.debug('%r: Ignoring exception %r because we have been commanded to stop', self, ex)
 
                 elif self._sock.fileno() < 0:
-                    self._closed = True
+                    self._reading = False
                     _logger.exception('%r: The socket has been closed unexpectedly! Terminating the instance.', self)
 
                 else:  # pragma: no cover
@@ -228,13 +308,51 @@ class UDPDemultiplexer:
                     time.sleep(1)
 
         _logger.debug('%r: The reader worker thread is exiting, bye bye', self)
-        assert self._closed
+        assert not self._reading
 
     def __repr__(self) -> str:
         return pyuavcan.util.repr_attributes_noexcept(self, self._sock, remote_node_ids=list(self._listeners.keys()))
 
 
 def _unittest_demultiplexer() -> None:
+    _test_demultiplexer(None)
+    _test_demultiplexer(BatchReceiver.new(10240))    # None if not supported on this platform
+
+
+def _unittest_demultiplexer_unsupported_batch_receiver() -> None:
+    batch_receiver = BatchReceiver.new(10240)
+    if batch_receiver is None:  # pragma: no cover
+        return
+
+    loop = asyncio.get_event_loop()
+    sock_rx = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+    sock_rx.bind(('::1', 0))
+    sock_tx = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+    sock_tx.bind(('::1', 0))
+    stats = UDPDemultiplexerStatistics()
+    demux = UDPDemultiplexer(sock=sock_rx,
+                             udp_mtu=10240,
+                             node_id_mapper=lambda ip: 1 if ip == 1 else None,  # ::1
+                             local_node_id=None,
+                             statistics=stats,
+                             loop=loop,
+                             batch_receiver=batch_receiver)
+    # noinspection PyProtectedMember
+    assert demux._batch_receiver is None    # IPv6 is not supported by the batch receiver, so it is not used.
+
+    received: typing.List[typing.Tuple[int, typing.Optional[UDPFrame]]] = []
+    demux.add_listener(None, lambda i, f: received.append((i, f)))
+    sock_tx.sendto(b'abc', sock_rx.getsockname())
+    loop.run_until_complete(asyncio.sleep(0.1))  # Let the event loop process the datagram.
+    assert received == [(1, None)]
+    assert stats == UDPDemultiplexerStatistics(accepted_datagrams={1: 1})
+
+    demux.remove_listener(None)
+    demux.close()
+    sock_tx.close()
+
+
+def _test_demultiplexer(batch_receiver: typing.Optional[BatchReceiver]) -> None:
     from pytest import raises
     from pyuavcan.transport import Priority, Timestamp
 
@@ -252,9 +370,9 @@ def _unittest_demultiplexer() -> None:
 
     # This is a simplified mapping; good enough for testing.
     node_id_map = {
-        '127.100.0.1': 1,
-        '127.100.0.2': 2,
-        '127.100.0.3': 3,
+        int.from_bytes(socket.inet_aton('127.100.0.1'), 'big'): 1,
+        int.from_bytes(socket.inet_aton('127.100.0.2'), 'big'): 2,
+        int.from_bytes(socket.inet_aton('127.100.0.3'), 'big'): 3,
     }
 
     sock_rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -272,7 +390,8 @@ def _unittest_demultiplexer() -> None:
                              node_id_mapper=node_id_map.get,
                              local_node_id=1234,
                              statistics=stats,
-                             loop=loop)
+                             loop=loop,
+                             batch_receiver=batch_receiver)
     assert not demux.has_listeners
     with raises(LookupError):
         demux.remove_listener(123)
@@ -301,7 +420,7 @@ def _unittest_demultiplexer() -> None:
                  payload=memoryview(b'HARDBASS'),
                  data_type_hash=0x_deadbeef_deadbeef).compile_header_and_payload()
     ))
-    run_until_complete(asyncio.sleep(1.1))  # Let the handler run in the background.
+    run_until_complete(asyncio.sleep(0.1))  # Let the event loop process the datagram.
     assert stats == UDPDemultiplexerStatistics(
         accepted_datagrams={1: 1},
         dropped_datagrams={},
@@ -330,7 +449,7 @@ def _unittest_demultiplexer() -> None:
                  data_type_hash=0x_dead_beef_c0ffee).compile_header_and_payload()
     ))
 
-    run_until_complete(asyncio.sleep(1.1))  # Let the handler run in the background.
+    run_until_complete(asyncio.sleep(0.1))  # Let the event loop process the datagram.
     assert stats == UDPDemultiplexerStatistics(
         accepted_datagrams={1: 1, 3: 1},
         dropped_datagrams={},
@@ -365,7 +484,7 @@ def _unittest_demultiplexer() -> None:
                  payload=memoryview(b'HARDBASS'),
                  data_type_hash=0x_deadbeef_deadbeef).compile_header_and_payload()
     ))
-    run_until_complete(asyncio.sleep(1.1))  # Let the handler run in the background.
+    run_until_complete(asyncio.sleep(0.1))  # Let the event loop process the datagram.
     assert stats == UDPDemultiplexerStatistics(
         accepted_datagrams={1: 1, 3: 2},
         dropped_datagrams={},
@@ -393,7 +512,7 @@ def _unittest_demultiplexer() -> None:
                  payload=memoryview(b'Oy blin!'),
                  data_type_hash=0x_dead_beef_c0ffee).compile_header_and_payload()
     ))
-    run_until_complete(asyncio.sleep(1.1))  # Let the handler run in the background.
+    run_until_complete(asyncio.sleep(0.1))  # Let the event loop process the datagram.
     assert stats == UDPDemultiplexerStatistics(
         accepted_datagrams={1: 1, 3: 2},
         dropped_datagrams={1: 1},
@@ -411,7 +530,7 @@ def _unittest_demultiplexer() -> None:
                  payload=memoryview(b'Oy blin!'),
                  data_type_hash=0x_dead_beef_c0ffee).compile_header_and_payload()
     ))
-    run_until_complete(asyncio.sleep(1.1))  # Let the handler run in the background.
+    run_until_complete(asyncio.sleep(0.1))  # Let the event loop process the datagram.
     assert stats == UDPDemultiplexerStatistics(
         accepted_datagrams={1: 1, 3: 2},
         dropped_datagrams={1: 1, '127.100.0.9': 1},
@@ -421,7 +540,7 @@ def _unittest_demultiplexer() -> None:
 
     # INVALID FRAME FROM NODE
     sock_tx_3.send(b'abc')
-    run_until_complete(asyncio.sleep(1.1))  # Let the handler run in the background.
+    run_until_complete(asyncio.sleep(0.1))  # Let the event loop process the datagram.
     assert stats == UDPDemultiplexerStatistics(
         accepted_datagrams={1: 1, 3: 3},
         dropped_datagrams={1: 1, '127.100.0.9': 1},
@@ -432,7 +551,7 @@ def _unittest_demultiplexer() -> None:
 
     # INVALID FRAME FROM UNMAPPED IP ADDRESS
     sock_tx_9.send(b'abc')
-    run_until_complete(asyncio.sleep(1.1))  # Let the handler run in the background.
+    run_until_complete(asyncio.sleep(0.1))  # Let the event loop process the datagram.
     assert stats == UDPDemultiplexerStatistics(
         accepted_datagrams={1: 1, 3: 3},
         dropped_datagrams={1: 1, '127.100.0.9': 2},
@@ -452,19 +571,66 @@ def _unittest_demultiplexer() -> None:
         demux.add_listener(3, lambda i, f: received_frames_3.append((i, f)))
     assert sock_rx.fileno() < 0, 'The socket has not been closed'
 
-    # SOCKET FAILURE
+    # TRANSIENT SOCKET FAILURE
     sock_rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock_rx.bind(('127.100.0.100', 0))
+    sock_rx.bind(destination_endpoint)
     stats = UDPDemultiplexerStatistics()
     demux = UDPDemultiplexer(sock=sock_rx,
                              udp_mtu=10240,
                              node_id_mapper=node_id_map.get,
                              local_node_id=1234,
                              statistics=stats,
-                             loop=loop)
+                             loop=loop,
+                             batch_receiver=batch_receiver)
+    demux.add_listener(3, lambda i, f: received_frames_3.append((i, f)))
+
+    # A datagram sent to a closed port triggers an ICMP message that is reported as ECONNREFUSED by the next read.
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock_closed:
+        sock_closed.bind(('127.100.0.3', 0))
+        closed_endpoint = sock_closed.getsockname()
+    sock_rx.connect(closed_endpoint)
+    sock_rx.send(b'abc')
+    _logger.error("DON'T PANIC: THE ERROR MESSAGE YOU ARE GOING TO SEE JUST BELOW THIS ONE IS EXPECTED")
+    run_until_complete(asyncio.sleep(0.1))
+    sock_rx.connect(sock_tx_3.getsockname())
+    # noinspection PyProtectedMember
+    assert demux._reading
+    sock_tx_3.send(b'abc')
+    run_until_complete(asyncio.sleep(0.1))  # The instance is still reading.
+    assert received_frames_3.pop() == (3, None)
+    assert stats == UDPDemultiplexerStatistics(accepted_datagrams={3: 1})
+
+    # SOCKET FAILURE
     _logger.error("DON'T PANIC: THE ERROR MESSAGE YOU ARE GOING TO SEE JUST BELOW THIS ONE IS EXPECTED")
+    # The event loop stops polling a descriptor once it is closed, so the read failure is reported explicitly.
     # noinspection PyProtectedMember
     demux._sock.close()
-    run_until_complete(asyncio.sleep(_READ_TIMEOUT * 2))  # Wait for the reader thread to notice the problem.
+    # noinspection PyProtectedMember
+    demux._on_socket_readable()
+    # noinspection PyProtectedMember
+    assert not demux._reading
+    # noinspection PyProtectedMember
+    assert not demux._closed
+    demux.remove_listener(3)
+    demux.close()
     # noinspection PyProtectedMember
     assert demux._closed
+
+    # CLOSURE AFTER THE READING HAS STOPPED
+    sock_rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock_rx.bind(('127.100.0.100', 0))
+    demux = UDPDemultiplexer(sock=sock_rx,
+                             udp_mtu=10240,
+                             node_id_mapper=node_id_map.get,
+                             local_node_id=1234,
+                             statistics=UDPDemultiplexerStatistics(),
+                             loop=loop,
+                             batch_receiver=batch_receiver)
+    # noinspection PyProtectedMember
+    demux._stop_reading()
+    demux.close()
+    assert sock_rx.fileno() < 0, 'The socket has not been closed'
+
+    sock_tx_1.close()
+    sock_tx_3.close()
+    sock_tx_9.close()
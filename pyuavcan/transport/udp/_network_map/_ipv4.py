@@ -34,6 +34,8 @@ class NetworkMapIPv4(NetworkMap):
         # broadcast address for the subnet. In this example, we can use the full range of node-ID
         # values if the subnet mask is 19 bits wide or less.
         self._max_nodes: int = min(2 ** self.NODE_ID_BIT_LENGTH, self._local.hostmask)
+        # Precomputed for the fast mapping of the source addresses of the received datagrams.
+        self._subnet_address = int(self._local.subnet_address)
 
         maybe_local_node_id = int(self._local) - int(self._local.subnet_address)
         if maybe_local_node_id < self._max_nodes:
@@ -73,56 +75,52 @@ class NetworkMapIPv4(NetworkMap):
         try:
             return self._ip_to_nid_cache[ip]
         except LookupError:
-            a = IPv4Address.parse(ip)
-            node_id: typing.Optional[int] = None
-            if a in self._local:
-                candidate = int(a) - int(self._local.subnet_address)
-                assert candidate >= 0
-                if candidate < self._max_nodes:
-                    node_id = candidate
-
+            node_id = self.map_raw_ip_address_to_node_id(int(IPv4Address.parse(ip)))
             _logger.debug('%r: New IP to node-ID mapping: %r --> %s', self, ip, node_id)
+            # The oldest entry is evicted if the cache is full, so that a flood of datagrams from random addresses
+            # could not make the cache grow indefinitely.
+            if len(self._ip_to_nid_cache) >= _IP_TO_NODE_ID_CACHE_CAPACITY:
+                del self._ip_to_nid_cache[next(iter(self._ip_to_nid_cache))]    # Dicts are ordered by insertion
             self._ip_to_nid_cache[ip] = node_id
             return node_id
 
-    def make_output_socket(self, remote_node_id: typing.Optional[int], remote_port: int) -> socket.socket:
-        if self.local_node_id is None:
-            raise pyuavcan.transport.OperationNotDefinedForAnonymousNodeError(
-                f'Anonymous UDP/IP nodes cannot emit transfers, they can only listen. '
-                f'The local IP address is {self._local}.'
-            )
+    def map_raw_ip_address_to_node_id(self, address: int) -> typing.Optional[int]:
+        # The maximum number of nodes never exceeds the size of the subnet, so the address is within the subnet
+        # if the candidate node-ID is within the valid range.
+        candidate = address - self._subnet_address
+        return candidate if 0 <= candidate < self._max_nodes else None
 
-        bind_to = self._local.host_address
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.setblocking(False)
+    def make_output_socket(self, remote_node_id: typing.Optional[int], remote_port: int) -> socket.socket:
+        s = self._make_bound_output_socket()
         try:
-            # Output sockets shall be bound, too, in order to ensure that outgoing packets have the correct
-            # source IP address specified. This is particularly important for localhost; an unbound socket
-            # there emits all packets from 127.0.0.1 which is certainly not what we need.
-            s.bind((str(bind_to), 0))  # Bind to an ephemeral port.
-        except OSError as ex:
-            if ex.errno == errno.EADDRNOTAVAIL:
-                raise pyuavcan.transport.InvalidMediaConfigurationError(
-                    f'Bad IP configuration: cannot bind output socket to {bind_to} [{errno.errorcode[ex.errno]}]'
-                ) from None
-            raise  # pragma: no cover
-
+            remote_ip = self.map_node_id_to_ip_address(remote_node_id)
+        except ValueError:
+            s.close()
+            raise
         # Specify the fixed remote end. The port is always fixed; the host is unicast or broadcast.
         if remote_node_id is None:
             s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            s.connect((str(self._local.broadcast_address), remote_port))
-        elif 0 <= remote_node_id < self._max_nodes:
-            ip = IPv4Address(int(self._local.subnet_address) + remote_node_id)
-            assert ip in self._local
-            s.connect((str(ip), remote_port))
-        else:
-            raise ValueError(f'Cannot map the node-ID value {remote_node_id} to an IP address. '
-                             f'The range of valid node-ID values is [0, {self._max_nodes})')
-
+        s.connect((remote_ip, remote_port))
         _logger.debug('%r: New output socket %r connected to remote node %r, remote port %r',
                       self, s, remote_node_id, remote_port)
         return s
 
+    def make_shared_output_socket(self) -> socket.socket:
+        s = self._make_bound_output_socket()
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        _logger.debug('%r: New shared output socket %r', self, s)
+        return s
+
+    def map_node_id_to_ip_address(self, node_id: typing.Optional[int]) -> str:
+        if node_id is None:
+            return str(self._local.broadcast_address)
+        if 0 <= node_id < self._max_nodes:
+            ip = IPv4Address(self._subnet_address + node_id)
+            assert ip in self._local
+            return str(ip)
+        raise ValueError(f'Cannot map the node-ID value {node_id} to an IP address. '
+                         f'The range of valid node-ID values is [0, {self._max_nodes})')
+
     def make_input_socket(self, local_port: int, expect_broadcast: bool) -> socket.socket:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.setblocking(False)
@@ -170,6 +168,36 @@ class NetworkMapIPv4(NetworkMap):
     def __str__(self) -> str:
         return str(self._local)
 
+    def _make_bound_output_socket(self) -> socket.socket:
+        if self.local_node_id is None:
+            raise pyuavcan.transport.OperationNotDefinedForAnonymousNodeError(
+                f'Anonymous UDP/IP nodes cannot emit transfers, they can only listen. '
+                f'The local IP address is {self._local}.'
+            )
+
+        bind_to = self._local.host_address
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.setblocking(False)
+        try:
+            # Output sockets shall be bound, too, in order to ensure that outgoing packets have the correct
+            # source IP address specified. This is particularly important for localhost; an unbound socket
+            # there emits all packets from 127.0.0.1 which is certainly not what we need.
+            s.bind((str(bind_to), 0))  # Bind to an ephemeral port.
+        except OSError as ex:
+            s.close()
+            if ex.errno == errno.EADDRNOTAVAIL:
+                raise pyuavcan.transport.InvalidMediaConfigurationError(
+                    f'Bad IP configuration: cannot bind output socket to {bind_to} [{errno.errorcode[ex.errno]}]'
+                ) from None
+            raise  # pragma: no cover
+        return s
+
+
+_IP_TO_NODE_ID_CACHE_CAPACITY = 1024
+"""
+The maximum number of distinct IP addresses in the string form whose mapping to node-ID is cached.
+"""
+
 
 def _unittest_network_map_ipv4() -> None:
     from pytest import raises
@@ -210,6 +238,18 @@ def _unittest_network_map_ipv4() -> None:
     assert nm.map_ip_address_to_node_id('127.122.0.1') is None
     assert nm.map_ip_address_to_node_id('127.123.254.254') is None
     assert nm.map_ip_address_to_node_id('127.124.0.1') is None
+    assert nm.map_raw_ip_address_to_node_id(0x7F7B_0201) == 513
+    assert nm.map_raw_ip_address_to_node_id(0x7F7B_0000) == 0
+    assert nm.map_raw_ip_address_to_node_id(0x7F7A_FFFF) is None
+    assert nm.map_raw_ip_address_to_node_id(0x7F7B_1000) is None    # Node-ID 4096 is out of range.
+    assert nm.map_raw_ip_address_to_node_id(0x7F7C_0001) is None
+
+    # A flood of datagrams from random addresses does not cause the cache to grow beyond its capacity.
+    for i in range(_IP_TO_NODE_ID_CACHE_CAPACITY * 2):
+        assert nm.map_ip_address_to_node_id(str(IPv4Address(0x0A00_0000 + i))) is None
+    # noinspection PyProtectedMember
+    assert len(nm._ip_to_nid_cache) == _IP_TO_NODE_ID_CACHE_CAPACITY  # type: ignore
+    assert nm.map_ip_address_to_node_id('127.123.2.1') == 513   # Evicted earlier, mapped again.
 
     nm = NetworkMap.new('127.123.0.123/24')
     assert str(nm) == '127.123.0.123/24'
@@ -217,6 +257,8 @@ def _unittest_network_map_ipv4() -> None:
     assert nm.local_node_id == 123
     assert nm.map_ip_address_to_node_id('127.123.0.1') == 1
     assert nm.map_ip_address_to_node_id('127.254.254.254') is None
+    assert nm.map_raw_ip_address_to_node_id(0x7F7B_00FE) == 254
+    assert nm.map_raw_ip_address_to_node_id(0x7F7B_00FF) is None     # Broadcast
 
     with raises(ValueError):
         assert nm.make_output_socket(4095, 65535)  # The node-ID cannot be mapped.
@@ -230,6 +272,18 @@ def _unittest_network_map_ipv4() -> None:
     assert data == b'Well, I got here the same way the coin did.'
     assert sockaddr[0] == '127.123.0.123'
 
+    # The shared output socket can send to any node and to the broadcast address.
+    shared = nm.make_shared_output_socket()
+    assert nm.map_node_id_to_ip_address(None) == '127.123.0.255'
+    assert nm.map_node_id_to_ip_address(nm.local_node_id) == '127.123.0.123'
+    with raises(ValueError):
+        nm.map_node_id_to_ip_address(255)
+    shared.sendto(b'Do not worry, I am a doctor.', (nm.map_node_id_to_ip_address(nm.local_node_id), 12345))
+    data, sockaddr = inp.recvfrom(1024)
+    assert data == b'Do not worry, I am a doctor.'
+    assert sockaddr[0] == '127.123.0.123'
+
+    shared.close()
     out.close()
     inp.close()
 
@@ -29,9 +29,18 @@ class NetworkMapIPv6(NetworkMap):
     def map_ip_address_to_node_id(self, ip: str) -> typing.Optional[int]:
         raise NotImplementedError
 
+    def map_raw_ip_address_to_node_id(self, address: int) -> typing.Optional[int]:
+        raise NotImplementedError
+
     def make_output_socket(self, remote_node_id: typing.Optional[int], remote_port: int) -> socket.socket:
         raise NotImplementedError
 
+    def make_shared_output_socket(self) -> socket.socket:
+        raise NotImplementedError
+
+    def map_node_id_to_ip_address(self, node_id: typing.Optional[int]) -> str:
+        raise NotImplementedError
+
     def make_input_socket(self, local_port: int, expect_broadcast: bool) -> socket.socket:
         raise NotImplementedError
 
@@ -74,7 +74,18 @@ class NetworkMap(abc.ABC):
         Attempts to convert the IP address into a valid node-ID.
         Returns None if the supplied IP address is outside of the node-ID-mapped range within the network
         or belongs to a different subnet.
-        This method is intended to be invoked frequently, approx. once per received frame.
+        The results are cached, but the size of the cache is limited, so it may be slow if the addresses
+        are diverse; use :meth:`map_raw_ip_address_to_node_id` on performance-sensitive paths.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def map_raw_ip_address_to_node_id(self, address: int) -> typing.Optional[int]:
+        """
+        Like :meth:`map_ip_address_to_node_id`, but the IP address is represented as an integer,
+        such as the one obtained by unpacking the address from a socket address structure
+        (in the network byte order). The mapping is done using subnet arithmetic without any conversions.
+        This method is intended to be invoked on every received datagram.
         """
         raise NotImplementedError
 
@@ -89,6 +100,26 @@ class NetworkMap(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def make_shared_output_socket(self) -> socket.socket:
+        """
+        Make a new non-blocking output socket that is not connected to any remote endpoint,
+        so that it can be shared by many output sessions, each using ``sendto()`` with its own destination
+        (see :meth:`map_node_id_to_ip_address`).
+        The socket will be bound to an ephemeral port at the configured local network address.
+        Broadcasting will be enabled.
+        Raises :class:`pyuavcan.transport.OperationNotDefinedForAnonymousNodeError` if the local node is anonymous.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def map_node_id_to_ip_address(self, node_id: typing.Optional[int]) -> str:
+        """
+        The inverse of :meth:`map_ip_address_to_node_id`. If the node-ID is None, returns the broadcast address.
+        Raises :class:`ValueError` if the node-ID cannot be mapped to an IP address.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def make_input_socket(self, local_port: int, expect_broadcast: bool) -> socket.socket:
         r"""
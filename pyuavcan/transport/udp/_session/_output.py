@@ -47,10 +47,13 @@ class UDPOutputSession(pyuavcan.transport.OutputSession):
                  multiplier:       int,
                  sock:             socket_.socket,
                  loop:             asyncio.AbstractEventLoop,
-                 finalizer:        typing.Callable[[], None]):
+                 finalizer:        typing.Callable[[], None],
+                 destination:      typing.Optional[typing.Tuple[str, int]] = None):
         """
         Do not call this directly. Instead, use the factory method.
-        Instances take ownership of the socket.
+        Instances take ownership of the socket, unless the destination is specified.
+        If the destination is specified, the socket is not connected and it may be shared with other sessions;
+        the frames are sent to the destination using ``sendto()``, and the socket is not closed with the session.
         """
         self._closed = False
         self._specifier = specifier
@@ -58,6 +61,7 @@ class UDPOutputSession(pyuavcan.transport.OutputSession):
         self._mtu = int(mtu)
         self._multiplier = int(multiplier)
         self._sock = sock
+        self._destination = destination
         self._loop = loop
         self._finalizer = finalizer
         self._feedback_handler: typing.Optional[typing.Callable[[pyuavcan.transport.Feedback], None]] = None
@@ -103,12 +107,6 @@ class UDPOutputSession(pyuavcan.transport.OutputSession):
 
         self._statistics.transfers += 1
 
-        # Once we have transmitted at least one copy of a multiplied transfer, it's a success.
-        # We don't care if redundant copies fail.
-        for _ in range(self._multiplier - 1):
-            if not await self._emit(frames, monotonic_deadline):
-                break
-
         if self._feedback_handler is not None:
             try:
                 self._feedback_handler(UDPFeedback(original_transfer_timestamp=transfer.timestamp,
@@ -140,7 +138,8 @@ class UDPOutputSession(pyuavcan.transport.OutputSession):
         if not self._closed:
             self._closed = True
             try:
-                self._sock.close()
+                if self._destination is None:
+                    self._sock.close()
             finally:
                 self._finalizer()
 
@@ -148,6 +147,7 @@ class UDPOutputSession(pyuavcan.transport.OutputSession):
     def socket(self) -> socket_.socket:
         """
         Provides access to the underlying UDP socket.
+        The socket may be shared with other sessions; see :class:`pyuavcan.transport.udp.UDPTransport`.
         """
         return self._sock
 
@@ -155,35 +155,82 @@ class UDPOutputSession(pyuavcan.transport.OutputSession):
                     header_payload_pairs: typing.Sequence[typing.Tuple[memoryview, memoryview]],
                     monotonic_deadline:   float) -> typing.Optional[pyuavcan.transport.Timestamp]:
         """
+        Transmits the frames as many times as required by the transfer multiplier.
         Returns the transmission timestamp of the first frame (which is the transfer timestamp) on success.
-        Returns None if at least one frame could not be transmitted.
+        Returns None if at least one frame of the first copy of the transfer could not be transmitted.
+        Once we have transmitted at least one copy of a multiplied transfer, it's a success.
+        We don't care if redundant copies fail.
+
+        The frames are written directly into the non-blocking socket one after another, which costs one system call
+        per frame and does not involve the event loop at all. The event loop is used only if the socket buffer is
+        full, in which case the deadline is enforced; otherwise, the deadline is checked only once at the beginning.
         """
+        if self._loop.time() >= monotonic_deadline:
+            self._statistics.drops += len(header_payload_pairs)
+            return None
+
+        sock = self._sock
+        destination = self._destination
         ts: typing.Optional[pyuavcan.transport.Timestamp] = None
-        for index, (header, payload) in enumerate(header_payload_pairs):
-            try:
-                # TODO: concatenation is inefficient. Use vectorized IO via sendmsg() instead!
-                await asyncio.wait_for(self._loop.sock_sendall(self._sock, b''.join((header, payload))),
-                                       timeout=monotonic_deadline - self._loop.time(),
-                                       loop=self._loop)
-
-                # TODO: use socket timestamping when running on Linux (Windows does not support timestamping).
-                # Depending on the chosen approach, timestamping on Linux may require us to launch a new thread
-                # reading from the socket's error message queue and then matching the returned frames with a
-                # pending loopback registry, kind of like it's done with CAN.
-                ts = ts or pyuavcan.transport.Timestamp.now()
-
-            except (asyncio.TimeoutError, asyncio.CancelledError):
-                self._statistics.drops += len(header_payload_pairs) - index
-                return None
-            except Exception:
-                self._statistics.errors += 1
-                raise
-            else:
-                self._statistics.frames += 1
-                self._statistics.payload_bytes += len(payload)
+        for copy_index in range(self._multiplier):
+            for index, (header, payload) in enumerate(header_payload_pairs):
+                try:
+                    try:
+                        if destination is None:
+                            if _VECTORIZED_IO_AVAILABLE:
+                                sock.sendmsg((header, payload))     # Vectorized IO avoids concatenation.
+                            else:  # pragma: no cover
+                                sock.send(b''.join((header, payload)))
+                        else:
+                            if _VECTORIZED_IO_AVAILABLE:
+                                sock.sendmsg((header, payload), (), 0, destination)
+                            else:  # pragma: no cover
+                                sock.sendto(b''.join((header, payload)), destination)
+                    except BlockingIOError:
+                        await asyncio.wait_for(self._send_when_writable(b''.join((header, payload))),
+                                               timeout=monotonic_deadline - self._loop.time(),
+                                               loop=self._loop)
+
+                    # TODO: use socket timestamping when running on Linux (Windows does not support timestamping).
+                    # Depending on the chosen approach, timestamping on Linux may require us to launch a new thread
+                    # reading from the socket's error message queue and then matching the returned frames with a
+                    # pending loopback registry, kind of like it's done with CAN.
+                    ts = ts or pyuavcan.transport.Timestamp.now()
+
+                except (asyncio.TimeoutError, asyncio.CancelledError):
+                    self._statistics.drops += len(header_payload_pairs) - index
+                    return ts if copy_index > 0 else None
+                except Exception:
+                    self._statistics.errors += 1
+                    raise
+                else:
+                    self._statistics.frames += 1
+                    self._statistics.payload_bytes += len(payload)
 
         return ts
 
+    async def _send_when_writable(self, data: bytes) -> None:
+        if self._destination is None:
+            await self._loop.sock_sendall(self._sock, data)
+        else:
+            # A shared socket cannot be awaited for writability using the event loop because there can be
+            # at most one writer callback per socket, so it is polled instead. This is acceptable because
+            # the send buffer of a UDP socket is rarely full.
+            while True:
+                try:
+                    self._sock.sendto(data, self._destination)
+                    return
+                except BlockingIOError:
+                    await asyncio.sleep(_SHARED_SOCKET_POLL_INTERVAL, loop=self._loop)
+
+
+_SHARED_SOCKET_POLL_INTERVAL = 1e-3
+
+_VECTORIZED_IO_AVAILABLE = hasattr(socket_.socket, 'sendmsg')
+"""
+Vectorized IO is not available on Windows.
+"""
+
 
 def _unittest_output_session() -> None:
     from pytest import raises
@@ -336,6 +383,13 @@ def _unittest_output_session() -> None:
         b'\x00\x07\x00\x00\x01\x00\x00\x801\xd4\x00\x00\x00\x00\x00\x00\xfe\x0f\xdc\xba\xef\xbe\xad\xde'
         + b'e' + pyuavcan.transport.commons.crc.CRC32C.new(b'one', b'two', b'three').value_as_bytes
     )
+    assert sos.sample_statistics() == SessionStatistics(
+        transfers=1,
+        frames=4,   # Redundant copies are counted, too.
+        payload_bytes=30,
+        errors=0,
+        drops=0
+    )
 
     sos = UDPOutputSession(
         specifier=OutputSessionSpecifier(ServiceDataSpecifier(321, ServiceDataSpecifier.Role.REQUEST), 2222),
@@ -396,3 +450,62 @@ def _unittest_output_session() -> None:
                      fragmented_payload=[memoryview(b'one'), memoryview(b'two'), memoryview(b'three')]),
             loop.time() + 10.0
         ))
+
+    # Shared unconnected socket
+    sock_shared = socket_.socket(socket_.AF_INET, socket_.SOCK_DGRAM)
+    sock_shared.bind(('127.100.0.2', 0))
+    sock_shared.setblocking(False)
+    sos_a = UDPOutputSession(
+        specifier=OutputSessionSpecifier(ServiceDataSpecifier(321, ServiceDataSpecifier.Role.RESPONSE), 1111),
+        payload_metadata=PayloadMetadata(0xdead_beef_badc0ffe, 1024),
+        mtu=10,
+        multiplier=2,
+        sock=sock_shared,
+        loop=asyncio.get_event_loop(),
+        finalizer=do_finalize,
+        destination=destination_endpoint,
+    )
+    sos_b = UDPOutputSession(
+        specifier=OutputSessionSpecifier(ServiceDataSpecifier(321, ServiceDataSpecifier.Role.RESPONSE), 2222),
+        payload_metadata=PayloadMetadata(0xdead_beef_badc0ffe, 1024),
+        mtu=10,
+        multiplier=1,
+        sock=sock_shared,
+        loop=asyncio.get_event_loop(),
+        finalizer=do_finalize,
+        destination=destination_endpoint,
+    )
+    assert sos_a.socket is sos_b.socket
+    assert run_until_complete(sos_a.send_until(
+        Transfer(timestamp=ts,
+                 priority=Priority.OPTIONAL,
+                 transfer_id=54321,
+                 fragmented_payload=[memoryview(b'one'), memoryview(b'two'), memoryview(b'three')]),
+        loop.time() + 10.0
+    ))
+    assert run_until_complete(sos_b.send_until(
+        Transfer(timestamp=ts,
+                 priority=Priority.OPTIONAL,
+                 transfer_id=54321,
+                 fragmented_payload=[memoryview(b'one'), memoryview(b'two'), memoryview(b'three')]),
+        loop.time() + 10.0
+    ))
+    received = [sock_rx.recvfrom(1000) for _ in range(6)]
+    assert all(endpoint == sock_shared.getsockname() for _, endpoint in received)
+    assert [data for data, _ in received] == [data_main_a, data_main_b] * 3
+    with raises(socket_.timeout):
+        sock_rx.recvfrom(1000)
+
+    assert sos_a.sample_statistics() == SessionStatistics(transfers=1, frames=4, payload_bytes=30)
+    assert sos_b.sample_statistics() == SessionStatistics(transfers=1, frames=2, payload_bytes=15)
+
+    # noinspection PyProtectedMember
+    run_until_complete(sos_b._send_when_writable(b'Slow path'))
+    assert sock_rx.recvfrom(1000)[0] == b'Slow path'
+
+    # The shared socket is not closed with the sessions.
+    sos_a.close()
+    sos_b.close()
+    assert sock_shared.fileno() >= 0
+    sock_shared.close()
+    sock_rx.close()
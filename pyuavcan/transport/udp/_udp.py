@@ -6,6 +6,7 @@
 
 import copy
 import typing
+import socket
 import asyncio
 import logging
 import dataclasses
@@ -16,6 +17,7 @@ from ._frame import UDPFrame
 from ._network_map import NetworkMap
 from ._port_mapping import udp_port_from_data_specifier
 from ._demultiplexer import UDPDemultiplexer, UDPDemultiplexerStatistics
+from ._batch_receiver import BatchReceiver
 
 
 # This is for internal use only: the maximum possible payload per UDP frame.
@@ -77,6 +79,7 @@ class UDPTransport(pyuavcan.transport.Transport):
                  ip_address:                  str,
                  mtu:                         int = DEFAULT_MTU,
                  service_transfer_multiplier: int = DEFAULT_SERVICE_TRANSFER_MULTIPLIER,
+                 output_socket_pool_size:     int = 0,
                  loop:                        typing.Optional[asyncio.AbstractEventLoop] = None):
         """
         :param ip_address: Specifies which local IP address to use for this transport.
@@ -144,17 +147,30 @@ class UDPTransport(pyuavcan.transport.Transport):
             This parameter specifies the number of times each outgoing service transfer will be repeated.
             This setting does not affect message transfers.
 
+        :param output_socket_pool_size: If zero (default), each output session has its own socket connected
+            to the remote endpoint. Otherwise, this is the number of unconnected sockets that are shared by
+            all output sessions, which send the frames using ``sendto()``;
+            the sessions are distributed between the sockets evenly.
+            The shared sockets are useful for nodes that communicate with a large number of remote nodes,
+            such as a server responding to many clients, because the number of open file descriptors
+            does not grow with the number of output sessions, and the sessions are cheaper to set up.
+            The statistics and the feedback are still maintained per session.
+
         :param loop: The event loop to use. Defaults to :func:`asyncio.get_event_loop`.
         """
         self._network_map = NetworkMap.new(ip_address)
         self._mtu = int(mtu)
         self._srv_multiplier = int(service_transfer_multiplier)
+        self._output_socket_pool_size = int(output_socket_pool_size)
         self._loop = loop if loop is not None else asyncio.get_event_loop()
 
         low, high = self.VALID_SERVICE_TRANSFER_MULTIPLIER_RANGE
         if not (low <= self._srv_multiplier <= high):
             raise ValueError(f'Invalid service transfer multiplier: {self._srv_multiplier}')
 
+        if self._output_socket_pool_size < 0:
+            raise ValueError(f'Invalid output socket pool size: {self._output_socket_pool_size}')
+
         low, high = self.VALID_MTU_RANGE
         if not (low <= self._mtu <= high):
             raise ValueError(f'Invalid MTU: {self._mtu} bytes')
@@ -163,8 +179,13 @@ class UDPTransport(pyuavcan.transport.Transport):
                       f'local node-ID: {self.local_node_id}')
 
         self._demultiplexer_registry: typing.Dict[pyuavcan.transport.DataSpecifier, UDPDemultiplexer] = {}
+        # Shared by all demultiplexers because the input sockets are served by the event loop one at a time.
+        self._batch_receiver = BatchReceiver.new(_MAX_UDP_MTU)
         self._input_registry: typing.Dict[pyuavcan.transport.InputSessionSpecifier, UDPInputSession] = {}
         self._output_registry: typing.Dict[pyuavcan.transport.OutputSessionSpecifier, UDPOutputSession] = {}
+        # The shared output sockets are created on demand, up to the configured pool size.
+        self._output_socket_pool: typing.List[socket.socket] = []
+        self._output_socket_pool_index = 0
 
         self._closed = False
         self._statistics = UDPTransportStatistics()
@@ -192,6 +213,9 @@ class UDPTransport(pyuavcan.transport.Transport):
                 s.close()
             except Exception as ex:  # pragma: no cover
                 _logger.exception('%s: Failed to close %r: %s', self, s, ex)
+        for sock in self._output_socket_pool:
+            sock.close()
+        self._output_socket_pool.clear()
 
     def get_input_session(self,
                           specifier:        pyuavcan.transport.InputSessionSpecifier,
@@ -216,10 +240,13 @@ class UDPTransport(pyuavcan.transport.Transport):
             multiplier = \
                 self._srv_multiplier if isinstance(specifier.data_specifier, pyuavcan.transport.ServiceDataSpecifier) \
                 else 1
-            sock = self._network_map.make_output_socket(
-                specifier.remote_node_id,
-                udp_port_from_data_specifier(specifier.data_specifier)
-            )
+            remote_port = udp_port_from_data_specifier(specifier.data_specifier)
+            destination: typing.Optional[typing.Tuple[str, int]] = None
+            if self._output_socket_pool_size > 0:
+                destination = self._network_map.map_node_id_to_ip_address(specifier.remote_node_id), remote_port
+                sock = self._get_shared_output_socket()
+            else:
+                sock = self._network_map.make_output_socket(specifier.remote_node_id, remote_port)
             self._output_registry[specifier] = UDPOutputSession(
                 specifier=specifier,
                 payload_metadata=payload_metadata,
@@ -228,6 +255,7 @@ class UDPTransport(pyuavcan.transport.Transport):
                 sock=sock,
                 loop=self._loop,
                 finalizer=finalizer,
+                destination=destination,
             )
 
         out = self._output_registry[specifier]
@@ -276,11 +304,12 @@ class UDPTransport(pyuavcan.transport.Transport):
                 self._demultiplexer_registry[specifier.data_specifier] = UDPDemultiplexer(
                     sock=self._network_map.make_input_socket(udp_port, expect_broadcast),
                     udp_mtu=_MAX_UDP_MTU,
-                    node_id_mapper=self._network_map.map_ip_address_to_node_id,
+                    node_id_mapper=self._network_map.map_raw_ip_address_to_node_id,
                     local_node_id=self.local_node_id,
                     statistics=self._statistics.demultiplexer.setdefault(specifier.data_specifier,
                                                                          UDPDemultiplexerStatistics()),
                     loop=self.loop,
+                    batch_receiver=self._batch_receiver,
                 )
 
             cls: typing.Union[typing.Type[PromiscuousUDPInputSession], typing.Type[SelectiveUDPInputSession]] = \
@@ -331,6 +360,16 @@ class UDPTransport(pyuavcan.transport.Transport):
                 finally:
                     del self._demultiplexer_registry[specifier.data_specifier]
 
+    def _get_shared_output_socket(self) -> socket.socket:
+        """
+        Picks the next socket from the pool in the round-robin order. Creates a new one if the pool is not full.
+        """
+        index = self._output_socket_pool_index % self._output_socket_pool_size
+        if index >= len(self._output_socket_pool):
+            self._output_socket_pool.append(self._network_map.make_shared_output_socket())
+        self._output_socket_pool_index += 1
+        return self._output_socket_pool[index]
+
     def _ensure_not_closed(self) -> None:
         if self._closed:
             raise pyuavcan.transport.ResourceClosedError(f'{self} is closed')
@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2020 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+import typing
+import random
+import logging
+
+import numpy
+import pytest
+import pydsdl
+
+import pyuavcan.dsdl
+from . import _util
+
+
+_NUM_OBJECTS_PER_TYPE = 100
+
+_logger = logging.getLogger(__name__)
+
+
+# noinspection PyUnusedLocal
+def _unittest_slow_batch_manual(generated_packages: typing.List[pyuavcan.dsdl.GeneratedPackageInfo]) -> None:
+    import uavcan.node
+    import uavcan.time
+    import uavcan.primitive
+    import uavcan.si.sample.temperature
+
+    def make_temperature(timestamp: int, kelvin: float) -> bytes:
+        return b''.join(pyuavcan.dsdl.serialize(uavcan.si.sample.temperature.Scalar_1_0(
+            timestamp=uavcan.time.SynchronizedTimestamp_1_0(timestamp),
+            kelvin=kelvin,
+        )))
+
+    payloads = [
+        make_temperature(123456789, 300.5),
+        make_temperature(2 ** 56 - 1, -1.0),
+        b'\x01\x02',    # Implicit zero extension
+    ]
+    out = pyuavcan.dsdl.deserialize_batch(uavcan.si.sample.temperature.Scalar_1_0, payloads)
+    assert out.shape == (3,)
+    assert out['timestamp']['microsecond'].tolist() == [123456789, 2 ** 56 - 1, 0x0201]
+    assert out['kelvin'].dtype == numpy.float32
+    assert out['kelvin'].tolist() == [300.5, -1.0, 0.0]
+
+    # Fragmented serialized representations are accepted as well.
+    out = pyuavcan.dsdl.deserialize_batch(uavcan.si.sample.temperature.Scalar_1_0,
+                                          [[memoryview(payloads[0][:3]), memoryview(payloads[0][3:])]])
+    assert out['timestamp']['microsecond'].tolist() == [123456789]
+    assert out['kelvin'].tolist() == [300.5]
+
+    heart = uavcan.node.Heartbeat_1_0(uptime=0xdeadbeef,
+                                      health=uavcan.node.Heartbeat_1_0.HEALTH_CAUTION,
+                                      mode=uavcan.node.Heartbeat_1_0.MODE_OPERATIONAL,
+                                      vendor_specific_status_code=0x7d0f)
+    out = pyuavcan.dsdl.deserialize_batch(uavcan.node.Heartbeat_1_0, [b''.join(pyuavcan.dsdl.serialize(heart))] * 10)
+    assert out.shape == (10,)
+    assert all(out['uptime'] == 0xdeadbeef)
+    assert all(out['health'] == uavcan.node.Heartbeat_1_0.HEALTH_CAUTION)
+    assert all(out['mode'] == uavcan.node.Heartbeat_1_0.MODE_OPERATIONAL)
+    assert all(out['vendor_specific_status_code'] == 0x7d0f)
+
+    assert pyuavcan.dsdl.deserialize_batch(uavcan.node.Heartbeat_1_0, []).shape == (0,)
+
+    with pytest.raises(TypeError, match='.*static layout.*'):
+        pyuavcan.dsdl.deserialize_batch(uavcan.primitive.String_1_0, [b''])
+
+
+def _unittest_slow_batch_automatic(generated_packages: typing.List[pyuavcan.dsdl.GeneratedPackageInfo]) -> None:
+    for info in generated_packages:
+        for model in _util.expand_service_types(info.models):
+            if max(model.bit_length_set) / 8 > 1024 * 1024:
+                _logger.info('Batch test of %s skipped because the type is too large', model)
+                continue        # Skip large objects because they take forever to generate and test
+
+            dtype = pyuavcan.dsdl.get_class(model)
+            try:
+                pyuavcan.dsdl.deserialize_batch(dtype, [])
+            except TypeError:
+                _logger.info('Batch test of %s skipped because the type does not have a static layout', model)
+                continue
+
+            objects = [_util.make_random_object(model) for _ in range(_NUM_OBJECTS_PER_TYPE)]
+            payloads = [b''.join(pyuavcan.dsdl.serialize(o)) for o in objects]
+            payloads = [x[:random.randint(0, len(x))] if random.random() < 0.1 else x for x in payloads]
+            out = pyuavcan.dsdl.deserialize_batch(dtype, payloads)
+            assert out.shape == (len(payloads),)
+            for row, sr in zip(out, payloads):
+                reference = pyuavcan.dsdl.deserialize(dtype, [memoryview(sr)])
+                assert reference is not None
+                _compare(model, row, pyuavcan.dsdl.to_builtin(reference))
+
+
+def _compare(model: pydsdl.CompositeType, row: numpy.void, reference: typing.Dict[str, typing.Any]) -> None:
+    for f in model.fields_except_padding:
+        if isinstance(f.data_type, pydsdl.CompositeType):
+            _compare(f.data_type, row[f.name], reference[f.name])
+        else:
+            numpy.testing.assert_equal(row[f.name], reference[f.name])
@@ -4,13 +4,114 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+import sys
+import typing
+import struct
+import logging
+import importlib
+
 import pytest
+import pydsdl
 
 import pyuavcan.dsdl
 
+from . import _util
 from .conftest import TEST_DATA_TYPES_DIR, PUBLIC_REGULATED_DATA_TYPES_DIR
+from .conftest import STRUCT_PACKED_DESTINATION_DIR, generate_struct_packed_packages
+
+
+_logger = logging.getLogger(__name__)
 
 
 def _unittest_bad_usage() -> None:
     with pytest.raises(TypeError):
         pyuavcan.dsdl.generate_package(TEST_DATA_TYPES_DIR, TEST_DATA_TYPES_DIR)  # type: ignore
+
+
+def _unittest_slow_struct_packing(generated_packages: typing.List[pyuavcan.dsdl.GeneratedPackageInfo]) -> None:
+    assert generated_packages
+    packed_packages = generate_struct_packed_packages()
+    models = [m for p in packed_packages for m in _util.expand_service_types(p.models)]
+    packed = _import_struct_packed_classes(packed_packages)
+
+    # The regular packages are generated without struct packing, so they use the generic logic only.
+    assert not any(hasattr(pyuavcan.dsdl.get_class(m), '_STRUCT_') for m in models)
+    point: typing.Any = packed['sirius_cyber_corp.PointXY.1.0']
+    fit: typing.Any = packed['sirius_cyber_corp.PerformLinearLeastSquaresFit.1.0']
+    timestamp: typing.Any = packed['uavcan.time.SynchronizedTimestamp.1.0']
+    assert point._STRUCT_.format == '<ee'
+    assert fit.Response._STRUCT_.format == '<dd'
+    assert not hasattr(fit.Request, '_STRUCT_')                             # Variable-length
+    assert not hasattr(packed['uavcan.primitive.String.1.0'], '_STRUCT_')
+    assert timestamp._STRUCT_.format == '<IHB'                              # uint56 is split into chunks
+
+    obj = point(x=1.5, y=-float('inf'))
+    sr = b''.join(pyuavcan.dsdl.serialize(obj))
+    assert sr == struct.pack('<ee', 1.5, -float('inf'))
+
+    # Nested packed types are serialized by the non-packed outer type through delegation.
+    req = fit.Request(points=[obj, point(x=-3, y=4)])
+    sr = b''.join(pyuavcan.dsdl.serialize(req))
+    assert sr == bytes([2]) + struct.pack('<eeee', 1.5, -float('inf'), -3, 4)
+
+    # The packed and the generic logic shall agree on the serialized representation in both directions.
+    # The objects are compared after conversion back to the regular classes because NaN payloads may differ.
+    num_packed = 0
+    for model in models:
+        packed_class = packed[str(model)]
+        num_packed += hasattr(packed_class, '_STRUCT_')
+        for _ in range(10):
+            reference = _util.make_random_object(model)
+            sr = b''.join(pyuavcan.dsdl.serialize(reference))
+            packed_obj = pyuavcan.dsdl.deserialize(packed_class, [memoryview(sr)])
+            assert packed_obj is not None
+            assert len(b''.join(pyuavcan.dsdl.serialize(packed_obj))) == len(sr)
+            assert _util.are_close(model, reference, _convert(packed_obj, model))
+
+            # Implicit zero extension applies to the packed layout as well.
+            sr = sr[:len(sr) // 2]
+            reference = pyuavcan.dsdl.deserialize(pyuavcan.dsdl.get_class(model), [memoryview(sr)])
+            packed_obj = pyuavcan.dsdl.deserialize(packed_class, [memoryview(sr)])
+            assert (reference is None) == (packed_obj is None)
+            if packed_obj is not None:
+                assert _util.are_close(model, reference, _convert(packed_obj, model))
+
+    _logger.info('Struct-packed data types: %d of %d', num_packed, len(models))
+    assert num_packed > 10
+
+
+def _convert(obj: pyuavcan.dsdl.CompositeObject, model: pydsdl.CompositeType) -> typing.Any:
+    """Converts the object to the regular class of the data type by serializing and deserializing it."""
+    out = pyuavcan.dsdl.deserialize(pyuavcan.dsdl.get_class(model), list(pyuavcan.dsdl.serialize(obj)))
+    assert out is not None
+    return out
+
+
+def _import_struct_packed_classes(packages: typing.List[pyuavcan.dsdl.GeneratedPackageInfo]) \
+        -> typing.Dict[str, typing.Type[pyuavcan.dsdl.CompositeObject]]:
+    """
+    Imports the struct-packed packages in place of the regular ones with the same names and returns their classes
+    keyed by the data type name. The regular packages are restored afterwards.
+    The imported classes keep referring to the struct-packed packages they have been imported from.
+    """
+    root_names = {p.name for p in packages}
+
+    def is_affected(module_name: str) -> bool:
+        return module_name.split('.')[0] in root_names
+
+    regular_modules = {k: v for k, v in sys.modules.items() if is_affected(k)}
+    for k in regular_modules:
+        del sys.modules[k]
+    sys.path.insert(0, str(STRUCT_PACKED_DESTINATION_DIR))
+    importlib.invalidate_caches()
+    try:
+        return {
+            str(m): pyuavcan.dsdl.get_class(m)
+            for p in packages for m in _util.expand_service_types(p.models, keep_services=True)
+        }
+    finally:
+        sys.path.remove(str(STRUCT_PACKED_DESTINATION_DIR))
+        for k in [k for k in sys.modules if is_affected(k)]:
+            del sys.modules[k]
+        sys.modules.update(regular_modules)
+        importlib.invalidate_caches()
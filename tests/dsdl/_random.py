@@ -149,6 +149,15 @@ def _serialize_deserialize(obj: pyuavcan.dsdl.CompositeObject) -> typing.Tuple[f
     if not _util.are_close(pyuavcan.dsdl.get_model(obj), obj, d):  # pragma: no cover
         assert False, f'{obj} != {d}; sr: {bytes().join(chunks).hex()}'  # Branched for performance reasons
 
+    # The reusable buffer shall produce an identical serialized representation, and it shall be reusable.
+    sb = pyuavcan.dsdl.SerializationBuffer(type(obj))
+    for _ in range(2):
+        assert bytes().join(sb.serialize(obj)) == bytes().join(chunks)
+        with pytest.raises(RuntimeError):
+            sb.serialize(obj)
+        sb.release()
+        assert not sb.in_use
+
     # Similar floats may produce drastically different string representations, so if there is at least one float inside,
     # we skip the string representation equality check.
     if pydsdl.FloatType.__name__ not in repr(pyuavcan.dsdl.get_model(d)):
@@ -21,6 +21,7 @@ import pyuavcan.dsdl
 TEST_ROOT_DIR = pathlib.Path(__file__).parent.parent
 LIBRARY_ROOT_DIR = TEST_ROOT_DIR.parent
 DESTINATION_DIR = LIBRARY_ROOT_DIR / pathlib.Path('.test_dsdl_generated')
+STRUCT_PACKED_DESTINATION_DIR = LIBRARY_ROOT_DIR / pathlib.Path('.test_dsdl_generated_struct_packed')
 PUBLIC_REGULATED_DATA_TYPES_DIR = TEST_ROOT_DIR / 'public_regulated_data_types'
 TEST_DATA_TYPES_DIR = pathlib.Path(__file__).parent / 'namespaces'
 
@@ -79,3 +80,30 @@ def generate_packages() -> typing.List[pyuavcan.dsdl.GeneratedPackageInfo]:
     sys.path.insert(0, str(DESTINATION_DIR))
     importlib.invalidate_caches()
     return out
+
+
+@functools.lru_cache()
+def generate_struct_packed_packages() -> typing.List[pyuavcan.dsdl.GeneratedPackageInfo]:
+    """
+    Runs the DSDL package generator against the standard namespace and the test namespace that contain data types
+    with fixed byte-aligned layouts once more, with struct packing enabled.
+    The output is placed into a separate directory which is NOT added to sys path because the generated packages
+    have the same names as those emitted by :func:`generate_packages`, which use the generic (de)serialization logic.
+    """
+    if STRUCT_PACKED_DESTINATION_DIR.exists():  # pragma: no cover
+        shutil.rmtree(STRUCT_PACKED_DESTINATION_DIR, ignore_errors=True)
+    STRUCT_PACKED_DESTINATION_DIR.mkdir(parents=True, exist_ok=True)
+    return [
+        pyuavcan.dsdl.generate_package(
+            PUBLIC_REGULATED_DATA_TYPES_DIR / 'uavcan',
+            [],
+            STRUCT_PACKED_DESTINATION_DIR,
+            enable_struct_packing=True,
+        ),
+        pyuavcan.dsdl.generate_package(
+            TEST_DATA_TYPES_DIR / 'sirius_cyber_corp',
+            [],
+            STRUCT_PACKED_DESTINATION_DIR,
+            enable_struct_packing=True,
+        ),
+    ]
@@ -367,7 +367,8 @@ async def _unittest_can_transport_non_anon() -> None:
     validate_timestamp(received.timestamp)
     assert received.fragmented_payload == [_mem('abcdef')]
 
-    assert selective_m12345_5.sample_statistics() == SessionStatistics()       # Nothing
+    # The frames are processed on arrival, so the transfer is accounted for even though it has not been read yet.
+    assert selective_m12345_5.sample_statistics() == SessionStatistics(transfers=1, frames=1, payload_bytes=6)
     assert selective_m12345_9.sample_statistics() == SessionStatistics()       # Nothing
     assert promiscuous_m12345.sample_statistics() == SessionStatistics(transfers=1, frames=1, payload_bytes=6)
 
@@ -718,11 +719,17 @@ async def _unittest_can_transport_non_anon() -> None:
     assert subscriber_selective.transfer_id_timeout == pytest.approx(1.0)
 
     # Queue capacity configuration
-    assert subscriber_selective.frame_queue_capacity is None      # Unlimited by default
-    subscriber_selective.frame_queue_capacity = 2
+    assert subscriber_selective.transfer_queue_capacity is None      # Unlimited by default
+    subscriber_selective.transfer_queue_capacity = 2
     with pytest.raises(ValueError):
-        subscriber_selective.frame_queue_capacity = 0
-    assert subscriber_selective.frame_queue_capacity == 2
+        subscriber_selective.transfer_queue_capacity = 0
+    assert subscriber_selective.transfer_queue_capacity == 2
+    with pytest.warns(DeprecationWarning):
+        assert subscriber_selective.frame_queue_capacity == 2
+    with pytest.warns(DeprecationWarning):
+        subscriber_selective.frame_queue_capacity = 3
+    assert subscriber_selective.transfer_queue_capacity == 3
+    subscriber_selective.transfer_queue_capacity = 2
 
     assert await pub_m2222.send_until(Transfer(
         timestamp=ts,
@@ -838,13 +845,34 @@ async def _unittest_can_transport_non_anon() -> None:
                                                                            frames=8,
                                                                            payload_bytes=375)
 
-    # The selective one is unable to do so since its RX queue is too small; it is reflected in the error counter
+    # The selective one receives it as well because the queue capacity is expressed in transfers, not frames
+    received = await subscriber_selective.receive_until(tr.loop.time() + 1.0)
+    assert received is not None
+    assert received.transfer_id == 8
+    assert subscriber_selective.sample_statistics() == SessionStatistics(transfers=2,
+                                                                         frames=8,
+                                                                         payload_bytes=375,
+                                                                         errors=1)
+
+    # The selective one is unable to accept more transfers than its queue capacity; it is reflected in the counter
+    subscriber_selective.transfer_queue_capacity = 1
+    for transfer_id, payload in ((9, 'x'), (10, 'y' * 100)):     # The latter one is a multi-frame transfer
+        assert await pub_m2222.send_until(Transfer(
+            timestamp=ts,
+            priority=Priority.HIGH,
+            transfer_id=transfer_id,
+            fragmented_payload=[_mem(payload)]
+        ), tr.loop.time() + 1.0)
+
+    received = await subscriber_selective.receive_until(tr.loop.time() + 1.0)
+    assert received is not None
+    assert received.transfer_id == 9
     assert (await subscriber_selective.receive_until(tr.loop.time() + _RX_TIMEOUT)) is None
-    assert subscriber_selective.sample_statistics() == SessionStatistics(transfers=1,
-                                                                         frames=5,
-                                                                         payload_bytes=124,
+    assert subscriber_selective.sample_statistics() == SessionStatistics(transfers=4,
+                                                                         frames=11,
+                                                                         payload_bytes=484,
                                                                          errors=1,
-                                                                         drops=3)  # Overruns!
+                                                                         drops=1)  # One transfer overrun!
 
     #
     # Finalization.
@@ -866,6 +894,46 @@ async def _unittest_can_transport_non_anon() -> None:
     tr2.close()
 
 
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_can_transport_route_cache() -> None:
+    import random
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, InputSessionSpecifier, Priority
+    # noinspection PyProtectedMember
+    from pyuavcan.transport.can._identifier import MessageCANID
+    from pyuavcan.transport.can.media import DataFrame, FrameFormat, FilterConfiguration
+    from .media.mock import MockMedia
+
+    media = MockMedia(set(), 64, 1)
+    tr = can.CANTransport(media, 5)
+    media.configure_acceptance_filters([FilterConfiguration.new_promiscuous()])  # Override the transport's filters
+    ses = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(2345), None), PayloadMetadata(0, 100))
+
+    def frame(identifier: int, transfer_id: int) -> DataFrame:
+        return DataFrame(identifier, bytearray([0xE0 | transfer_id]), FrameFormat.EXTENDED, loopback=False)
+
+    # A flood of random CAN ID values does not cause the cache to grow beyond its capacity.
+    # Service frames are excluded because random values may produce invalid ones, which are reported as errors.
+    media.inject_received(frame(random.getrandbits(29) & ~(1 << 25), 0) for _ in range(10_000))
+    # noinspection PyProtectedMember
+    assert len(tr._route_cache) <= can._can._ROUTE_CACHE_CAPACITY
+    # Some of the random CAN ID values may happen to match the subject; discard the transfers they have produced.
+    while (await ses.receive_until(tr.loop.time() + _RX_TIMEOUT)) is not None:
+        pass
+
+    # The cached routes are used for the subsequent frames with the same CAN ID.
+    identifier = MessageCANID(Priority.NOMINAL, 42, 2345).compile([])
+    for transfer_id in range(3):
+        media.inject_received([frame(identifier, transfer_id)])
+    # noinspection PyProtectedMember
+    assert tr._route_cache[identifier] is not None
+    for transfer_id in range(3):
+        tf = await ses.receive_until(tr.loop.time() + 1.0)
+        assert tf is not None
+        assert tf.transfer_id == transfer_id
+        assert tf.source_node_id == 42
+    tr.close()
+
+
 def _mem(data: typing.Union[str, bytes, bytearray]) -> memoryview:
     return memoryview(data.encode() if isinstance(data, str) else data)
 
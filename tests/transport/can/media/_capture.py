@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+import io
+import os
+import typing
+import asyncio
+import tempfile
+import pytest
+import pyuavcan.transport
+# Shouldn't import a transport from inside a coroutine because it triggers debug warnings.
+from pyuavcan.transport import can
+
+
+# noinspection PyProtectedMember
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_can_capture() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer, Timestamp, Priority
+    from pyuavcan.transport import InputSessionSpecifier, OutputSessionSpecifier
+    from pyuavcan.transport.can.media import _capture_format
+    from pyuavcan.transport.can.media.capture import CaptureMedia, CaptureWriter, convert_to_candump
+    from pyuavcan.transport.can.media.replay import ReplayMedia
+    from .mock import MockMedia
+
+    loop = asyncio.get_event_loop()
+    meta = PayloadMetadata(0, 1000)
+    payload_a = [memoryview(bytes(range(100)))]
+    payload_b = [memoryview(b'Hello')]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'capture.bin')
+        peers: typing.Set[MockMedia] = set()
+        media = CaptureMedia(MockMedia(peers, 8, 10), CaptureWriter(path))
+        assert media.mtu == 8
+        assert media.interface_name == media.inner.interface_name
+        assert media.number_of_acceptance_filters == 10
+        assert not list(CaptureMedia.list_available_interface_names())
+        tr_a = can.CANTransport(media, 5)
+        tr_b = can.CANTransport(MockMedia(peers, 8, 10), 6)
+
+        # Received by A: a multi-frame transfer from B.
+        sub_a = tr_a.get_input_session(InputSessionSpecifier(MessageDataSpecifier(1000), None), meta)
+        pub_b = tr_b.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(1000), None), meta)
+        assert await pub_b.send_until(Transfer(Timestamp.now(), Priority.FAST, 0, payload_a), loop.time() + 1)
+        received = await sub_a.receive_until(loop.time() + 1)
+        assert received is not None and b''.join(received.fragmented_payload) == bytes(range(100))
+
+        # Transmitted by A with feedback, so the first frame is looped back.
+        pub_a = tr_a.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(2000), None), meta)
+        feedback: typing.List[pyuavcan.transport.Feedback] = []
+        pub_a.enable_feedback(feedback.append)
+        assert await pub_a.send_until(Transfer(Timestamp.now(), Priority.SLOW, 7, payload_b), loop.time() + 1)
+        assert len(feedback) == 1
+
+        stats = media.writer.sample_statistics()
+        assert stats.frames == 15 + 1 + 1 and stats.drops == 0
+        tr_a.close()
+        tr_b.close()
+        assert media.writer.sample_statistics().bytes_written == os.path.getsize(path)
+        with pytest.raises(pyuavcan.transport.ResourceClosedError):
+            media.writer.write(0, can.media.DataFrame(0, bytearray(), can.media.FrameFormat.BASE, False),
+                               _capture_format.Direction.RECEIVED)
+
+        with open(path, 'rb') as binary_file:
+            records = list(_capture_format.parse_binary(binary_file.read()))
+        directions = [r[-1] for r in records]
+        assert directions.count(_capture_format.Direction.RECEIVED) == 15
+        assert directions.count(_capture_format.Direction.TRANSMITTED) == 1
+        assert directions.count(_capture_format.Direction.LOOPBACK) == 1
+
+        # Conversion into the candump format omits the loopback frames.
+        candump_path = os.path.join(directory, 'capture.log')
+        with open(candump_path, 'w') as text_file:
+            assert 16 == convert_to_candump(path, text_file, 'vcan0')
+        with open(candump_path) as text_file:
+            lines = text_file.readlines()
+        assert len(lines) == 16 and all(' vcan0 ' in x for x in lines)
+        with pytest.raises(ValueError):
+            convert_to_candump(candump_path, io.StringIO())
+
+        # Both the binary capture and the converted one can be replayed; the transmitted frames appear as received.
+        for replay_path in (path, candump_path):
+            replay = ReplayMedia(replay_path)
+            tr = can.CANTransport(replay, None)
+            sub_1000 = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(1000), 6), meta)
+            sub_2000 = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(2000), 5), meta)
+            assert 16 == await replay.replay()
+            tf = await sub_1000.receive_until(0)
+            assert tf is not None and b''.join(tf.fragmented_payload) == bytes(range(100))
+            tf = await sub_2000.receive_until(0)
+            assert tf is not None and tf.transfer_id == 7 and b''.join(tf.fragmented_payload)[:5] == b'Hello'
+            assert await sub_2000.receive_until(0) is None      # The loopback frame is not replayed
+            tr.close()
+
+    await asyncio.sleep(0.1)    # Let the transport finalize everything
@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+import os
+import time
+import typing
+import asyncio
+import tempfile
+import pytest
+import pyuavcan.transport
+# Shouldn't import a transport from inside a coroutine because it triggers debug warnings.
+from pyuavcan.transport import can
+
+
+# noinspection PyProtectedMember
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_can_replay() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, InputSessionSpecifier, Priority
+    from pyuavcan.transport.can.media import DataFrame, FrameFormat
+    from pyuavcan.transport.can.media.replay import ReplayMedia
+    from pyuavcan.transport.can.media import _capture_format
+    from pyuavcan.transport.can._identifier import MessageCANID
+    from pyuavcan.transport.can._session._transfer_sender import compile_transfer
+
+    # Three transfers from node 42 spaced 0.1 seconds apart, interleaved with irrelevant traffic.
+    records: typing.List[typing.Tuple[int, DataFrame]] = []
+    start_ns = 1_500_000_000_000_000_000
+    for index in range(3):
+        payload = [memoryview(bytes(range(index, index + 100)))]
+        can_id = MessageCANID(Priority.FAST, 42, 1234).compile(payload)
+        timestamp_ns = start_ns + index * 100_000_000
+        for frame in compile_transfer(can_id, index, payload, 7, False):
+            records.append((timestamp_ns, frame))
+            timestamp_ns += 100_000
+        records.append((timestamp_ns, DataFrame(0x123, bytearray(b'junk'), FrameFormat.BASE, loopback=False)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        candump_path = os.path.join(directory, 'capture.log')
+        with open(candump_path, 'w') as text_file:
+            text_file.write('# The comments and other garbage are ignored\n')
+            for ts, frame in records:
+                text_file.write(_capture_format.format_candump_line(ts, 'can0', frame) + '\n')
+            text_file.write('(1500000000.400000) can0 123#R\n')
+
+        binary_path = os.path.join(directory, 'capture.bin')
+        with open(binary_path, 'wb') as binary_file:
+            binary_file.write(_capture_format.BINARY_MAGIC)
+            for ts, frame in records:
+                binary_file.write(_capture_format.serialize_binary(ts, frame, _capture_format.Direction.TRANSMITTED))
+                # Loopback frames are duplicates of the transmitted ones, so they are not replayed.
+                binary_file.write(_capture_format.serialize_binary(ts, frame, _capture_format.Direction.LOOPBACK))
+
+        empty_path = os.path.join(directory, 'empty.log')
+        open(empty_path, 'w').close()
+
+        for path in (candump_path, binary_path):
+            for real_time in (False, True):
+                media = ReplayMedia(path, mtu=8, real_time=real_time)
+                assert media.interface_name == path
+                assert media.mtu == 8
+                assert not list(ReplayMedia.list_available_interface_names())
+                with pytest.raises(RuntimeError):
+                    await media.replay()    # Not started yet
+
+                tr = can.CANTransport(media, None)
+                session = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(1234), None),
+                                               PayloadMetadata(0, 1000))
+                started_at = time.monotonic()
+                assert len(records) == await media.replay()
+                elapsed = time.monotonic() - started_at
+                assert (elapsed >= 0.19) == real_time
+
+                transfers = []
+                while True:
+                    tf = await session.receive_until(0)
+                    if tf is None:
+                        break
+                    transfers.append(tf)
+                assert [t.transfer_id for t in transfers] == [0, 1, 2]
+                assert all(t.source_node_id == 42 for t in transfers)
+                assert [b''.join(t.fragmented_payload) for t in transfers] == [bytes(range(i, i + 100))
+                                                                               for i in range(3)]
+                assert transfers[0].timestamp.system_ns == start_ns
+                # The original intervals between the frames are preserved even when replaying as fast as possible.
+                assert transfers[2].timestamp.monotonic_ns - transfers[0].timestamp.monotonic_ns == 200_000_000
+                assert tr.sample_statistics().in_frames == len(records) - 3     # The junk is rejected by the filters
+
+                # The transfers can be replayed again from the beginning.
+                assert len(records) == await media.replay()
+                tf = await session.receive_until(0)
+                assert tf is not None and tf.transfer_id == 0
+                tr.close()
+                media.close()
+                with pytest.raises(pyuavcan.transport.ResourceClosedError):
+                    await media.replay()
+
+        media = ReplayMedia(empty_path)
+        received: typing.List[can.media.TimestampedDataFrame] = []
+        media.start(received.extend, False)
+        assert 0 == await media.replay()
+        assert 2 == await media.send_until([DataFrame(0x123, bytearray(b'abc'), FrameFormat.BASE, loopback=True),
+                                            DataFrame(0x123, bytearray(b'def'), FrameFormat.BASE, loopback=False)],
+                                           time.monotonic() + 1.0)
+        assert [(f.identifier, bytes(f.data), f.loopback) for f in received] == [(0x123, b'abc', True)]
+        media.close()
+        media.close()   # Idempotency
+
+        with pytest.raises(ValueError):
+            ReplayMedia(empty_path, mtu=9)
+
+    await asyncio.sleep(0.1)    # Let the transport finalize everything
@@ -111,5 +111,60 @@ async def _unittest_can_socketcan() -> None:
     assert rx_external[2].data == bytearray(range(6))
     assert rx_external[2].format == FrameFormat.BASE
 
+    # Kernel-side acceptance filtering: only the base frame shall be accepted; the extended ones are dropped.
+    assert media_a.kernel_filtered_frame_count is not None
+    media_a.configure_acceptance_filters([FilterConfiguration(0x123, 0x7FF, FrameFormat.BASE)])
+    filtered_before = media_a.kernel_filtered_frame_count
+    rx_a.clear()
+    await media_a.send_until([
+        DataFrame(identifier=0xbadc0fe, data=bytearray(), format=FrameFormat.EXTENDED, loopback=False),
+        DataFrame(identifier=0x123, data=bytearray(), format=FrameFormat.EXTENDED, loopback=False),
+        DataFrame(identifier=0x123, data=bytearray(), format=FrameFormat.BASE, loopback=False),
+    ], asyncio.get_event_loop().time() + 1.0)
+    await asyncio.sleep(0.1)
+    print('rx_a:', rx_a)
+    assert len(rx_a) == 1
+    assert rx_a[0].identifier == 0x123
+    assert rx_a[0].format == FrameFormat.BASE
+    assert media_a.kernel_filtered_frame_count >= filtered_before + 2
+
+    media_a.close()
+    media_b.close()
+
+
+# noinspection PyProtectedMember
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_can_socketcan_event_loop_mode() -> None:
+    from pyuavcan.transport.can.media import TimestampedDataFrame, DataFrame, FrameFormat, FilterConfiguration
+
+    if sys.platform != 'linux':  # pragma: no cover
+        pytest.skip('SocketCAN test skipped because we do not seem to be on a GNU/Linux-based system')
+
+    from pyuavcan.transport.can.media.socketcan import SocketCANMedia
+
+    media_a = SocketCANMedia('vcan0', 8, receive_in_event_loop=True)
+    media_b = SocketCANMedia('vcan0', 8)
+    media_a.configure_acceptance_filters([FilterConfiguration.new_promiscuous()])
+
+    rx_a: typing.List[TimestampedDataFrame] = []
+    media_a.start(rx_a.extend, False)
+    media_b.start(lambda _: None, False)
+    assert media_a._maybe_thread is None
+
+    with pytest.raises(RuntimeError):
+        media_a.start(rx_a.extend, False)
+
+    await media_b.send_until([
+        DataFrame(identifier=0xbadc0fe, data=bytearray(range(8)), format=FrameFormat.EXTENDED, loopback=False),
+        DataFrame(identifier=0x123, data=bytearray(range(3)), format=FrameFormat.BASE, loopback=False),
+    ], asyncio.get_event_loop().time() + 1.0)
+    await asyncio.sleep(0.1)
+
+    print('rx_a:', rx_a)
+    assert [(f.identifier, bytes(f.data), f.loopback) for f in rx_a] == [
+        (0xbadc0fe, bytes(range(8)), False),
+        (0x123, bytes(range(3)), False),
+    ]
+
     media_a.close()
     media_b.close()
@@ -231,5 +231,77 @@ async def _unittest_udp_transport() -> None:
         _ = tr2.get_input_session(InputSessionSpecifier(MessageDataSpecifier(12345), None), meta)
 
 
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_udp_transport_shared_output_sockets() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, ServiceDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+    from pyuavcan.transport import SessionStatistics
+
+    get_monotonic = asyncio.get_event_loop().time
+
+    with pytest.raises(ValueError):
+        _ = UDPTransport(ip_address='127.0.0.111/8', output_socket_pool_size=-1)
+
+    server = UDPTransport('127.0.0.111/8', output_socket_pool_size=2)
+    clients = [UDPTransport(f'127.0.0.{nid}/8') for nid in range(1, 6)]
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 10000)
+    response_specifier = ServiceDataSpecifier(444, ServiceDataSpecifier.Role.RESPONSE)
+
+    # Five response sessions and a broadcaster share two sockets.
+    responders = [server.get_output_session(OutputSessionSpecifier(response_specifier, nid), meta)
+                  for nid in range(1, 6)]
+    broadcaster = server.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(2345), None), meta)
+    assert len({s.socket for s in responders + [broadcaster]}) == 2
+    assert all(s.socket.fileno() >= 0 for s in responders)
+
+    listeners = [c.get_input_session(InputSessionSpecifier(response_specifier, 111), meta) for c in clients]
+    subscriber = clients[0].get_input_session(InputSessionSpecifier(MessageDataSpecifier(2345), None), meta)
+
+    feedback: typing.List[pyuavcan.transport.Feedback] = []
+    responders[2].enable_feedback(feedback.append)
+    for index, responder in enumerate(responders):
+        assert await responder.send_until(
+            Transfer(timestamp=Timestamp.now(),
+                     priority=Priority.HIGH,
+                     transfer_id=index,
+                     fragmented_payload=[_mem(f'response #{index}' * 500)]),  # Multi-frame
+            monotonic_deadline=get_monotonic() + 5.0
+        )
+    assert len(feedback) == 1
+
+    # Each response is delivered only to its destination.
+    for index, listener in enumerate(listeners):
+        rx_transfer = await listener.receive_until(get_monotonic() + 5.0)
+        assert isinstance(rx_transfer, TransferFrom)
+        assert rx_transfer.source_node_id == 111
+        assert rx_transfer.transfer_id == index
+        assert b''.join(rx_transfer.fragmented_payload) == f'response #{index}'.encode() * 500
+        assert await listener.receive_until(get_monotonic() + 0.1) is None
+
+    # The statistics are maintained per session.
+    for responder in responders:
+        assert responder.sample_statistics() == SessionStatistics(transfers=1, frames=6, payload_bytes=5500 + 4)
+
+    assert await broadcaster.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.LOW,
+                 transfer_id=9,
+                 fragmented_payload=[_mem('broadcast')]),
+        monotonic_deadline=get_monotonic() + 5.0
+    )
+    rx_transfer = await subscriber.receive_until(get_monotonic() + 5.0)
+    assert isinstance(rx_transfer, TransferFrom)
+    assert rx_transfer.fragmented_payload == [b'broadcast']
+
+    # The shared sockets are closed with the transport, not with the sessions.
+    sock = broadcaster.socket
+    broadcaster.close()
+    assert sock.fileno() >= 0
+    server.close()
+    assert sock.fileno() < 0
+    for c in clients:
+        c.close()
+
+
 def _mem(data: typing.Union[str, bytes, bytearray]) -> memoryview:
     return memoryview(data.encode() if isinstance(data, str) else data)